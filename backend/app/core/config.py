@@ -28,6 +28,43 @@ class Settings(BaseSettings):
         database_url (str): URL padrão do banco de dados.
         cors_origins (list[str]): Lista de origens permitidas para CORS.
         pokeapi_base_url (str): URL base da PokeAPI oficial.
+        pokeapi_cache_max_entries (int): Limite de respostas no cache em memória da PokeAPI.
+        pokeapi_cache_stale_ttl (int): Janela em segundos para servir respostas expiradas.
+        pokeapi_mirror_enabled (bool): Habilita o espelho persistente das respostas da PokeAPI.
+        pokeapi_batch_max_ids (int): Máximo de Pokémons por requisição em lote.
+        pokeapi_batch_concurrency (int): Máximo de buscas simultâneas à PokeAPI por lote.
+        image_index_verify_interval (int): Intervalo da verificação de integridade das imagens indexadas.
+        image_http_max_connections (int): Limite total de conexões do cliente HTTP de imagens.
+        image_http_max_connections_per_host (int): Limite de conexões simultâneas por host no download de imagens.
+        image_http_keepalive_timeout (int): Tempo em segundos que conexões ociosas ficam abertas no pool.
+        image_http_timeout (int): Timeout total em segundos de cada download de imagem.
+        image_download_chunk_size (int): Tamanho em bytes dos blocos gravados em disco durante o download.
+        image_download_max_bytes (int): Tamanho máximo aceito para uma imagem baixada.
+        image_download_workers (int): Número de workers do agendador de downloads em massa.
+        image_download_initial_concurrency (int): Downloads simultâneos iniciais do controle adaptativo.
+        image_download_max_concurrency (int): Limite superior de downloads simultâneos do controle adaptativo.
+        image_download_target_latency (float): Latência (segundos) acima da qual a concorrência é reduzida.
+        image_download_rate_per_host (float): Máximo de requisições por segundo a cada host de imagens.
+        image_download_max_attempts (int): Tentativas por imagem no agendador de downloads.
+        image_download_retry_delay (float): Espera inicial (segundos) antes de repetir um download que falhou.
+        image_blob_gc_interval (int): Intervalo em segundos da coleta de lixo dos blobs de imagens.
+        image_blob_gc_grace (int): Idade mínima em segundos de um blob sem referência para ser removido.
+        image_optimization_workers (int): Processos do pool de otimização de imagens (0 = núcleos disponíveis).
+        image_optimization_max_pending (int): Máximo de imagens enviadas ao pool ao mesmo tempo (0 = dois por processo).
+        image_variant_widths (list[int]): Larguras padrão das variantes responsivas (``?w=`` é arredondado para elas).
+        image_variant_cache_max_bytes (int): Tamanho máximo do diretório de variantes (remoção LRU).
+        sprite_atlas_max_sprites (int): Máximo de Pokémons em um atlas de imagens.
+        sprite_atlas_columns (int): Imagens por linha no atlas.
+        sprite_atlas_cache_max_bytes (int): Tamanho máximo do diretório de atlas (remoção LRU).
+        cache_recovery_enabled (bool): Executa a recuperação de imagens pendentes dentro do backend.
+        cache_recovery_interval (int): Intervalo em segundos entre ciclos de recuperação.
+        cache_recovery_batch_size (int): Máximo de imagens processadas por ciclo de recuperação.
+        cache_recovery_base_delay (int): Espera inicial em segundos antes de repetir uma imagem que falhou.
+        cache_recovery_max_delay (int): Espera máxima em segundos entre tentativas de uma imagem.
+        pull_sync_max_concurrency (int): Máximo de clientes consultados ao mesmo tempo na sincronização pull.
+        pull_sync_client_timeout (float): Prazo em segundos para a resposta de cada cliente.
+        pull_sync_cycle_timeout (float): Prazo em segundos para consultar todos os clientes de um ciclo.
+        client_storage_compact_events (int): Eventos no log do storage dos clientes que disparam um novo snapshot.
         secret_key (str): Chave secreta para assinatura JWT.
         algorithm (str): Algoritmo de assinatura JWT.
         access_token_expire_minutes (int): Tempo de expiração do access token em minutos.
@@ -121,6 +158,97 @@ class Settings(BaseSettings):
     # URL base da PokeAPI oficial para dados dos Pokémons
     pokeapi_base_url: str = "https://pokeapi.co/api/v2"
 
+    # ===== CACHE DA POKEAPI =====
+
+    # Número máximo de respostas mantidas no cache em memória (despejo LRU)
+    pokeapi_cache_max_entries: int = 4096
+
+    # TTL (segundos) por tipo de recurso; os dados da PokeAPI mudam raramente
+    pokeapi_cache_ttl_pokemon: int = 86400
+    pokeapi_cache_ttl_species: int = 86400
+    pokeapi_cache_ttl_type: int = 86400
+    pokeapi_cache_ttl_list: int = 3600
+
+    # Tempo (segundos) após o TTL em que a resposta expirada ainda é servida
+    # enquanto é revalidada em background (stale-while-revalidate)
+    pokeapi_cache_stale_ttl: int = 604800
+
+    # Espelho persistente das respostas da PokeAPI no banco de dados,
+    # usado para warm restarts e quando a PokeAPI está lenta ou fora do ar
+    pokeapi_mirror_enabled: bool = True
+
+    # Busca em lote de Pokémons: tamanho máximo do lote e número de buscas
+    # simultâneas à PokeAPI para os itens que não estão em cache
+    pokeapi_batch_max_ids: int = 100
+    pokeapi_batch_concurrency: int = 10
+
+    # ===== CACHE DE IMAGENS =====
+
+    # Intervalo (segundos) da verificação em background da integridade das
+    # imagens do índice em memória
+    image_index_verify_interval: int = 300
+
+    # Cliente HTTP compartilhado para download de imagens (pool com keep-alive)
+    image_http_max_connections: int = 100
+    image_http_max_connections_per_host: int = 20
+    image_http_keepalive_timeout: int = 60
+    image_http_timeout: int = 30
+
+    # Download em blocos direto para o disco e tamanho máximo aceito
+    image_download_chunk_size: int = 64 * 1024
+    image_download_max_bytes: int = 10 * 1024 * 1024
+
+    # Downloads em massa: fila com workers e concorrência adaptativa (AIMD)
+    # guiada pela latência e pelas respostas 429/5xx, com limite por host
+    image_download_workers: int = 20
+    image_download_initial_concurrency: int = 4
+    image_download_max_concurrency: int = 20
+    image_download_target_latency: float = 5.0
+    image_download_rate_per_host: float = 10.0
+    image_download_max_attempts: int = 3
+    image_download_retry_delay: float = 2.0
+
+    # Armazenamento das imagens endereçado por conteúdo (SHA-256): coleta de
+    # lixo dos blobs sem referência, com carência para downloads em andamento
+    image_blob_gc_interval: int = 3600
+    image_blob_gc_grace: int = 3600
+
+    # Otimização de imagens (Pillow) em um pool de processos, fora do event
+    # loop; o envio de tarefas aguarda quando o limite de pendentes é atingido
+    image_optimization_workers: int = 0
+    image_optimization_max_pending: int = 0
+
+    # Variantes responsivas (largura via ?w= e formato via Accept), geradas
+    # sob demanda e guardadas em um diretório limitado com remoção LRU
+    image_variant_widths: list[int] = [96, 192, 300, 475]
+    image_variant_cache_max_bytes: int = 200 * 1024 * 1024
+
+    # Atlas (sprite sheets) para as páginas em grade: várias imagens em um
+    # único arquivo, com mapa de coordenadas
+    sprite_atlas_max_sprites: int = 100
+    sprite_atlas_columns: int = 10
+    sprite_atlas_cache_max_bytes: int = 100 * 1024 * 1024
+
+    # Recuperação de imagens pendentes (em background, dentro do backend):
+    # fila persistente no pokemon_image_cache com backoff exponencial e jitter
+    cache_recovery_enabled: bool = True
+    cache_recovery_interval: int = 60
+    cache_recovery_batch_size: int = 100
+    cache_recovery_base_delay: int = 60
+    cache_recovery_max_delay: int = 6 * 3600
+
+    # ===== SINCRONIZAÇÃO PULL =====
+
+    # Clientes consultados em paralelo (limitado), cada um com seu prazo; os
+    # que não responderem até o fim do ciclo são contados como falhas
+    pull_sync_max_concurrency: int = 100
+    pull_sync_client_timeout: float = 15.0
+    pull_sync_cycle_timeout: float = 25.0
+
+    # Storage consolidado dos clientes: log de eventos append-only, compactado
+    # em um snapshot a cada N eventos
+    client_storage_compact_events: int = 1000
+
     # ===== CONFIGURAÇÕES JWT =====
 
     # Chave secreta para assinatura de tokens JWT
@@ -6,17 +6,23 @@ eliminando a dependência de APIs externas e melhorando a performance.
 """
 
 import os
+import asyncio
 import mimetypes
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Response, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, BackgroundTasks
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session
 import logging
 
 from app.core.database import get_db
 from app.services.image_cache_service import ImageCacheService
+from app.services.image_cache_index import ImageIndexEntry, ImageIndexVerifier
+from app.services.cache_recovery_service import CacheRecoveryEngine
 from app.services.image_optimization_service import ImageOptimizationService
+from app.services.image_variant_cache import VARIANT_MIME_TYPES, negotiate_image_format, snap_width
+from app.services.sprite_atlas_service import SpriteAtlasService
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,11 +30,24 @@ logger = logging.getLogger(__name__)
 # Inicializa o serviço de cache de imagens
 image_cache_service = ImageCacheService()
 
+# Variantes responsivas (largura/formato) geradas a partir do cache
+image_optimization_service = ImageOptimizationService()
+
+# Atlas (sprite sheets) das páginas em grade, montados a partir do cache
+sprite_atlas_service = SpriteAtlasService(image_cache_service)
+
+# Verificação periódica do índice de imagens (iniciada no lifespan da aplicação)
+image_index_verifier = ImageIndexVerifier(image_cache_service)
+
+# Recuperação em background das imagens que falharam (iniciada no lifespan)
+cache_recovery_engine = CacheRecoveryEngine(image_cache_service)
+
 router = APIRouter(prefix="/images", tags=["images"])
 
 
 @router.get("/pokemon/{pokemon_id}")
 async def get_pokemon_image(
+    request: Request,
     pokemon_id: int,
     image_type: str = "official-artwork",
     background_tasks: BackgroundTasks = BackgroundTasks(),
@@ -40,14 +59,19 @@ async def get_pokemon_image(
     Se a imagem não estiver em cache, tenta baixá-la em background
     e retorna uma imagem placeholder temporariamente.
 
+    O ETag é o hash SHA-256 do conteúdo, calculado no download. Requisições
+    condicionais (If-None-Match / If-Modified-Since) cuja versão ainda é a
+    atual recebem 304 sem que o arquivo seja lido.
+
     Args:
+        request: Requisição HTTP (cabeçalhos condicionais)
         pokemon_id: ID do Pokémon (1-1010+)
         image_type: Tipo de imagem ('official-artwork', 'sprite', 'sprite-shiny', etc.)
         background_tasks: Para downloads em background
         db: Sessão do banco de dados
 
     Returns:
-        FileResponse com a imagem ou placeholder
+        FileResponse com a imagem, 304 Not Modified ou placeholder
 
     Raises:
         HTTPException: Se o pokemon_id for inválido
@@ -67,28 +91,33 @@ async def get_pokemon_image(
 
         logger.debug(f"Solicitação de imagem: Pokémon {pokemon_id}, tipo {image_type}")
 
-        # Tenta obter a imagem do cache
-        image_path = await image_cache_service.get_pokemon_image(db, pokemon_id, image_type)
+        # Tenta obter a imagem do cache (índice em memória na maioria das vezes)
+        image_entry = await image_cache_service.get_pokemon_image_entry(db, pokemon_id, image_type)
 
-        if image_path and os.path.exists(image_path):
+        if image_entry:
             # Imagem encontrada no cache
-            logger.debug(f"Servindo imagem do cache: {image_path}")
+            logger.debug(f"Servindo imagem do cache: {image_entry.path}")
 
             # Determina o tipo MIME
-            mime_type, _ = mimetypes.guess_type(image_path)
+            mime_type, _ = mimetypes.guess_type(image_entry.path)
             if not mime_type:
                 mime_type = "image/png"
 
             # Headers para cache no browser
             headers = {
                 "Cache-Control": "public, max-age=86400",  # 24 horas
-                "ETag": f'"{pokemon_id}-{image_type}"'
+                "ETag": image_entry.etag
             }
 
+            if _is_not_modified(request, image_entry):
+                return Response(status_code=304, headers=headers)
+
+            # O stat indexado evita um novo acesso ao disco antes do envio
             return FileResponse(
-                path=image_path,
+                path=image_entry.path,
                 media_type=mime_type,
-                headers=headers
+                headers=headers,
+                stat_result=image_entry.stat
             )
         else:
             # Imagem não encontrada - agenda download em background
@@ -108,6 +137,230 @@ async def get_pokemon_image(
         return await _get_placeholder_image(pokemon_id, image_type)
 
 
+@router.get("/pokemon/{pokemon_id}/optimized")
+async def get_pokemon_image_variant(
+    request: Request,
+    pokemon_id: int,
+    image_type: str = "official-artwork",
+    w: Optional[int] = None,
+    quality: str = "medium",
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    db: Session = Depends(get_db)
+):
+    """
+    Serve uma variante responsiva da imagem do Pokémon.
+
+    A largura pedida em ``w`` é arredondada para a menor largura padrão
+    que a comporta (settings.image_variant_widths) e o formato é negociado
+    pelo cabeçalho Accept (AVIF, WebP ou PNG). A variante é gerada a partir
+    do original cacheado na primeira requisição e guardada no cache de
+    variantes; as seguintes são servidas do disco.
+
+    Args:
+        request: Requisição HTTP (Accept e cabeçalhos condicionais)
+        pokemon_id: ID do Pokémon
+        image_type: Tipo de imagem
+        w: Largura desejada em pixels (padrão: largura original)
+        quality: Nível de otimização ('high', 'medium', 'low', 'auto')
+        background_tasks: Para downloads em background
+        db: Sessão do banco de dados
+
+    Returns:
+        FileResponse com a variante, 304 Not Modified ou placeholder
+
+    Raises:
+        HTTPException: Se algum parâmetro for inválido
+    """
+    if pokemon_id < 1 or (pokemon_id > 1025 and pokemon_id < 10001) or pokemon_id > 10300:
+        raise HTTPException(status_code=400, detail="ID do Pokémon inválido")
+
+    supported_types = ['official-artwork', 'sprite', 'sprite-shiny', 'home', 'home-shiny']
+    if image_type not in supported_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipo de imagem não suportado. Use: {', '.join(supported_types)}"
+        )
+
+    if w is not None and w < 1:
+        raise HTTPException(status_code=400, detail="Largura deve ser maior que zero")
+
+    if quality not in image_optimization_service.quality_settings:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Qualidade inválida. Use: {', '.join(image_optimization_service.quality_settings)}"
+        )
+
+    try:
+        image_entry = await image_cache_service.get_pokemon_image_entry(db, pokemon_id, image_type)
+        if not image_entry:
+            logger.info(f"Imagem não encontrada, agendando download: {pokemon_id}/{image_type}")
+            background_tasks.add_task(_background_download_image, db, pokemon_id, image_type)
+            return await _get_placeholder_image(pokemon_id, image_type)
+
+        width = snap_width(w)
+        image_format = negotiate_image_format(request.headers.get("accept"))
+
+        # A variante muda apenas quando o original muda
+        tag = image_entry.etag.removeprefix("W/").strip('"')
+        weak = "W/" if image_entry.etag.startswith("W/") else ""
+        headers = {
+            "Cache-Control": "public, max-age=86400",  # 24 horas
+            "ETag": f'{weak}"{tag}-{width or "orig"}-{quality}.{image_format}"',
+            "Vary": "Accept"
+        }
+
+        if _is_not_modified(request, image_entry, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        variant_path = await image_optimization_service.get_image_variant(
+            db, image_entry.path, image_entry.etag, pokemon_id, image_type, width, image_format, quality
+        )
+        if not variant_path:
+            # Falha na geração: serve o original
+            logger.warning(f"Variante indisponível, servindo original: {pokemon_id}/{image_type}")
+            headers["ETag"] = image_entry.etag
+            return FileResponse(
+                path=image_entry.path,
+                media_type=mimetypes.guess_type(image_entry.path)[0] or "image/png",
+                headers=headers,
+                stat_result=image_entry.stat
+            )
+
+        return FileResponse(path=variant_path, media_type=VARIANT_MIME_TYPES[image_format], headers=headers)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao servir variante {pokemon_id}/{image_type}: {e}")
+        return await _get_placeholder_image(pokemon_id, image_type)
+
+
+@router.get("/atlas")
+async def get_sprite_atlas(
+    request: Request,
+    ids: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    image_type: str = "sprite",
+    size: int = 96,
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna o mapa de coordenadas de um atlas com as imagens de vários Pokémons.
+
+    O atlas é uma única imagem com as imagens já cacheadas dos Pokémons
+    pedidos, uma por célula de ``size`` pixels; a imagem é servida em
+    ``url`` e ``sprites`` indica a posição de cada Pokémon nela. Pokémons
+    sem imagem em cache são listados em ``missing`` e baixados em
+    background, entrando no atlas nos próximos pedidos.
+
+    Args:
+        request: Requisição HTTP (Accept para o formato do atlas)
+        ids: Lista de IDs separados por vírgula (ex: "1,4,7")
+        start: Primeiro ID do intervalo (alternativa a ids)
+        end: Último ID do intervalo, inclusive
+        image_type: Tipo de imagem
+        size: Lado da célula em pixels (16-256)
+        background_tasks: Para downloads em background
+        db: Sessão do banco de dados
+
+    Returns:
+        Mapa do atlas: url, width, height, cell_size, sprites e missing
+
+    Raises:
+        HTTPException: Se os parâmetros forem inválidos
+    """
+    supported_types = ['official-artwork', 'sprite', 'sprite-shiny', 'home', 'home-shiny']
+    if image_type not in supported_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipo de imagem não suportado. Use: {', '.join(supported_types)}"
+        )
+
+    if not 16 <= size <= 256:
+        raise HTTPException(status_code=400, detail="Tamanho da célula deve estar entre 16 e 256")
+
+    try:
+        if ids:
+            pokemon_ids = [int(pokemon_id) for pokemon_id in ids.split(",") if pokemon_id.strip()]
+        elif start is not None and end is not None and start <= end:
+            if end - start >= sprite_atlas_service.max_sprites:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Máximo de {sprite_atlas_service.max_sprites} Pokémons por atlas"
+                )
+            pokemon_ids = list(range(start, end + 1))
+        else:
+            raise HTTPException(status_code=400, detail="Informe ids ou start e end")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Lista de IDs inválida")
+
+    valid_ids = [pid for pid in pokemon_ids if (1 <= pid <= 1025) or (10001 <= pid <= 10300)]
+    if not valid_ids:
+        raise HTTPException(status_code=400, detail="Nenhum ID válido fornecido")
+
+    image_format = negotiate_image_format(request.headers.get("accept"))
+
+    try:
+        atlas = await sprite_atlas_service.get_atlas(valid_ids, image_type, size, image_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro ao gerar atlas: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+    missing = atlas["missing"] if atlas else valid_ids
+    if missing:
+        background_tasks.add_task(_background_preload_images, db, missing, [image_type])
+
+    if not atlas:
+        raise HTTPException(status_code=404, detail="Nenhuma imagem em cache para os Pokémons pedidos")
+
+    headers = {
+        # Com imagens faltando, o atlas muda assim que elas forem baixadas
+        "Cache-Control": "public, max-age=60" if missing else "public, max-age=86400",
+        "Vary": "Accept"
+    }
+    content = {
+        "url": request.url_for("get_sprite_atlas_image", atlas_file=atlas["file"]).path,
+        **atlas
+    }
+    return JSONResponse(content=content, headers=headers)
+
+
+@router.get("/atlas/{atlas_file}")
+async def get_sprite_atlas_image(atlas_file: str):
+    """
+    Serve a imagem de um atlas gerado por GET /images/atlas.
+
+    O nome do arquivo é derivado do conteúdo do atlas, então a resposta
+    pode ser cacheada indefinidamente.
+
+    Args:
+        atlas_file: Nome do arquivo do atlas
+
+    Returns:
+        FileResponse com o atlas
+
+    Raises:
+        HTTPException: Se o atlas não existir
+    """
+    name, _, image_format = atlas_file.partition(".")
+    if image_format not in VARIANT_MIME_TYPES or not name.isalnum():
+        raise HTTPException(status_code=404, detail="Atlas não encontrado")
+
+    path = sprite_atlas_service.get_atlas_path(atlas_file)
+    if not path:
+        raise HTTPException(status_code=404, detail="Atlas não encontrado")
+
+    return FileResponse(
+        path=path,
+        media_type=VARIANT_MIME_TYPES[image_format],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+
 @router.get("/pokemon/{pokemon_id}/info")
 async def get_pokemon_image_info(
     pokemon_id: int,
@@ -420,21 +673,25 @@ async def get_cache_stats(db: Session = Depends(get_db)):
 
         # Adiciona informações extras sobre arquivos físicos
         cache_dir = image_cache_service.cache_dir
-        physical_files = list(cache_dir.glob("*.png")) if cache_dir.exists() else []
+        physical_files = list(cache_dir.rglob("*.png")) if cache_dir.exists() else []
 
         return {
             "cache_stats": stats,
             "physical_files": {
                 "count": len(physical_files),
                 "total_size_mb": sum(f.stat().st_size for f in physical_files) / (1024 * 1024),
-                "directory": str(cache_dir.absolute())
+                "directory": str(cache_dir.absolute()),
+                "blobs": image_cache_service.blob_store.get_stats()
             },
             "service_info": {
                 "max_download_attempts": image_cache_service.max_download_attempts,
                 "retry_delay_hours": image_cache_service.retry_delay_hours,
                 "timeout_seconds": image_cache_service.timeout_seconds,
                 "supported_types": list(image_cache_service.image_urls.keys())
-            }
+            },
+            "index": image_index_verifier.get_status(),
+            "variants": image_optimization_service.variant_cache.get_status(),
+            "atlases": sprite_atlas_service.cache.get_status()
         }
 
     except Exception as e:
@@ -442,8 +699,98 @@ async def get_cache_stats(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
 
 
+@router.post("/cache/gc")
+async def collect_image_garbage():
+    """
+    Remove os blobs de imagens que nenhuma entrada do cache referencia.
+
+    Executada também periodicamente pelo verificador do índice; blobs
+    recentes (settings.image_blob_gc_grace) são mantidos.
+
+    Returns:
+        Blobs verificados, removidos e bytes liberados
+    """
+    try:
+        return await asyncio.to_thread(image_cache_service.collect_garbage)
+    except Exception as e:
+        logger.error(f"Erro na coleta de lixo das imagens: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get("/recovery/status")
+async def get_recovery_status(db: Session = Depends(get_db)):
+    """
+    Obtém o estado da recuperação de imagens pendentes.
+
+    Args:
+        db: Sessão do banco de dados
+
+    Returns:
+        Status do motor de recuperação, último ciclo e fila de imagens pendentes
+    """
+    try:
+        return {
+            **cache_recovery_engine.get_status(),
+            "queue": cache_recovery_engine.get_queue_stats(db)
+        }
+
+    except Exception as e:
+        logger.error(f"Erro ao obter status da recuperação: {e}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.post("/recovery/run")
+async def run_recovery_cycle(background_tasks: BackgroundTasks = BackgroundTasks()):
+    """
+    Agenda um ciclo de recuperação imediato em background.
+
+    Args:
+        background_tasks: Para processamento em background
+
+    Returns:
+        Confirmação do agendamento
+    """
+    if cache_recovery_engine.cycle_running:
+        raise HTTPException(status_code=409, detail="Ciclo de recuperação já em andamento")
+
+    background_tasks.add_task(cache_recovery_engine.run_cycle)
+    return {"message": "Ciclo de recuperação agendado"}
+
+
 # ===== FUNÇÕES AUXILIARES =====
 
+def _is_not_modified(request: Request, entry: ImageIndexEntry, etag: Optional[str] = None) -> bool:
+    """
+    Verifica se o cliente já possui a versão atual da imagem.
+
+    If-None-Match tem precedência sobre If-Modified-Since (RFC 9110).
+
+    Args:
+        request: Requisição HTTP
+        entry: Entrada do índice da imagem
+        etag: ETag da resposta, se diferente do ETag da imagem (ex: variantes)
+
+    Returns:
+        True se a resposta pode ser 304 Not Modified
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = (etag or entry.etag).removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(entry.mtime) <= since.timestamp()
+
+    return False
+
+
 async def _background_download_image(db: Session, pokemon_id: int, image_type: str):
     """
     Baixa uma imagem em background com gerenciamento robusto de sessão.
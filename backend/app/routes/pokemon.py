@@ -4,7 +4,9 @@ Rotas da API para integração com PokeAPI.
 Este módulo define todos os endpoints relacionados a Pokémons, incluindo:
 - Busca de listas paginadas de Pokémons
 - Detalhes individuais de Pokémons
+- Detalhes de vários Pokémons em lote
 - Informações de espécies e tipos
+- Efetividade entre tipos e Pokémons por tipo (calculados localmente)
 - Busca por nome
 - Tradução de descrições/flavor texts
 
@@ -20,6 +22,17 @@ Exemplo de uso:
     GET /api/v1/pokemon/pikachu
     GET /api/v1/pokemon/25
     
+    # Buscar apenas alguns campos ou a visão resumida
+    GET /api/v1/pokemon/25?fields=id,name,types,sprites.front_default
+    GET /api/v1/pokemon/25?view=summary
+    
+    # Buscar vários Pokémons de uma vez
+    POST /api/v1/pokemon/batch {"ids": [1, 2, 3], "fields": ["id", "name"]}
+    
+    # Efetividade de tipos e Pokémons de fogo e voador
+    GET /api/v1/pokemon/types/effectiveness?defend=grass,poison
+    GET /api/v1/pokemon/types/members?types=fire,flying
+    
     # Buscar Pokémons por nome
     GET /api/v1/pokemon/search/pika
     
@@ -28,12 +41,15 @@ Exemplo de uso:
     ```
 """
 from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Dict, List
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from app.services.pokeapi_service import pokeapi_service
+from app.services.pokeapi_service import pokeapi_service, POKEMON_SUMMARY_FIELDS
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.translation_service import get_or_translate_flavor
-import requests
+from app.schemas.schemas import PokemonBatchRequest
+from app.services.translation_service import get_or_translate_flavors
+from app.services.type_index_service import type_index_service, TypeIndex
+from app.utils.projection import parse_fields
 
 router = APIRouter(prefix="/pokemon", tags=["pokemon"])
 
@@ -80,13 +96,29 @@ async def get_pokemon_list(limit: int = 20, offset: int = 0) -> Dict:
 
 
 @router.get("/{pokemon_id_or_name}")
-async def get_pokemon(pokemon_id_or_name: str) -> Dict:
+async def get_pokemon(
+    pokemon_id_or_name: str,
+    fields: Optional[str] = None,
+    view: Optional[str] = None
+) -> Dict:
     """
     Busca dados detalhados de um Pokémon específico.
     
+    Por padrão retorna o payload completo da PokeAPI, que inclui arrays
+    grandes como moves e game_indices. Com fields ou view=summary, o payload
+    é reduzido no servidor a cada requisição, a partir da resposta completa
+    em cache. A forma reduzida não tem cache à parte (removido de propósito):
+    projetar é barato, e o cache guardava respostas completas por conjuntos
+    de campos arbitrários.
+    
     Args:
         pokemon_id_or_name: ID numérico ou nome do Pokémon (case-insensitive)
                            Exemplos: "25", "pikachu", "Pikachu"
+        fields: Campos a retornar, separados por vírgula; campos aninhados
+               usam '.' (ex: "id,name,types,sprites.front_default")
+        view: "summary" para id, nome, medidas, tipos, habilidades,
+              estatísticas e sprites principais; "full" (padrão) para tudo.
+              Ignorado quando fields é informado.
     
     Returns:
         Dict: Objeto completo do Pokémon contendo:
@@ -100,6 +132,7 @@ async def get_pokemon(pokemon_id_or_name: str) -> Dict:
             - sprites: URLs das imagens do Pokémon
     
     Raises:
+        HTTPException: 400 se view for inválido ou fields estiver vazio
         HTTPException: 404 se o Pokémon não for encontrado
     
     Example:
@@ -116,7 +149,27 @@ async def get_pokemon(pokemon_id_or_name: str) -> Dict:
         }
         ```
     """
-    pokemon = await pokeapi_service.get_pokemon(pokemon_id_or_name)
+    if fields is not None:
+        field_list = parse_fields(fields)
+        if not field_list:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Informe ao menos um campo em fields"
+            )
+    elif view in (None, "full"):
+        field_list = None
+    elif view == "summary":
+        field_list = POKEMON_SUMMARY_FIELDS
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="view deve ser 'summary' ou 'full'"
+        )
+
+    if field_list is None:
+        pokemon = await pokeapi_service.get_pokemon(pokemon_id_or_name)
+    else:
+        pokemon = await pokeapi_service.get_pokemon_projection(pokemon_id_or_name, field_list)
     if not pokemon:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,6 +178,52 @@ async def get_pokemon(pokemon_id_or_name: str) -> Dict:
     return pokemon
 
 
+@router.post("/batch")
+async def get_pokemon_batch(batch: PokemonBatchRequest) -> Dict:
+    """
+    Busca dados de vários Pokémons em uma única requisição.
+    
+    Os Pokémons que não estão em cache são buscados em paralelo na PokeAPI.
+    Substitui as várias chamadas a /pokemon/{id} feitas para montar uma
+    página da listagem.
+    
+    Args:
+        batch: IDs ou nomes dos Pokémons e, opcionalmente, os campos a retornar
+    
+    Returns:
+        Dict: Objeto contendo:
+            - results: Pokémons encontrados, na ordem solicitada
+            - not_found: IDs/nomes que não foram encontrados
+    
+    Raises:
+        HTTPException: 400 se o lote exceder o tamanho máximo
+    
+    Example:
+        ```json
+        {
+            "results": [
+                {"id": 1, "name": "bulbasaur", "types": [{"slot": 1, "type": {"name": "grass"}}]},
+                {"id": 25, "name": "pikachu", "types": [{"slot": 1, "type": {"name": "electric"}}]}
+            ],
+            "not_found": ["missingno"]
+        }
+        ```
+    """
+    if len(batch.ids) > settings.pokeapi_batch_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {settings.pokeapi_batch_max_ids} Pokémons por requisição"
+        )
+
+    pokemons = await pokeapi_service.get_pokemon_batch(
+        [str(item) for item in batch.ids], fields=batch.fields
+    )
+    return {
+        "results": [pokemon for pokemon in pokemons if pokemon is not None],
+        "not_found": [item for item, pokemon in zip(batch.ids, pokemons) if pokemon is None]
+    }
+
+
 @router.get("/{pokemon_id_or_name}/species")
 async def get_pokemon_species(pokemon_id_or_name: str) -> Dict:
     """
@@ -157,29 +256,34 @@ async def get_pokemon_species(pokemon_id_or_name: str) -> Dict:
 
 
 @router.get("/search/{query}")
-async def search_pokemon(query: str) -> List[Dict]:
+async def search_pokemon(query: str, limit: int = 10) -> List[Dict]:
     """
-    Busca Pokémons por nome com busca fuzzy/parcial.
+    Busca Pokémons por nome com busca por prefixo e aproximada.
+    
+    A busca é feita no índice local de nomes das espécies, sem acessar a
+    PokeAPI. Buscas por ID numérico retornam os dados completos do Pokémon.
     
     Args:
-        query: Termo de busca (mínimo 2 caracteres)
-              Busca parcial case-insensitive
+        query: Termo de busca (nome completo, parte do nome ou ID)
+              Busca case-insensitive e tolerante a erros de digitação
+        limit: Número máximo de candidatos (padrão: 10)
     
     Returns:
-        List[Dict]: Lista de Pokémons encontrados, cada um contendo:
+        List[Dict]: Lista de candidatos ordenada por relevância, cada um contendo:
             - name: Nome do Pokémon
             - url: URL completa do Pokémon na PokeAPI
-            - id: ID numérico extraído da URL
+            - id: ID numérico do Pokémon
+            - match: Tipo de correspondência ('exact', 'prefix' ou 'fuzzy')
     
     Example:
         ```json
         [
-            {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon/25/", "id": 25},
-            {"name": "raichu", "url": "https://pokeapi.co/api/v2/pokemon/26/", "id": 26}
+            {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon/25/", "id": 25, "match": "prefix"},
+            {"name": "pichu", "url": "https://pokeapi.co/api/v2/pokemon/172/", "id": 172, "match": "prefix"}
         ]
         ```
     """
-    return await pokeapi_service.search_pokemon(query)
+    return await pokeapi_service.search_pokemon(query, limit=limit)
 
 
 @router.get("/types/all")
@@ -242,6 +346,109 @@ async def get_type_details(type_name: str) -> Dict:
     return type_data
 
 
+async def _get_type_index() -> TypeIndex:
+    """Retorna o índice de tipos ou gera 503 se ele não puder ser construído."""
+    index = await type_index_service.get_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Índice de tipos indisponível"
+        )
+    return index
+
+
+def _parse_types(types: str) -> List[str]:
+    """Converte uma lista de tipos separada por vírgula, exigindo ao menos um."""
+    type_names = parse_fields(types.lower())
+    if not type_names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos um tipo"
+        )
+    return type_names
+
+
+@router.get("/types/matrix")
+async def get_type_matrix() -> Dict:
+    """
+    Retorna a matriz de efetividade entre todos os tipos.
+    
+    Returns:
+        Dict: Objeto contendo:
+            - types: Nomes dos tipos, na ordem das linhas e colunas
+            - matrix: Multiplicadores (linha: tipo atacante, coluna: tipo defensor)
+    
+    Raises:
+        HTTPException: 503 se os tipos não puderem ser obtidos da PokeAPI
+    """
+    index = await _get_type_index()
+    return {"types": index.types, "matrix": index.matrix()}
+
+
+@router.get("/types/effectiveness")
+async def get_type_effectiveness(defend: str, attack: Optional[str] = None) -> Dict:
+    """
+    Calcula a efetividade de ataques contra um ou mais tipos defensores.
+    
+    Args:
+        defend: Tipos do defensor separados por vírgula (ex: "grass,poison")
+        attack: Tipo do ataque; se omitido, retorna todos os tipos atacantes
+    
+    Returns:
+        Dict: Objeto contendo:
+            - defend: Tipos defensores
+            - multipliers: Mapa tipo atacante -> multiplicador de dano
+    
+    Raises:
+        HTTPException: 400 se nenhum tipo for informado
+        HTTPException: 404 se algum tipo não existir
+        HTTPException: 503 se os tipos não puderem ser obtidos da PokeAPI
+    
+    Example:
+        ```json
+        {"defend": ["grass", "poison"], "multipliers": {"fire": 2.0, "water": 0.5}}
+        ```
+    """
+    defending_types = _parse_types(defend)
+    index = await _get_type_index()
+    try:
+        if attack:
+            multipliers = {attack.lower(): index.multiplier(attack, defending_types)}
+        else:
+            multipliers = index.defensive_profile(defending_types)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return {"defend": defending_types, "multipliers": multipliers}
+
+
+@router.get("/types/members")
+async def get_pokemon_by_types(types: str) -> Dict:
+    """
+    Lista os IDs dos Pokémons que possuem todos os tipos informados.
+    
+    Args:
+        types: Tipos separados por vírgula (ex: "fire,flying")
+    
+    Returns:
+        Dict: Objeto contendo:
+            - types: Tipos consultados
+            - count: Quantidade de Pokémons
+            - pokemon_ids: IDs em ordem crescente
+    
+    Raises:
+        HTTPException: 400 se nenhum tipo for informado
+        HTTPException: 404 se algum tipo não existir
+        HTTPException: 503 se os tipos não puderem ser obtidos da PokeAPI
+    """
+    type_names = _parse_types(types)
+    index = await _get_type_index()
+    try:
+        pokemon_ids = index.pokemon_with_types(type_names)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return {"types": type_names, "count": len(pokemon_ids), "pokemon_ids": pokemon_ids}
+
+
 @router.get("/{pokemon_id_or_name}/flavor")
 async def get_pokemon_flavor_translated(
     pokemon_id_or_name: str, lang: str = "pt-BR", db: Session = Depends(get_db)
@@ -251,6 +458,8 @@ async def get_pokemon_flavor_translated(
     
     Suporta tradução para português (pt-BR), espanhol (es-ES) ou inglês nativo (en).
     Para português, utiliza serviço de tradução com cache para otimizar performance.
+    Os dados da espécie são obtidos pelo cliente HTTP assíncrono compartilhado,
+    através do mesmo cache usado pela rota /{pokemon_id_or_name}/species.
     
     Args:
         pokemon_id_or_name: ID numérico ou nome do Pokémon
@@ -277,11 +486,9 @@ async def get_pokemon_flavor_translated(
         }
         ```
     """
-    url = f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id_or_name}"
-    resp = requests.get(url, timeout=10)
-    if not resp.ok:
+    data = await pokeapi_service.get_pokemon_species(pokemon_id_or_name)
+    if not data:
         raise HTTPException(status_code=404, detail="Pokémon não encontrado na PokéAPI")
-    data = resp.json()
 
     # Define idioma base para busca
     if lang == "es-ES":
@@ -299,10 +506,7 @@ async def get_pokemon_flavor_translated(
 
     # Se for PT-BR, traduzir todos os flavors do inglês para português
     if lang == "pt-BR":
-        flavors_translated = [
-            get_or_translate_flavor(db, int(data["id"]), flavor, lang)
-            for flavor in flavors
-        ]
+        flavors_translated = get_or_translate_flavors(db, int(data["id"]), flavors, lang)
         return {"flavors": flavors_translated, "lang": lang}
     else:
         # Para EN ou ES, retorna nativo
@@ -13,6 +13,7 @@ from app.schemas.schemas import (
     ClientRegistration,
     Message
 )
+from app.services.pokemon_name_registry import pokemon_names
 from app.services.pull_sync_service import pull_service
 from app.services.pull_sync_scheduler import pull_scheduler
 
@@ -296,7 +297,8 @@ async def rebuild_ranking(db: Session = Depends(get_db)):
         # Primeiro sincronizar com storage
         sync_result = await pull_service.sync_with_storage_system(db)
 
-        # Depois forçar rebuild do ranking
+        # Depois forçar rebuild do ranking (com os nomes dos Pokémons carregados)
+        await pokemon_names.ensure_loaded()
         ranking_stats = pull_service.ranking_service.force_ranking_rebuild(db)
 
         return {
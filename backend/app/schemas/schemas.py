@@ -478,6 +478,30 @@ class ClientRegistration(BaseModel):
     capabilities: List[str] = []
 
 
+# ===== SCHEMAS DA POKEAPI =====
+
+class PokemonBatchRequest(BaseModel):
+    """
+    Schema para busca de vários Pokémons em uma única requisição.
+
+    Permite que a listagem do frontend carregue todos os Pokémons de uma
+    página de uma vez, trazendo apenas os campos que serão exibidos.
+
+    Attributes:
+        ids (List[Union[int, str]]): IDs ou nomes dos Pokémons
+        fields (Optional[List[str]]): Campos a retornar; caminhos aninhados
+            usam '.' (ex: "sprites.front_default"). Omitido retorna tudo.
+
+    Example:
+        >>> batch = PokemonBatchRequest(
+        ...     ids=[1, 2, "pikachu"],
+        ...     fields=["id", "name", "types", "sprites.front_default"]
+        ... )
+    """
+    ids: List[Union[int, str]]
+    fields: Optional[List[str]] = None
+
+
 # ===== SCHEMAS DE ESTATÍSTICAS =====
 
 class PokemonStats(BaseModel):
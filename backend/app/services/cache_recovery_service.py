@@ -0,0 +1,293 @@
+"""
+Recuperação contínua das imagens de Pokémons que falharam no download.
+
+Substitui os daemons avulsos (automation/cache_recovery_scheduler.py,
+continuous_cache_monitor.py e strategic_cache_recovery.py), que abriam
+conexões sqlite3 próprias e baixavam com requests e pausas de minutos, por
+um único motor que roda dentro do backend:
+- Task asyncio em background, iniciada pelo lifespan do FastAPI
+- Fila persistente: as imagens pendentes são as entradas não baixadas do
+  pokemon_image_cache, e ``next_attempt_at`` guarda quando cada uma pode
+  ser tentada de novo
+- Backoff exponencial com jitter a cada falha
+- Downloads pelo ImageCacheService e pelo ImageDownloadScheduler
+  (concorrência adaptativa, limite por host e Geração 1 primeiro)
+- Configuração única em settings (cache_recovery_*)
+
+Na aplicação, a instância usada é ``cache_recovery_engine`` (app.routes.images),
+que compartilha o ImageCacheService das rotas de imagens.
+
+Example:
+    >>> from app.services.cache_recovery_service import CacheRecoveryEngine
+    >>> engine = CacheRecoveryEngine()
+    >>> result = await engine.run_cycle()
+    >>> result["recovered"]
+    12
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.image_cache_service import ImageCacheService, PokemonImageCache
+from app.services.image_download_scheduler import (
+    PRIORITY_POKEMON_IDS,
+    DownloadJob,
+    ImageDownloadScheduler
+)
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempts: int, base_delay: float, max_delay: float) -> float:
+    """
+    Calcula a espera antes da próxima tentativa (backoff exponencial com jitter).
+
+    A espera dobra a cada tentativa, até ``max_delay``; metade dela é
+    aleatória, para que imagens que falharam juntas não sejam repetidas
+    todas no mesmo instante.
+
+    Args:
+        attempts: Tentativas já realizadas
+        base_delay: Espera após a primeira falha, em segundos
+        max_delay: Espera máxima em segundos
+
+    Returns:
+        Espera em segundos
+    """
+    delay = min(max_delay, base_delay * 2 ** max(attempts - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _is_due(now: datetime):
+    """Filtro das imagens cuja próxima tentativa já venceu (ou nunca foi agendada)."""
+    return or_(
+        PokemonImageCache.next_attempt_at == None,  # noqa: E711
+        PokemonImageCache.next_attempt_at <= now
+    )
+
+
+def _is_priority():
+    """Filtro das imagens da Geração 1 (recuperadas primeiro)."""
+    return PokemonImageCache.pokemon_id.between(
+        PRIORITY_POKEMON_IDS.start, PRIORITY_POKEMON_IDS.stop - 1
+    )
+
+
+class CacheRecoveryEngine:
+    """
+    Motor de recuperação das imagens pendentes do cache.
+
+    Cada ciclo seleciona as imagens não baixadas cuja próxima tentativa já
+    venceu (Geração 1 primeiro), tenta baixá-las e reagenda as que falharam.
+    """
+
+    def __init__(self, service: Optional[ImageCacheService] = None):
+        """
+        Args:
+            service: ImageCacheService usado nos downloads
+                (padrão: instância com o diretório de cache padrão)
+        """
+        self.service = service or ImageCacheService()
+        self.interval = settings.cache_recovery_interval
+        self.batch_size = settings.cache_recovery_batch_size
+        self.base_delay = settings.cache_recovery_base_delay
+        self.max_delay = settings.cache_recovery_max_delay
+
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        self.cycle_running = False
+        self.cycles = 0
+        self.total_recovered = 0
+        self.total_failed = 0
+        self.last_cycle: Optional[Dict] = None
+
+    async def start(self):
+        """Inicia a recuperação periódica em background."""
+        if self.running:
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("🩹 Recuperação do cache de imagens iniciada")
+
+    async def stop(self):
+        """Para a recuperação periódica."""
+        if not self.running:
+            return
+
+        self.running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("🛑 Recuperação do cache de imagens parada")
+
+    async def _run_loop(self):
+        """Loop principal da recuperação."""
+        while self.running:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.run_cycle()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Erro no ciclo de recuperação do cache: {e}")
+
+    def _due_entries(self, db: Session, now: datetime) -> List[DownloadJob]:
+        """Seleciona as imagens pendentes cuja próxima tentativa já venceu."""
+        priority = case(
+            (_is_priority(), 0),
+            else_=1
+        )
+        rows = db.query(PokemonImageCache.pokemon_id, PokemonImageCache.image_type).filter(
+            PokemonImageCache.is_downloaded == False,  # noqa: E712
+            _is_due(now)
+        ).order_by(priority, PokemonImageCache.pokemon_id).limit(self.batch_size).all()
+
+        return [DownloadJob(pokemon_id, image_type) for pokemon_id, image_type in rows]
+
+    async def _fetch(self, job: DownloadJob) -> str:
+        """Baixa uma imagem pendente; gera exceção se o download falhar."""
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            result = await self.service.retry_pokemon_image(db, job.pokemon_id, job.image_type)
+        finally:
+            db.close()
+
+        if not result:
+            raise RuntimeError(f"download de {job.key} falhou")
+        return result
+
+    def reschedule_failed(self, db: Session, failed: List[DownloadJob], now: datetime):
+        """Agenda a próxima tentativa das imagens que falharam."""
+        for job in failed:
+            entry = db.query(PokemonImageCache).filter(
+                PokemonImageCache.pokemon_id == job.pokemon_id,
+                PokemonImageCache.image_type == job.image_type
+            ).first()
+            if entry is not None and not entry.is_downloaded:
+                delay = backoff_delay(entry.download_attempts or 1, self.base_delay, self.max_delay)
+                entry.next_attempt_at = now + timedelta(seconds=delay)
+        db.commit()
+
+    async def run_cycle(self) -> Dict:
+        """
+        Executa um ciclo de recuperação.
+
+        Returns:
+            Resultado do ciclo: processed, recovered, failed, started_at,
+            duration_seconds e failed_images. Se outro ciclo já estiver em
+            andamento, retorna {"status": "busy"}.
+        """
+        if self.cycle_running:
+            return {"status": "busy"}
+
+        from app.core.database import SessionLocal
+
+        self.cycle_running = True
+        started = datetime.utcnow()
+        try:
+            db = SessionLocal()
+            try:
+                jobs = await asyncio.to_thread(self._due_entries, db, started)
+            finally:
+                db.close()
+
+            if jobs:
+                logger.info(f"🩹 Recuperando {len(jobs)} imagens pendentes")
+
+            scheduler = ImageDownloadScheduler(self._fetch, max_attempts=1)
+            stats = await scheduler.run(jobs)
+            failed = [
+                job for job in jobs
+                if scheduler.results.get(job.key, {}).get('status') == 'failed'
+            ]
+
+            if failed:
+                db = SessionLocal()
+                try:
+                    await asyncio.to_thread(self.reschedule_failed, db, failed, datetime.utcnow())
+                finally:
+                    db.close()
+
+            self.cycles += 1
+            self.total_recovered += stats['success']
+            self.total_failed += len(failed)
+            self.last_cycle = {
+                "status": "completed",
+                "started_at": started.isoformat(),
+                "duration_seconds": round((datetime.utcnow() - started).total_seconds(), 3),
+                "processed": len(jobs),
+                "recovered": stats['success'],
+                "failed": len(failed),
+                "failed_images": [job.key for job in failed]
+            }
+            if jobs:
+                logger.info(
+                    f"✅ Ciclo de recuperação: {stats['success']}/{len(jobs)} imagens recuperadas"
+                )
+            return self.last_cycle
+        finally:
+            self.cycle_running = False
+
+    def get_queue_stats(self, db: Session) -> Dict:
+        """
+        Retorna o estado da fila de recuperação.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            pending (imagens não baixadas), due (prontas para nova
+            tentativa), next_attempt_at e cobertura da Geração 1
+        """
+        now = datetime.utcnow()
+        pending = db.query(PokemonImageCache).filter(
+            PokemonImageCache.is_downloaded == False  # noqa: E712
+        )
+        due = pending.filter(
+            _is_due(now)
+        ).count()
+        next_attempt = db.query(PokemonImageCache.next_attempt_at).filter(
+            PokemonImageCache.is_downloaded == False,  # noqa: E712
+            PokemonImageCache.next_attempt_at > now
+        ).order_by(PokemonImageCache.next_attempt_at).first()
+
+        priority = db.query(PokemonImageCache).filter(_is_priority())
+        priority_total = priority.count()
+        priority_downloaded = priority.filter(
+            PokemonImageCache.is_downloaded == True  # noqa: E712
+        ).count()
+        coverage = round(priority_downloaded / priority_total * 100, 2) if priority_total else 0
+
+        return {
+            "pending": pending.count(),
+            "due": due,
+            "next_attempt_at": next_attempt[0].isoformat() if next_attempt else None,
+            "priority_coverage": coverage
+        }
+
+    def get_status(self) -> Dict:
+        """Retorna status do motor de recuperação."""
+        return {
+            "running": self.running,
+            "cycle_running": self.cycle_running,
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "cycles": self.cycles,
+            "total_recovered": self.total_recovered,
+            "total_failed": self.total_failed,
+            "last_cycle": self.last_cycle,
+            "download_gate": self.service.download_gate.get_status()
+        }
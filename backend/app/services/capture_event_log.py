@@ -0,0 +1,165 @@
+"""
+Log de eventos append-only com snapshots compactados.
+
+Motor de persistência do ClientStorageService. Cada alteração é gravada como
+uma linha JSON no final do log (``client_storage.log``), com fsync, e custa
+O(alteração) em vez de reescrever o estado inteiro. Periodicamente o estado
+completo é gravado como snapshot (``client_storage.json``) e o log é
+esvaziado (compactação).
+
+Garantias contra falhas:
+- O snapshot é gravado em um arquivo temporário, sincronizado e renomeado
+  sobre o anterior (os.replace), então nunca fica parcialmente gravado
+- Cada evento tem um número de sequência e o snapshot guarda o último
+  incluído (``last_seq``): se o processo cair entre a gravação do snapshot
+  e o esvaziamento do log, os eventos já incluídos são ignorados no replay
+- Uma última linha incompleta (queda durante o append) é descartada e
+  removida do arquivo na carga
+
+Example:
+    >>> from app.services.capture_event_log import CaptureEventLog
+    >>> log = CaptureEventLog(Path("client_storage.json"))
+    >>> snapshot, events = log.load()
+    >>> log.append({"op": "changes", "user_id": "ash", "added": [25]})
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _fsync_directory(path: Path):
+    """Sincroniza o diretório para tornar um rename durável (POSIX)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Não suportado (ex: Windows)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class CaptureEventLog:
+    """
+    Snapshot JSON mais log de eventos JSON Lines.
+    """
+
+    def __init__(self, snapshot_path: Path, log_path: Optional[Path] = None):
+        """
+        Args:
+            snapshot_path: Arquivo do snapshot
+            log_path: Arquivo do log (padrão: snapshot com extensão .log)
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.log_path = Path(log_path) if log_path else self.snapshot_path.with_suffix(".log")
+        self.last_seq = 0
+        self.pending_events = 0  # Eventos no log desde o último snapshot
+
+    def load(self) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Lê o snapshot e os eventos posteriores a ele.
+
+        Returns:
+            Tupla (snapshot ou None, eventos a reaplicar em ordem)
+
+        Raises:
+            ValueError: Se o snapshot estiver corrompido
+        """
+        snapshot = None
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+
+        self.last_seq = snapshot.get("last_seq", 0) if snapshot else 0
+        events = self._read_log(self.last_seq)
+        if events:
+            self.last_seq = events[-1]["seq"]
+        self.pending_events = len(events)
+        return snapshot, events
+
+    def _read_log(self, after_seq: int) -> List[Dict]:
+        """Lê os eventos do log com sequência maior que ``after_seq``."""
+        if not self.log_path.exists():
+            return []
+
+        events = []
+        valid_bytes = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("linha incompleta")
+                    event = json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️ Final incompleto descartado do log: {self.log_path}")
+                    break
+                valid_bytes += len(line)
+                if event["seq"] > after_seq:
+                    events.append(event)
+
+        if valid_bytes < self.log_path.stat().st_size:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return events
+
+    def append(self, event: Dict) -> int:
+        """
+        Grava um evento no final do log, de forma durável.
+
+        Args:
+            event: Evento serializável em JSON (recebe o campo ``seq``)
+
+        Returns:
+            Número de sequência do evento
+        """
+        self.last_seq += 1
+        event["seq"] = self.last_seq
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.pending_events += 1
+        return self.last_seq
+
+    def write_snapshot(self, state: Dict):
+        """
+        Grava o estado completo como snapshot e esvazia o log.
+
+        Args:
+            state: Estado serializável em JSON (recebe o campo ``last_seq``)
+        """
+        state["last_seq"] = self.last_seq
+        tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.part")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            _fsync_directory(self.snapshot_path.parent)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        # Eventos até last_seq estão no snapshot e seriam ignorados no replay
+        if self.log_path.exists():
+            with open(self.log_path, 'w', encoding='utf-8') as f:
+                os.fsync(f.fileno())
+        self.pending_events = 0
+
+    def delete(self):
+        """Remove o snapshot e o log."""
+        for path in (self.snapshot_path, self.log_path):
+            if path.exists():
+                path.unlink()
+        self.last_seq = 0
+        self.pending_events = 0
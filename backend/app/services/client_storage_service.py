@@ -1,14 +1,26 @@
 """
 Serviço para gerenciar o armazenamento dos dados dos clientes.
 Mantém um registro consolidado de todos os pokémons capturados por todos os clientes.
+
+Para a sincronização incremental, guarda também o cursor de cada cliente: o
+timestamp da última captura aplicada, enviado como ``since`` no ciclo
+seguinte para que o cliente retorne apenas as capturas novas.
+
+A persistência usa um log de eventos append-only (CaptureEventLog): cada
+alteração grava apenas o que mudou, e as contagens globais são ajustadas
+pela diferença. A cada settings.client_storage_compact_events eventos o
+estado completo é gravado como snapshot em ``client_storage.json``; na
+inicialização o snapshot é carregado e os eventos posteriores reaplicados.
 """
 
-import json
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 
+from app.core.config import settings
+from app.services.capture_event_log import CaptureEventLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,39 +29,112 @@ class ClientStorageService:
 
     def __init__(self, storage_file: str = "client_storage.json"):
         self.storage_file = Path(storage_file)
+        self.event_log = CaptureEventLog(self.storage_file)
         self.data = self._load_storage()
 
     def _load_storage(self) -> Dict:
-        """Carrega dados do arquivo de armazenamento."""
-        if self.storage_file.exists():
-            try:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Erro ao carregar storage: {e}")
-                return self._create_empty_storage()
-        else:
+        """Carrega o snapshot e reaplica os eventos gravados depois dele."""
+        try:
+            snapshot, events = self.event_log.load()
+        except Exception as e:
+            logger.error(f"Erro ao carregar storage: {e}")
             return self._create_empty_storage()
 
+        data = self._create_empty_storage()
+        if snapshot:
+            # Chaves JSON são strings e conjuntos são gravados como listas
+            data["clients"] = {
+                user_id: set(pokemon_ids) for user_id, pokemon_ids in snapshot.get("clients", {}).items()
+            }
+            data["cursors"] = snapshot.get("cursors", {})
+            data["last_updated"] = snapshot.get("last_updated", data["last_updated"])
+        self.data = data
+        self._recalculate_pokemon_counts()
+
+        for event in events:
+            self._apply_event(event)
+        if events:
+            logger.info(f"📜 {len(events)} eventos do storage reaplicados")
+
+        return self.data
+
     def _create_empty_storage(self) -> Dict:
         """Cria estrutura vazia do storage."""
         return {
-            "clients": {},  # user_id -> lista de pokémons capturados
+            "clients": {},  # user_id -> conjunto de pokémons capturados
             "pokemon_counts": {},  # pokemon_id -> contagem total
+            "cursors": {},  # user_id -> timestamp da última captura aplicada
             "last_updated": datetime.now().isoformat(),
-            "version": "1.0"
+            "version": "2.0"
         }
 
+    def _apply_event(self, event: Dict):
+        """Aplica um evento ao estado em memória (gravação e replay)."""
+        user_id = event["user_id"]
+        counts = self.data["pokemon_counts"]
+
+        if event["op"] == "remove_client":
+            removed = self.data["clients"].pop(user_id, set())
+            self.data["cursors"].pop(user_id, None)
+        else:
+            client_pokemons = self.data["clients"].setdefault(user_id, set())
+            for pokemon_id in event.get("added", []):
+                if pokemon_id not in client_pokemons:
+                    client_pokemons.add(pokemon_id)
+                    counts[pokemon_id] = counts.get(pokemon_id, 0) + 1
+            removed = [pokemon_id for pokemon_id in event.get("removed", []) if pokemon_id in client_pokemons]
+            client_pokemons.difference_update(removed)
+            if event.get("cursor") is not None:
+                self.data["cursors"][user_id] = event["cursor"]
+
+        for pokemon_id in removed:
+            counts[pokemon_id] -= 1
+            if counts[pokemon_id] <= 0:
+                del counts[pokemon_id]
+
+        self.data["last_updated"] = event["ts"]
+
+    def _record(self, event: Dict):
+        """Grava um evento no log, aplica-o e compacta o log se necessário."""
+        event["ts"] = datetime.now().isoformat()
+        try:
+            self.event_log.append(event)
+        except Exception as e:
+            logger.error(f"Erro ao salvar storage: {e}")
+        self._apply_event(event)
+
+        if self.event_log.pending_events >= settings.client_storage_compact_events:
+            self._save_storage()
+
     def _save_storage(self):
-        """Salva dados no arquivo de armazenamento."""
+        """Grava o estado completo como snapshot (compacta o log)."""
         try:
-            self.data["last_updated"] = datetime.now().isoformat()
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            self.event_log.write_snapshot({
+                "clients": {
+                    user_id: sorted(pokemon_ids) for user_id, pokemon_ids in self.data["clients"].items()
+                },
+                "pokemon_counts": self.data["pokemon_counts"],
+                "cursors": self.data["cursors"],
+                "last_updated": self.data["last_updated"],
+                "version": self.data["version"]
+            })
             logger.info(f"💾 Storage salvo: {self.storage_file}")
         except Exception as e:
             logger.error(f"Erro ao salvar storage: {e}")
 
+    def _record_changes(
+        self,
+        user_id: str,
+        added: Iterable[int],
+        removed: Iterable[int],
+        cursor: Optional[Union[int, str]] = None
+    ):
+        """Grava as alterações de um cliente como um evento."""
+        event = {"op": "changes", "user_id": user_id, "added": list(added), "removed": list(removed)}
+        if cursor is not None:
+            event["cursor"] = cursor
+        self._record(event)
+
     def update_client_captures(self, user_id: str, captured_pokemons: List[Dict]) -> Dict[str, int]:
         """
         Atualiza as capturas de um cliente específico.
@@ -65,20 +150,15 @@ class ClientStorageService:
 
         # Converter lista para set de IDs para facilitar comparação
         new_pokemon_ids = {pokemon['pokemon_id'] for pokemon in captured_pokemons}
-        old_pokemon_ids = set(self.data["clients"].get(user_id, []))
+        old_pokemon_ids = self.data["clients"].get(user_id, set())
 
         # Calcular diferenças
         added = new_pokemon_ids - old_pokemon_ids
         removed = old_pokemon_ids - new_pokemon_ids
 
-        # Atualizar dados do cliente
-        self.data["clients"][user_id] = list(new_pokemon_ids)
-
-        # Recalcular contagens globais
-        self._recalculate_pokemon_counts()
-
-        # Salvar mudanças
-        self._save_storage()
+        # Gravar apenas as diferenças
+        if added or removed or user_id not in self.data["clients"]:
+            self._record_changes(user_id, added, removed)
 
         stats = {
             "added_count": len(added),
@@ -91,6 +171,53 @@ class ClientStorageService:
         logger.info(f"📊 Cliente {user_id}: +{len(added)}, -{len(removed)}, total: {len(new_pokemon_ids)}")
         return stats
 
+    def get_sync_cursor(self, user_id: str) -> Optional[Union[int, str]]:
+        """Retorna o timestamp da última captura aplicada de um cliente."""
+        return self.data["cursors"].get(user_id)
+
+    def apply_client_changes(
+        self,
+        user_id: str,
+        pokemon_states: Dict[int, bool],
+        cursor: Optional[Union[int, str]] = None
+    ) -> Dict[str, int]:
+        """
+        Aplica as capturas novas de um cliente (sincronização incremental).
+
+        Apenas os pokémons alterados são atualizados, e as contagens globais
+        são ajustadas pela diferença, sem recalcular o storage inteiro.
+
+        Args:
+            user_id: ID do usuário/cliente
+            pokemon_states: Estado final de cada pokémon alterado
+                (True = capturado, False = removido)
+            cursor: Timestamp da última captura aplicada (None mantém o atual)
+
+        Returns:
+            Dict com estatísticas da atualização
+        """
+        client_pokemons = self.data["clients"].get(user_id, set())
+        added = [pokemon_id for pokemon_id, is_captured in pokemon_states.items()
+                 if is_captured and pokemon_id not in client_pokemons]
+        removed = [pokemon_id for pokemon_id, is_captured in pokemon_states.items()
+                   if not is_captured and pokemon_id in client_pokemons]
+
+        cursor_changed = cursor is not None and cursor != self.data["cursors"].get(user_id)
+        if added or removed or cursor_changed or user_id not in self.data["clients"]:
+            self._record_changes(user_id, added, removed, cursor if cursor_changed else None)
+
+        total = len(self.data["clients"][user_id])
+        if added or removed:
+            logger.info(f"📊 Cliente {user_id}: +{len(added)}, -{len(removed)}, total: {total}")
+
+        return {
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "total_captures": total,
+            "added_pokemons": added,
+            "removed_pokemons": removed
+        }
+
     def _recalculate_pokemon_counts(self):
         """Recalcula as contagens globais de pokémons."""
         counts = {}
@@ -109,7 +236,7 @@ class ClientStorageService:
 
     def get_client_captures(self, user_id: str) -> List[int]:
         """Retorna pokémons capturados por um cliente específico."""
-        return self.data["clients"].get(user_id, [])
+        return sorted(self.data["clients"].get(user_id, set()))
 
     def get_all_clients(self) -> List[str]:
         """Retorna lista de todos os clientes."""
@@ -145,15 +272,14 @@ class ClientStorageService:
             "total_unique_pokemons": len(counts),
             "total_captures": sum(counts.values()),
             "last_updated": self.data["last_updated"],
-            "version": self.data["version"]
+            "version": self.data["version"],
+            "pending_events": self.event_log.pending_events
         }
 
     def remove_client(self, user_id: str) -> bool:
-        """Remove um cliente e recalcula contagens."""
+        """Remove um cliente e ajusta as contagens."""
         if user_id in self.data["clients"]:
-            del self.data["clients"][user_id]
-            self._recalculate_pokemon_counts()
-            self._save_storage()
+            self._record({"op": "remove_client", "user_id": user_id})
             logger.info(f"🗑️ Cliente {user_id} removido do storage")
             return True
         return False
@@ -163,16 +289,16 @@ class ClientStorageService:
         self.data = self._create_empty_storage()
         self._save_storage()
         logger.info("🧹 Storage limpo")
-    
+
     def force_clear_and_rebuild(self):
         """Força limpeza completa e reconstrói storage."""
         logger.info("🔄 Forçando limpeza completa do storage")
-        
-        # Remover arquivo de storage se existir
-        if self.storage_file.exists():
-            self.storage_file.unlink()
+
+        # Remover arquivos de storage (snapshot e log) se existirem
+        if self.storage_file.exists() or self.event_log.log_path.exists():
+            self.event_log.delete()
             logger.info(f"🗑️ Arquivo de storage removido: {self.storage_file}")
-        
+
         # Recriar storage vazio
         self.data = self._create_empty_storage()
         self._save_storage()
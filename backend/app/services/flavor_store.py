@@ -0,0 +1,224 @@
+"""
+Armazenamento compacto dos flavor texts locais dos Pokémons.
+
+Este módulo substitui o carregamento dos arquivos ``data/flavors_*.json`` em
+dicionários Python por um índice binário mapeado em memória (mmap):
+- Cada idioma é carregado apenas quando usado pela primeira vez
+- O índice binário é gerado a partir do JSON e reaproveitado entre execuções
+- As páginas do arquivo são compartilhadas entre os workers pelo sistema
+  operacional, em vez de cada processo manter uma cópia de todos os textos
+
+Formato do arquivo ``.bin`` (inteiros little-endian):
+    cabeçalho: magic b"PKFL", versão (u16), quantidade de Pokémons (u32)
+    tabela:    quantidade x (pokemon_id u32, offset u32, tamanho u32),
+               ordenada por pokemon_id
+    dados:     textos UTF-8 de cada Pokémon separados por U+001E
+
+Example:
+    >>> from app.services.flavor_store import get_flavor_store
+    >>> flavors = get_flavor_store("pt-BR").get(25)
+    >>> len(flavors) > 0
+    True
+
+O índice pode ser gerado antecipadamente (ex: no build do deploy) com:
+    python -m app.services.flavor_store
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data')
+
+# Arquivo JSON de origem de cada idioma disponível localmente
+FLAVOR_SOURCES = {
+    'en': 'flavors_en.json',
+    'pt-BR': 'flavors_ptbr.json',
+}
+
+_MAGIC = b"PKFL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<III")
+_SEPARATOR = "\x1e"
+
+
+def build_flavor_index(json_path: str, bin_path: str) -> int:
+    """
+    Gera o índice binário de flavor texts a partir do arquivo JSON.
+
+    O arquivo é escrito em um temporário e renomeado atomicamente, para que
+    outros processos nunca vejam um índice incompleto.
+
+    Args:
+        json_path: Caminho do JSON {pokemon_id: [flavors]}
+        bin_path: Caminho do índice binário a gerar
+
+    Returns:
+        Número de Pokémons indexados
+    """
+    with open(json_path, encoding='utf-8') as f:
+        flavors = json.load(f)
+
+    entries = []
+    blob = bytearray()
+    for pokemon_id in sorted(flavors, key=int):
+        data = _SEPARATOR.join(flavors[pokemon_id]).encode('utf-8')
+        entries.append((int(pokemon_id), len(blob), len(data)))
+        blob += data
+
+    tmp_path = f"{bin_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(entries)))
+        for entry in entries:
+            f.write(_ENTRY.pack(*entry))
+        f.write(blob)
+    os.replace(tmp_path, bin_path)
+
+    logger.info(f"Índice de flavors gerado: {bin_path} ({len(entries)} Pokémons)")
+    return len(entries)
+
+
+class FlavorStore:
+    """
+    Índice de flavor texts de um idioma, mapeado em memória sob demanda.
+
+    O arquivo só é aberto na primeira consulta. Se o índice binário não
+    existir ou for mais antigo que o JSON de origem, ele é regenerado.
+
+    Attributes:
+        lang: Código do idioma (ex: 'en', 'pt-BR')
+        json_path: Caminho do JSON de origem
+        bin_path: Caminho do índice binário
+    """
+
+    def __init__(self, lang: str, json_path: str, bin_path: Optional[str] = None):
+        self.lang = lang
+        self.json_path = json_path
+        self.bin_path = bin_path or os.path.splitext(json_path)[0] + '.bin'
+        self._mmap: Optional[mmap.mmap] = None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        """Abre (e se necessário gera) o índice binário na primeira consulta."""
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                if self._needs_build():
+                    build_flavor_index(self.json_path, self.bin_path)
+
+                with open(self.bin_path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+                magic, version, count = _HEADER.unpack_from(mapped, 0)
+                if magic != _MAGIC or version != _VERSION:
+                    mapped.close()
+                    raise ValueError(f"Índice de flavors inválido: {self.bin_path}")
+
+                self._mmap = mapped
+                self._count = count
+            except FileNotFoundError:
+                logger.warning(f"Arquivo de flavors não encontrado para {self.lang}: {self.json_path}")
+            except Exception as e:
+                logger.error(f"Erro ao carregar flavors de {self.lang}: {e}")
+            finally:
+                self._loaded = True
+
+    def _needs_build(self) -> bool:
+        """Indica se o índice binário está ausente ou desatualizado."""
+        if not os.path.exists(self.bin_path):
+            return True
+        return os.path.getmtime(self.bin_path) < os.path.getmtime(self.json_path)
+
+    def get(self, pokemon_id: int) -> List[str]:
+        """
+        Retorna os flavor texts de um Pokémon.
+
+        Args:
+            pokemon_id: ID do Pokémon
+
+        Returns:
+            Lista de flavor texts (vazia se o Pokémon não estiver indexado)
+        """
+        self._ensure_loaded()
+        if self._mmap is None:
+            return []
+
+        table_start = _HEADER.size
+        low, high = 0, self._count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            entry_id, offset, length = _ENTRY.unpack_from(self._mmap, table_start + middle * _ENTRY.size)
+            if entry_id < pokemon_id:
+                low = middle + 1
+            elif entry_id > pokemon_id:
+                high = middle - 1
+            else:
+                if length == 0:
+                    return []
+                data_start = table_start + self._count * _ENTRY.size + offset
+                return self._mmap[data_start:data_start + length].decode('utf-8').split(_SEPARATOR)
+
+        return []
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self._count
+
+    def close(self):
+        """Libera o mapeamento em memória."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._loaded = False
+
+
+_stores: Dict[str, FlavorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_flavor_store(lang: str) -> Optional[FlavorStore]:
+    """
+    Retorna o índice de flavor texts de um idioma, criando-o sob demanda.
+
+    Args:
+        lang: Código do idioma (ver FLAVOR_SOURCES)
+
+    Returns:
+        FlavorStore do idioma ou None se não houver dados locais para ele
+    """
+    store = _stores.get(lang)
+    if store is not None:
+        return store
+
+    filename = FLAVOR_SOURCES.get(lang)
+    if filename is None:
+        return None
+
+    with _stores_lock:
+        store = _stores.get(lang)
+        if store is None:
+            store = FlavorStore(lang, os.path.join(DATA_DIR, filename))
+            _stores[lang] = store
+    return store
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for lang, filename in FLAVOR_SOURCES.items():
+        json_path = os.path.join(DATA_DIR, filename)
+        count = build_flavor_index(json_path, os.path.splitext(json_path)[0] + '.bin')
+        print(f"{lang}: {count} Pokémons indexados")
@@ -0,0 +1,200 @@
+"""
+Armazenamento endereçado por conteúdo das imagens dos Pokémons.
+
+Cada imagem é gravada uma única vez, com o nome igual ao hash SHA-256 do
+seu conteúdo (``blobs/ab/abcd....png``). Entradas do PokemonImageCache com
+imagens idênticas (ex: formas alternativas 10001+ que repetem a forma base
+e placeholders do repositório de sprites) apontam para o mesmo arquivo.
+
+Consequências:
+- Um arquivo nunca é sobrescrito: conteúdo novo gera um blob novo
+- A integridade é verificada comparando o hash do conteúdo com o nome
+- Blobs que nenhuma entrada referencia são removidos pela coleta de lixo
+  (executada periodicamente pelo ImageIndexVerifier), após um período de
+  carência que protege downloads ainda não registrados no banco
+
+Example:
+    >>> from app.services.image_blob_store import ImageBlobStore
+    >>> store = ImageBlobStore(Path("pokemon_images/blobs"))
+    >>> path, deduplicated = store.store("pokemon_images/25_official-artwork.png", content_hash)
+"""
+import hashlib
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Extensão do blob pelo formato detectado nos magic bytes
+_EXTENSIONS = [
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'GIF8', '.gif'),
+    (b'RIFF', '.webp'),
+]
+
+
+def hash_file(path: str, chunk_size: int = 64 * 1024) -> str:
+    """
+    Calcula o SHA-256 (hex) do conteúdo de um arquivo, em blocos.
+
+    Args:
+        path: Caminho do arquivo
+        chunk_size: Tamanho dos blocos lidos
+
+    Returns:
+        Hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageBlobStore:
+    """
+    Diretório de blobs nomeados pelo SHA-256 do conteúdo.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Diretório dos blobs
+        """
+        self.root = Path(root)  # Criado no primeiro blob armazenado
+        self._real_root = os.path.realpath(self.root)
+
+    @staticmethod
+    def _extension(path: str) -> str:
+        """Extensão do blob a partir dos primeiros bytes do arquivo."""
+        with open(path, 'rb') as f:
+            header = f.read(12)
+        for signature, extension in _EXTENSIONS:
+            if header.startswith(signature):
+                return extension
+        return '.png'
+
+    def blob_path(self, content_hash: str, extension: str = '.png') -> Path:
+        """Retorna o caminho do blob de um hash."""
+        return self.root / content_hash[:2] / f"{content_hash}{extension}"
+
+    def contains(self, path: str) -> bool:
+        """Verifica se um caminho pertence ao armazenamento de blobs."""
+        return os.path.realpath(path).startswith(self._real_root + os.sep)
+
+    def store(self, path: str, content_hash: str, keep_source: bool = False) -> Tuple[str, bool]:
+        """
+        Move um arquivo para o armazenamento, pelo hash do seu conteúdo.
+
+        Se já existir um blob com o mesmo hash, o arquivo é descartado e o
+        blob existente é reutilizado.
+
+        Args:
+            path: Arquivo com o conteúdo (no mesmo sistema de arquivos)
+            content_hash: SHA-256 do conteúdo
+            keep_source: Mantém o arquivo original, ligando-o (hard link) ou
+                copiando-o para o blob em vez de movê-lo
+
+        Returns:
+            Tupla (caminho do blob, True se o conteúdo já estava armazenado)
+        """
+        blob = self.blob_path(content_hash, self._extension(path))
+        if blob.exists():
+            if not keep_source:
+                os.remove(path)
+            # Renova a data de modificação para a carência da coleta de lixo
+            os.utime(blob)
+            return str(blob), True
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if keep_source:
+            self._link_or_copy(path, blob)
+        else:
+            os.replace(path, blob)
+        return str(blob), False
+
+    @staticmethod
+    def _link_or_copy(path: str, blob: Path):
+        """Cria o blob como hard link do arquivo ou, se não for possível, como cópia."""
+        try:
+            os.link(path, blob)
+            return
+        except FileExistsError:
+            return  # Mesmo conteúdo armazenado em paralelo
+        except OSError:
+            pass
+
+        # Cópia em arquivo temporário: o blob aparece completo ou não aparece
+        tmp_path = blob.with_name(f"{blob.name}.{os.getpid()}.part")
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, blob)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def verify(self, path: str) -> bool:
+        """
+        Verifica a integridade de um blob: o hash do conteúdo deve ser o nome.
+
+        Args:
+            path: Caminho do blob
+
+        Returns:
+            True se o conteúdo corresponde ao nome
+        """
+        try:
+            return hash_file(path) == Path(path).stem
+        except OSError:
+            return False
+
+    def collect_garbage(self, referenced: Iterable[str], grace_seconds: float = 3600) -> Dict[str, int]:
+        """
+        Remove os blobs que não são referenciados.
+
+        Blobs modificados há menos de ``grace_seconds`` são mantidos, pois
+        podem pertencer a um download cujo registro ainda não foi gravado.
+
+        Args:
+            referenced: Caminhos em uso (PokemonImageCache e índice)
+            grace_seconds: Carência em segundos
+
+        Returns:
+            blobs, removed e freed_bytes
+        """
+        in_use = {os.path.realpath(path) for path in referenced}
+        cutoff = time.time() - grace_seconds
+        stats = {"blobs": 0, "removed": 0, "freed_bytes": 0}
+
+        for blob in self.root.glob("??/*"):
+            if not blob.is_file():
+                continue
+            stats["blobs"] += 1
+            if os.path.realpath(blob) in in_use:
+                continue
+            try:
+                stat = blob.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                blob.unlink()
+            except OSError:
+                continue
+            stats["removed"] += 1
+            stats["freed_bytes"] += stat.st_size
+
+        if stats["removed"]:
+            logger.info(f"🧹 {stats['removed']} blobs de imagem sem referência removidos ({stats['freed_bytes']} bytes)")
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Retorna o número de blobs e o espaço ocupado."""
+        sizes = [blob.stat().st_size for blob in self.root.glob("??/*") if blob.is_file()]
+        return {
+            "directory": str(self.root),
+            "blobs": len(sizes),
+            "total_size_mb": round(sum(sizes) / (1024 * 1024), 2)
+        }
@@ -0,0 +1,294 @@
+"""
+Índice em memória das imagens de Pokémons já cacheadas em disco.
+
+Este módulo evita que cada requisição de imagem consulte o banco de dados e
+verifique o arquivo no disco. O índice mapeia (pokemon_id, image_type) para
+o caminho, tamanho, data de modificação e ETag do arquivo:
+- É carregado na inicialização a partir do PokemonImageCache
+- Guarda o ETag de cada imagem (hash SHA-256 do conteúdo, calculado no
+  download), permitindo responder 304 sem ler o arquivo
+- É atualizado quando um download termina
+- Tem a integridade verificada periodicamente em background
+  (ImageIndexVerifier), fora do caminho das requisições
+
+Example:
+    >>> from app.services.image_cache_index import get_image_index
+    >>> index = get_image_index(Path("pokemon_images"))
+    >>> entry = index.get(25, "official-artwork")
+    >>> entry.path if entry else None
+    'pokemon_images/25_official-artwork.png'
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+IndexKey = Tuple[int, str]
+
+
+class ImageIndexEntry:
+    """
+    Metadados de uma imagem cacheada em disco.
+
+    Attributes:
+        path (str): Caminho local do arquivo.
+        size (int): Tamanho em bytes.
+        mtime (float): Data de modificação (timestamp).
+        content_hash (Optional[str]): SHA-256 do conteúdo, se conhecido.
+        etag (str): ETag forte com o hash do conteúdo ou, enquanto o hash não
+            for conhecido, ETag fraco derivado do tamanho e da modificação.
+        stat (os.stat_result): Resultado do stat, reaproveitado ao servir
+            o arquivo.
+    """
+
+    __slots__ = ("path", "size", "mtime", "content_hash", "etag", "stat")
+
+    def __init__(self, path: str, stat: os.stat_result, content_hash: Optional[str] = None):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.content_hash = content_hash
+        if content_hash:
+            self.etag = f'"{content_hash}"'
+        else:
+            self.etag = f'W/"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        self.stat = stat
+
+
+class ImageCacheIndex:
+    """
+    Índice (pokemon_id, image_type) -> ImageIndexEntry.
+
+    As operações são protegidas por lock porque a verificação periódica
+    roda em uma thread separada.
+    """
+
+    def __init__(self):
+        self._entries: Dict[IndexKey, ImageIndexEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, pokemon_id: int, image_type: str) -> Optional[ImageIndexEntry]:
+        """Retorna a entrada de uma imagem ou None se ela não estiver indexada."""
+        return self._entries.get((pokemon_id, image_type))
+
+    def put(
+        self, pokemon_id: int, image_type: str, path: str, content_hash: Optional[str] = None
+    ) -> Optional[ImageIndexEntry]:
+        """
+        Indexa (ou reindexa) uma imagem a partir do arquivo em disco.
+
+        Args:
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+            path: Caminho local do arquivo
+            content_hash: SHA-256 do conteúdo, se conhecido
+
+        Returns:
+            Entrada criada ou None se o arquivo não existir
+        """
+        try:
+            entry = ImageIndexEntry(str(path), os.stat(path), content_hash)
+        except OSError:
+            self.invalidate(pokemon_id, image_type)
+            return None
+
+        with self._lock:
+            self._entries[(pokemon_id, image_type)] = entry
+        return entry
+
+    def invalidate(self, pokemon_id: int, image_type: str) -> bool:
+        """Remove uma imagem do índice. Retorna True se ela estava indexada."""
+        with self._lock:
+            return self._entries.pop((pokemon_id, image_type), None) is not None
+
+    def clear(self):
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+
+    def items(self) -> List[Tuple[IndexKey, ImageIndexEntry]]:
+        """Retorna uma cópia das entradas indexadas."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def verify(self, is_valid: Callable[[str, int], bool]) -> int:
+        """
+        Verifica todas as entradas e remove as que não estão mais íntegras.
+
+        Arquivos com o mesmo tamanho e data de modificação registrados na
+        indexação não são relidos (a validação pode recalcular o hash do
+        conteúdo, caro demais para repetir a cada ciclo). Um arquivo truncado
+        ou sobrescrito com outro tamanho é removido; um arquivo que mudou
+        apenas de data de modificação é validado de novo e, se continuar
+        válido, reindexado. O hash é mantido quando o nome do arquivo é o
+        próprio hash (blobs, cuja validação confere o conteúdo com o nome e
+        cuja data muda ao serem reaproveitados); nos demais arquivos é
+        descartado, pois pode não corresponder mais ao conteúdo. Entradas
+        substituídas durante a verificação são mantidas.
+
+        Args:
+            is_valid: Função (caminho, tamanho esperado) -> bool que valida o arquivo.
+
+        Returns:
+            Número de entradas removidas
+        """
+        removed = 0
+        for key, entry in self.items():
+            try:
+                stat = os.stat(entry.path)
+                changed = stat.st_mtime_ns != entry.stat.st_mtime_ns
+                valid = stat.st_size == entry.size and (
+                    not changed or is_valid(entry.path, entry.size)
+                )
+            except OSError:
+                stat, valid = None, False
+
+            with self._lock:
+                if self._entries.get(key) is not entry:
+                    continue
+                if not valid:
+                    del self._entries[key]
+                    removed += 1
+                elif changed:
+                    named_by_hash = Path(entry.path).stem == entry.content_hash
+                    content_hash = entry.content_hash if named_by_hash else None
+                    self._entries[key] = ImageIndexEntry(entry.path, stat, content_hash)
+
+        return removed
+
+    def set_content_hash(self, pokemon_id: int, image_type: str, content_hash: str, stat: os.stat_result) -> bool:
+        """
+        Registra o hash de uma imagem indexada, se o arquivo não mudou.
+
+        Args:
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+            content_hash: SHA-256 do conteúdo
+            stat: stat do arquivo no momento em que o hash foi calculado
+
+        Returns:
+            True se a entrada foi atualizada
+        """
+        key = (pokemon_id, image_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.stat.st_mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                return False
+            self._entries[key] = ImageIndexEntry(entry.path, entry.stat, content_hash)
+            return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: IndexKey) -> bool:
+        return key in self._entries
+
+
+_indexes: Dict[str, ImageCacheIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_image_index(cache_dir: Path) -> ImageCacheIndex:
+    """
+    Retorna o índice de um diretório de cache, criando-o sob demanda.
+
+    Instâncias do ImageCacheService que usam o mesmo diretório compartilham
+    o mesmo índice.
+
+    Args:
+        cache_dir: Diretório de cache das imagens
+    """
+    key = str(Path(cache_dir).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = ImageCacheIndex()
+            _indexes[key] = index
+        return index
+
+
+class ImageIndexVerifier:
+    """
+    Verificação periódica da integridade das imagens indexadas.
+
+    Roda a verificação em uma thread a cada ``interval`` segundos, para que
+    o caminho das requisições não precise ler o disco. Também calcula, aos
+    poucos, o hash das imagens baixadas antes de o hash ser registrado, move
+    as imagens com nome antigo para o armazenamento de blobs e, a cada
+    ``settings.image_blob_gc_interval`` segundos, remove os blobs sem
+    referência.
+    """
+
+    def __init__(self, service, interval: Optional[int] = None):
+        """
+        Args:
+            service: ImageCacheService cujo índice será verificado
+            interval: Intervalo entre verificações em segundos
+                (padrão: settings.image_index_verify_interval)
+        """
+        self.service = service
+        self.interval = interval or settings.image_index_verify_interval
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        self.last_removed = 0
+        self.last_gc: Optional[dict] = None
+        self._last_gc_at = time.monotonic()
+
+    async def start(self):
+        """Inicia a verificação periódica."""
+        if self.running:
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("🔍 Verificador do índice de imagens iniciado")
+
+    async def stop(self):
+        """Para a verificação periódica."""
+        if not self.running:
+            return
+
+        self.running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("🛑 Verificador do índice de imagens parado")
+
+    async def _run_loop(self):
+        """Loop principal do verificador."""
+        while self.running:
+            try:
+                await asyncio.sleep(self.interval)
+                self.last_removed = await asyncio.to_thread(self.service.verify_index)
+                if self.last_removed:
+                    logger.warning(f"⚠️ {self.last_removed} imagens removidas do índice por falha de integridade")
+                await asyncio.to_thread(self.service.backfill_content_hashes)
+                await asyncio.to_thread(self.service.migrate_legacy_files)
+                if time.monotonic() - self._last_gc_at >= settings.image_blob_gc_interval:
+                    self._last_gc_at = time.monotonic()
+                    self.last_gc = await asyncio.to_thread(self.service.collect_garbage)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Erro na verificação do índice de imagens: {e}")
+
+    def get_status(self) -> dict:
+        """Retorna status do verificador."""
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "indexed_images": len(self.service.index),
+            "last_removed": self.last_removed,
+            "last_gc": self.last_gc
+        }
@@ -5,6 +5,10 @@ Este módulo implementa um sistema robusto de cache de imagens que:
 - Baixa imagens da PokeAPI e GitHub
 - Armazena localmente no servidor
 - Serve imagens através do backend
+- Mantém um índice em memória das imagens em disco (ImageCacheIndex), para
+  que requisições de imagens já cacheadas não acessem o banco nem o disco
+- Guarda cada conteúdo uma única vez, nomeado pelo SHA-256 (ImageBlobStore);
+  imagens idênticas compartilham o mesmo arquivo
 - Elimina dependência de APIs externas
 - Melhora performance e confiabilidade
 """
@@ -13,16 +17,30 @@ import os
 import aiohttp
 import asyncio
 import hashlib
+import json
+import tempfile
+import time
 from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, inspect, text
+from sqlalchemy.engine import Engine
 from app.core.database import Base
+from app.core.config import settings
+from app.utils.single_flight import SingleFlight
+from app.services.image_blob_store import ImageBlobStore, hash_file
+from app.services.image_cache_index import ImageCacheIndex, ImageIndexEntry, get_image_index
+from app.services.image_http_client import image_http_client
+from app.services.image_download_scheduler import ImageDownloadScheduler, build_jobs, image_download_gate
 
 logger = logging.getLogger(__name__)
 
+# Downloads em andamento, compartilhados entre todas as instâncias do serviço
+# para que requisições concorrentes pela mesma imagem façam um único download
+_download_flights = SingleFlight()
+
 
 class PokemonImageCache(Base):
     """
@@ -41,17 +59,46 @@ class PokemonImageCache(Base):
     original_url = Column(Text, nullable=False)
     local_path = Column(String(500), nullable=False)
     file_size = Column(Integer, default=0)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 do arquivo, usado como ETag
 
     # Status e controle
     is_downloaded = Column(Boolean, default=False)
     download_attempts = Column(Integer, default=0)
     last_attempt = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # Fila de recuperação (CacheRecoveryEngine)
 
     # Auditoria
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# Colunas adicionadas após a criação da tabela: nome -> tipo SQL
+_ADDED_COLUMNS = {
+    "content_hash": "VARCHAR(64)",
+    "next_attempt_at": "DATETIME",
+}
+
+
+def ensure_image_cache_schema(engine: Engine):
+    """
+    Adiciona ao pokemon_image_cache colunas criadas após a tabela existir.
+
+    O create_all não altera tabelas existentes; esta função é chamada na
+    inicialização, logo após ele, e é idempotente.
+
+    Args:
+        engine: Engine do banco de dados
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns(PokemonImageCache.__tablename__)}
+    for name, sql_type in _ADDED_COLUMNS.items():
+        if name not in columns:
+            with engine.begin() as connection:
+                connection.execute(text(
+                    f"ALTER TABLE {PokemonImageCache.__tablename__} ADD COLUMN {name} {sql_type}"
+                ))
+            logger.info(f"Coluna {name} adicionada ao pokemon_image_cache")
+
+
 class ImageCacheService:
     """
     Serviço para gerenciamento de cache de imagens dos Pokémons.
@@ -70,6 +117,22 @@ class ImageCacheService:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Cliente HTTP com pool de conexões, compartilhado entre as instâncias
+        self.http_client = image_http_client
+
+        # Controle de concorrência adaptativo dos downloads (AIMD + taxa por host)
+        self.download_gate = image_download_gate
+
+        # Arquivos nomeados pelo hash do conteúdo (deduplicados)
+        self.blob_store = ImageBlobStore(self.cache_dir / "blobs")
+
+        # Índice em memória compartilhado pelas instâncias do mesmo diretório
+        self.index: ImageCacheIndex = get_image_index(self.cache_dir)
+
+        # Imagens com nome antigo já migradas para blobs, aguardando remoção
+        # (JSON Lines: path, blob e migrated_at)
+        self.migrated_manifest = self.cache_dir / "migrated_legacy.jsonl"
+
         # URLs base para diferentes tipos de imagem
         self.image_urls = {
             'official-artwork': 'https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{}.png',
@@ -83,6 +146,8 @@ class ImageCacheService:
         self.max_download_attempts = 3
         self.retry_delay_hours = 24
         self.timeout_seconds = 30
+        self.download_chunk_size = settings.image_download_chunk_size
+        self.max_image_bytes = settings.image_download_max_bytes
 
         logger.info(f"ImageCacheService inicializado com diretório: {self.cache_dir}")
 
@@ -100,9 +165,50 @@ class ImageCacheService:
         Returns:
             Caminho local da imagem ou None se não disponível
         """
-        try:
-            logger.info(f"🔍 Solicitação de imagem: Pokémon {pokemon_id}, tipo {image_type}")
+        entry = await self.get_pokemon_image_entry(db, pokemon_id, image_type)
+        return entry.path if entry else None
+
+    async def get_pokemon_image_entry(
+        self, db: Session, pokemon_id: int, image_type: str = 'official-artwork'
+    ) -> Optional[ImageIndexEntry]:
+        """
+        Obtém os metadados (caminho, tamanho, ETag) de uma imagem do Pokémon.
+
+        Imagens presentes no índice em memória são retornadas sem consultar
+        o banco nem o disco. Caso contrário, a imagem é procurada no
+        PokemonImageCache (com verificação de integridade) ou baixada, e
+        então indexada.
+
+        Args:
+            db: Sessão do banco de dados
+            pokemon_id: ID do Pokémon (1-1010+)
+            image_type: Tipo de imagem desejada
+
+        Returns:
+            Entrada do índice ou None se a imagem não estiver disponível
+        """
+        entry = self.index.get(pokemon_id, image_type)
+        if entry is not None:
+            return entry
 
+        path = await self._resolve_pokemon_image(db, pokemon_id, image_type)
+        if path is None:
+            return None
+        return self.index.get(pokemon_id, image_type) or self.index.put(pokemon_id, image_type, path)
+
+    async def _resolve_pokemon_image(self, db: Session, pokemon_id: int, image_type: str) -> Optional[str]:
+        """
+        Procura a imagem no PokemonImageCache ou a baixa (caminho lento).
+
+        Args:
+            db: Sessão do banco de dados
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+
+        Returns:
+            Caminho local da imagem ou None se não disponível
+        """
+        try:
             # PRIORIDADE MÁXIMA: Verifica se já existe no cache local
             cache_entry = db.query(PokemonImageCache).filter(
                 PokemonImageCache.pokemon_id == pokemon_id,
@@ -113,8 +219,8 @@ class ImageCacheService:
             if cache_entry and os.path.exists(cache_entry.local_path):
                 # Verifica integridade do arquivo
                 if self._verify_image_integrity(cache_entry.local_path, cache_entry.file_size):
-                    logger.info(f"✅ CACHE HIT: Servindo do cache local: {cache_entry.local_path}")
-                    logger.info(f"📁 Arquivo: {cache_entry.file_size} bytes, criado em {cache_entry.created_at}")
+                    logger.debug(f"✅ CACHE HIT: Indexando imagem do cache local: {cache_entry.local_path}")
+                    self.index.put(pokemon_id, image_type, cache_entry.local_path, cache_entry.content_hash)
                     return cache_entry.local_path
                 else:
                     logger.warning(f"⚠️ Arquivo corrompido detectado, removendo: {cache_entry.local_path}")
@@ -153,14 +259,41 @@ class ImageCacheService:
             logger.error(f"Stack trace: {traceback.format_exc()}")
             return None
 
-    async def _download_pokemon_image(self, db: Session, pokemon_id: int, image_type: str) -> Optional[str]:
+    async def _download_pokemon_image(
+        self, db: Session, pokemon_id: int, image_type: str, ignore_retry_window: bool = False
+    ) -> Optional[str]:
         """
         Baixa uma imagem do Pokémon e armazena localmente.
 
+        Chamadas concorrentes para o mesmo Pokémon e tipo de imagem
+        compartilham um único download, evitando escritas simultâneas no
+        mesmo arquivo e entradas duplicadas no PokemonImageCache.
+
         Args:
             db: Sessão do banco de dados
             pokemon_id: ID do Pokémon
             image_type: Tipo de imagem
+            ignore_retry_window: Baixa mesmo se houve tentativas recentes
+
+        Returns:
+            Caminho local da imagem baixada ou None se falhou
+        """
+        key = (str(self.cache_dir.resolve()), pokemon_id, image_type)
+        return await _download_flights.do(
+            key, lambda: self._perform_pokemon_image_download(db, pokemon_id, image_type, ignore_retry_window)
+        )
+
+    async def _perform_pokemon_image_download(
+        self, db: Session, pokemon_id: int, image_type: str, ignore_retry_window: bool = False
+    ) -> Optional[str]:
+        """
+        Executa o download de uma imagem do Pokémon e registra no cache.
+
+        Args:
+            db: Sessão do banco de dados
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+            ignore_retry_window: Baixa mesmo se houve tentativas recentes
 
         Returns:
             Caminho local da imagem baixada ou None se falhou
@@ -172,7 +305,7 @@ class ImageCacheService:
                 PokemonImageCache.image_type == image_type
             ).first()
 
-            if existing_entry and not self._should_retry_download(existing_entry):
+            if existing_entry and not ignore_retry_window and not self._should_retry_download(existing_entry):
                 logger.debug(f"Pulando download - muitas tentativas recentes: {pokemon_id}/{image_type}")
                 return None
 
@@ -183,14 +316,19 @@ class ImageCacheService:
 
             original_url = self.image_urls[image_type].format(pokemon_id)
 
-            # Define caminho local
+            # Define caminho local (o download é movido para o blob do seu hash)
             filename = f"{pokemon_id}_{image_type}.png"
             local_path = self.cache_dir / filename
 
             # Baixa a imagem
-            success = await self._download_image(original_url, local_path)
+            content_hash = await self._download_image(original_url, local_path)
+
+            if content_hash:
+                blob_path, deduplicated = await asyncio.to_thread(self.blob_store.store, str(local_path), content_hash)
+                local_path = Path(blob_path)
+                if deduplicated:
+                    logger.info(f"♻️ Conteúdo idêntico já armazenado, reutilizando: {local_path}")
 
-            if success:
                 # GARANTIA CRÍTICA: Salva no cache local
                 file_size = os.path.getsize(local_path)
 
@@ -201,6 +339,8 @@ class ImageCacheService:
                     existing_entry.download_attempts += 1
                     existing_entry.last_attempt = datetime.utcnow()
                     existing_entry.file_size = file_size
+                    existing_entry.content_hash = content_hash
+                    existing_entry.next_attempt_at = None
                     existing_entry.updated_at = datetime.utcnow()
                     logger.info(f"📝 Atualizando entrada existente no cache")
                 else:
@@ -211,6 +351,7 @@ class ImageCacheService:
                         original_url=original_url,
                         local_path=str(local_path),
                         file_size=file_size,
+                        content_hash=content_hash,
                         is_downloaded=True,
                         download_attempts=1,
                         last_attempt=datetime.utcnow()
@@ -229,6 +370,8 @@ class ImageCacheService:
                 ).first()
 
                 if verification_entry and os.path.exists(verification_entry.local_path):
+                    # Arquivo novo: substitui a entrada anterior do índice
+                    self.index.put(pokemon_id, image_type, str(local_path), content_hash)
                     logger.info(f"✅ SUCESSO TOTAL: Imagem salva e verificada")
                     logger.info(f"📁 Arquivo: {verification_entry.local_path} ({file_size} bytes)")
                     logger.info(f"💾 Banco: ID={verification_entry.id}, downloaded={verification_entry.is_downloaded}")
@@ -260,102 +403,123 @@ class ImageCacheService:
             logger.error(f"Erro ao baixar imagem {pokemon_id}/{image_type}: {e}")
             return None
 
-    async def _download_image(self, url: str, local_path: Path) -> bool:
+    async def _download_image(self, url: str, local_path: Path) -> Optional[str]:
         """
         Baixa uma imagem de uma URL para um arquivo local com verificações robustas.
 
+        O conteúdo é recebido em blocos e gravado (em uma thread, fora do
+        event loop) em um arquivo temporário no mesmo diretório. Os magic
+        bytes são validados no início do download, o hash é calculado
+        durante a transferência e, ao final, o arquivo temporário é renomeado
+        atomicamente para o destino. Assim a memória usada por download é
+        limitada e nunca há um arquivo parcial no caminho final.
+
         Args:
             url: URL da imagem
             local_path: Caminho local onde salvar
 
         Returns:
-            True se baixou com sucesso, False caso contrário
+            Hash SHA-256 (hex) do conteúdo salvo ou None se o download falhou
         """
+        tmp_path = None
         try:
             logger.info(f"🌐 Iniciando download de: {url}")
 
-            # Configuração de timeout mais robusta
-            timeout = aiohttp.ClientTimeout(
-                total=self.timeout_seconds,
-                connect=10,  # 10s para conectar
-                sock_read=20  # 20s para ler dados
-            )
-
-            # Headers para simular browser real
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-                'Cache-Control': 'no-cache'
-            }
+            # Sessão compartilhada com pool de conexões (keep-alive)
+            session = await self.http_client.get_session()
 
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            # Concorrência adaptativa e limite de requisições por host
+            await self.download_gate.acquire(url)
+            started = time.monotonic()
+            status = None
+            try:
                 async with session.get(url) as response:
+                    status = response.status
                     logger.info(f"📡 Resposta recebida: Status {response.status} para {url}")
 
-                    if response.status == 200:
-                        content = await response.read()
-                        content_length = len(content)
-
-                        logger.info(f"📦 Conteúdo baixado: {content_length} bytes")
-
-                        # Verificações de integridade mais rigorosas
-                        if content_length < 500:
-                            logger.warning(f"⚠️ Imagem muito pequena ({content_length} bytes), provavelmente inválida: {url}")
-                            return False
-
-                        # Verifica se é realmente uma imagem (magic bytes)
-                        if not self._is_valid_image_content(content):
-                            logger.warning(f"⚠️ Conteúdo não é uma imagem válida: {url}")
-                            return False
-
-                        # Cria diretório se não existir
-                        local_path.parent.mkdir(parents=True, exist_ok=True)
-
-                        # Salva o arquivo com verificação
-                        try:
-                            with open(local_path, 'wb') as f:
-                                f.write(content)
-
-                            # Verifica se o arquivo foi salvo corretamente
-                            if not os.path.exists(local_path):
-                                logger.error(f"❌ Arquivo não foi criado: {local_path}")
-                                return False
-
-                            saved_size = os.path.getsize(local_path)
-                            if saved_size != content_length:
-                                logger.error(f"❌ Tamanho do arquivo salvo ({saved_size}) difere do baixado ({content_length})")
-                                os.remove(local_path)
-                                return False
-
-                            logger.info(f"✅ Imagem salva com sucesso: {local_path} ({saved_size} bytes)")
-                            return True
-
-                        except Exception as save_error:
-                            logger.error(f"❌ Erro ao salvar arquivo {local_path}: {save_error}")
-                            # Remove arquivo parcial se existir
-                            if os.path.exists(local_path):
-                                try:
-                                    os.remove(local_path)
-                                except:
-                                    pass
-                            return False
-
-                    else:
+                    if response.status != 200:
                         logger.warning(f"❌ Falha no download - Status {response.status}: {url}")
-                        return False
+                        return None
+
+                    if (response.content_length or 0) > self.max_image_bytes:
+                        logger.warning(f"⚠️ Imagem grande demais ({response.content_length} bytes): {url}")
+                        return None
+
+                    # Cria diretório se não existir
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_file, tmp_path = await asyncio.to_thread(self._create_temp_file, local_path)
+
+                    digest = hashlib.sha256()
+                    content_length = 0
+                    header = b''
+                    try:
+                        async for chunk in response.content.iter_chunked(self.download_chunk_size):
+                            # Verifica se é realmente uma imagem (magic bytes) logo no início
+                            if len(header) < 12:
+                                header += chunk[:12 - len(header)]
+                                if len(header) >= 12 and not self._is_valid_image_content(header):
+                                    logger.warning(f"⚠️ Conteúdo não é uma imagem válida: {url}")
+                                    return None
+
+                            content_length += len(chunk)
+                            if content_length > self.max_image_bytes:
+                                logger.warning(f"⚠️ Imagem grande demais (> {self.max_image_bytes} bytes): {url}")
+                                return None
+
+                            digest.update(chunk)
+                            await asyncio.to_thread(tmp_file.write, chunk)
+                    finally:
+                        await asyncio.to_thread(tmp_file.close)
+            finally:
+                self.download_gate.release(url, status, time.monotonic() - started)
+
+            logger.info(f"📦 Conteúdo baixado: {content_length} bytes")
+
+            # Verificações de integridade mais rigorosas
+            if content_length < 500:
+                logger.warning(f"⚠️ Imagem muito pequena ({content_length} bytes), provavelmente inválida: {url}")
+                return None
+
+            if not self._is_valid_image_content(header):
+                logger.warning(f"⚠️ Conteúdo não é uma imagem válida: {url}")
+                return None
+
+            # Renomeação atômica: o arquivo final aparece completo ou não aparece
+            await asyncio.to_thread(os.replace, tmp_path, local_path)
+            tmp_path = None
+
+            logger.info(f"✅ Imagem salva com sucesso: {local_path} ({content_length} bytes)")
+            return digest.hexdigest()
 
         except asyncio.TimeoutError:
             logger.warning(f"⏰ Timeout ao baixar imagem: {url}")
-            return False
+            return None
         except aiohttp.ClientError as e:
             logger.error(f"🌐 Erro de rede ao baixar {url}: {e}")
-            return False
+            return None
         except Exception as e:
             logger.error(f"❌ Erro inesperado ao baixar {url}: {e}")
             import traceback
             logger.error(f"Stack trace: {traceback.format_exc()}")
-            return False
+            return None
+        finally:
+            # Remove o arquivo temporário de downloads que não foram concluídos
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _create_temp_file(local_path: Path):
+        """
+        Cria o arquivo temporário de um download ao lado do destino final.
+
+        Returns:
+            Tupla (arquivo aberto para escrita binária, caminho do arquivo)
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=local_path.parent, prefix=f".{local_path.name}.", suffix=".part")
+        return os.fdopen(fd, 'wb'), tmp_path
 
     def _should_retry_download(self, cache_entry: PokemonImageCache) -> bool:
         """
@@ -401,32 +565,15 @@ class ImageCacheService:
 
         logger.info(f"Iniciando preload de {stats['total']} imagens...")
 
-        # Processa em lotes para não sobrecarregar
-        batch_size = 10
-        for i in range(0, len(pokemon_ids), batch_size):
-            batch = pokemon_ids[i:i + batch_size]
-
-            tasks = []
-            for pokemon_id in batch:
-                for image_type in image_types:
-                    task = self.get_pokemon_image(db, pokemon_id, image_type)
-                    tasks.append((pokemon_id, image_type, task))
-
-            # Executa lote
-            results = await asyncio.gather(*[task for _, _, task in tasks], return_exceptions=True)
-
-            # Processa resultados
-            for (pokemon_id, image_type, _), result in zip(tasks, results):
-                if isinstance(result, Exception):
-                    stats['failed'] += 1
-                    logger.error(f"Erro no preload {pokemon_id}/{image_type}: {result}")
-                elif result:
-                    stats['success'] += 1
-                else:
-                    stats['skipped'] += 1
+        # Fila com workers: uma imagem lenta não segura as demais; a
+        # concorrência real dos downloads é ajustada pelo download_gate
+        async def fetch(job):
+            return await self.get_pokemon_image(db, job.pokemon_id, job.image_type)
 
-            # Pequena pausa entre lotes
-            await asyncio.sleep(0.5)
+        scheduler = ImageDownloadScheduler(fetch, max_attempts=1)
+        result = await scheduler.run(build_jobs(pokemon_ids, image_types))
+        for key in ('success', 'failed', 'skipped'):
+            stats[key] = result[key]
 
         logger.info(f"Preload concluído: {stats}")
         return stats
@@ -469,10 +616,271 @@ class ImageCacheService:
             logger.error(f"Erro ao obter estatísticas do cache: {e}")
             return {}
 
+    def load_index(self, db: Session) -> int:
+        """
+        Carrega no índice em memória as imagens baixadas do diretório de cache.
+
+        Executado na inicialização da aplicação; arquivos ausentes no disco
+        não são indexados.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            Número de imagens indexadas
+        """
+        cache_dir = os.path.realpath(self.cache_dir)
+        entries = db.query(
+            PokemonImageCache.pokemon_id, PokemonImageCache.image_type,
+            PokemonImageCache.local_path, PokemonImageCache.content_hash
+        ).filter(PokemonImageCache.is_downloaded == True).all()
+
+        loaded = 0
+        for pokemon_id, image_type, local_path, content_hash in entries:
+            in_cache_dir = os.path.dirname(os.path.realpath(local_path)) == cache_dir
+            if not in_cache_dir and not self.blob_store.contains(local_path):
+                continue
+            if self.index.put(pokemon_id, image_type, local_path, content_hash) is not None:
+                loaded += 1
+
+        logger.info(f"📇 Índice de imagens carregado: {loaded} imagens")
+        return loaded
+
+    def verify_index(self) -> int:
+        """
+        Verifica a integridade das imagens indexadas (tamanho e magic bytes).
+
+        Apenas arquivos alterados desde a indexação são validados de novo, então
+        os blobs só têm o hash recalculado quando mudaram no disco. Imagens
+        inválidas são removidas do índice; a próxima requisição passa
+        pelo caminho lento, que corrige o PokemonImageCache e baixa de novo.
+
+        Returns:
+            Número de imagens removidas do índice
+        """
+        return self.index.verify(self._verify_image_integrity)
+
+    def backfill_content_hashes(self, limit: int = 200) -> int:
+        """
+        Calcula o hash das imagens indexadas que ainda não o possuem.
+
+        Imagens baixadas antes do registro do hash são servidas com um ETag
+        fraco; esta função, executada aos poucos pelo verificador do índice,
+        calcula o hash, atualiza o índice e o persiste no PokemonImageCache.
+
+        Args:
+            limit: Número máximo de imagens processadas por chamada
+
+        Returns:
+            Número de hashes calculados
+        """
+        pending = [(key, entry) for key, entry in self.index.items() if not entry.content_hash][:limit]
+        if not pending:
+            return 0
+
+        hashes = {}
+        for (pokemon_id, image_type), entry in pending:
+            try:
+                stat = os.stat(entry.path)
+                with open(entry.path, 'rb') as f:
+                    content_hash = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                continue
+            if self.index.set_content_hash(pokemon_id, image_type, content_hash, stat):
+                hashes[(pokemon_id, image_type)] = content_hash
+
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for (pokemon_id, image_type), content_hash in hashes.items():
+                db.query(PokemonImageCache).filter(
+                    PokemonImageCache.pokemon_id == pokemon_id,
+                    PokemonImageCache.image_type == image_type
+                ).update({PokemonImageCache.content_hash: content_hash}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao persistir hashes das imagens: {e}")
+        finally:
+            db.close()
+
+        return len(hashes)
+
+    def migrate_legacy_files(self, limit: int = 200) -> int:
+        """
+        Migra para o armazenamento de blobs as imagens indexadas com nome antigo.
+
+        Imagens baixadas antes do armazenamento de blobs ({id}_{tipo}.png)
+        são ligadas (hard link) ou copiadas para o blob do seu hash, e o
+        PokemonImageCache e, depois do commit, o índice passam a apontar para
+        o blob. O arquivo antigo é mantido, pois requisições em andamento
+        ainda podem lê-lo, e registrado em ``migrated_manifest`` com o horário
+        da migração; a coleta de lixo o remove após a carência. Executada aos
+        poucos pelo verificador do índice.
+
+        Args:
+            limit: Número máximo de imagens processadas por chamada
+
+        Returns:
+            Número de imagens migradas
+        """
+        pending = [(key, entry) for key, entry in self.index.items() if not self.blob_store.contains(entry.path)][:limit]
+        if not pending:
+            return 0
+
+        moved = {}
+        for _, entry in pending:
+            try:
+                if entry.path not in moved:
+                    content_hash = hash_file(entry.path)
+                    blob_path, _ = self.blob_store.store(entry.path, content_hash, keep_source=True)
+                    moved[entry.path] = (blob_path, content_hash)
+            except OSError:
+                continue
+        if not moved:
+            return 0
+
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for old_path, (blob_path, content_hash) in moved.items():
+                db.query(PokemonImageCache).filter(PokemonImageCache.local_path == old_path).update(
+                    {PokemonImageCache.local_path: blob_path, PokemonImageCache.content_hash: content_hash},
+                    synchronize_session=False
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao registrar imagens migradas para blobs: {e}")
+            return 0
+        finally:
+            db.close()
+
+        for (pokemon_id, image_type), entry in pending:
+            current = self.index.get(pokemon_id, image_type)
+            if entry.path in moved and current is not None and current.path == entry.path:
+                blob_path, content_hash = moved[entry.path]
+                self.index.put(pokemon_id, image_type, blob_path, content_hash)
+
+        # A carência da coleta de lixo dos arquivos antigos conta a partir da
+        # migração, registrada no manifesto (e não na data de modificação,
+        # compartilhada com o blob pelo hard link)
+        migrated_at = time.time()
+        try:
+            with open(self.migrated_manifest, 'a', encoding='utf-8') as f:
+                for old_path, (blob_path, _) in moved.items():
+                    record = {"path": old_path, "blob": blob_path, "migrated_at": migrated_at}
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error(f"Erro ao registrar imagens migradas no manifesto: {e}")
+
+        logger.info(f"📦 {len(moved)} imagens migradas para o armazenamento de blobs")
+        return len(moved)
+
+    def collect_garbage(self, grace_seconds: Optional[float] = None) -> Dict[str, int]:
+        """
+        Remove os blobs que nenhuma entrada do PokemonImageCache ou do índice referencia.
+
+        Também remove as imagens com nome antigo ({id}_{tipo}.png) registradas
+        como migradas em ``migrated_manifest``; imagens antigas não migradas
+        nunca são removidas.
+
+        Args:
+            grace_seconds: Idade mínima dos blobs e imagens antigas removidos
+                (padrão: settings.image_blob_gc_grace)
+
+        Returns:
+            blobs, removed, freed_bytes e legacy_removed
+        """
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            referenced = [path for (path,) in db.query(PokemonImageCache.local_path).all()]
+        finally:
+            db.close()
+
+        referenced.extend(entry.path for _, entry in self.index.items())
+        if grace_seconds is None:
+            grace_seconds = settings.image_blob_gc_grace
+        stats = self.blob_store.collect_garbage(referenced, grace_seconds)
+        stats["legacy_removed"] = self._remove_legacy_files(referenced, grace_seconds)
+        return stats
+
+    def _load_migrated(self) -> List[Dict]:
+        """Lê os registros do manifesto de imagens migradas (ignora linhas inválidas)."""
+        if not self.migrated_manifest.exists():
+            return []
+
+        records = []
+        with open(self.migrated_manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    @staticmethod
+    def _is_migrated_copy(path: str, blob_path: str) -> bool:
+        """Verifica se um arquivo antigo tem o mesmo conteúdo do seu blob."""
+        try:
+            return os.path.samefile(path, blob_path) or hash_file(path) == Path(blob_path).stem
+        except OSError:
+            return False
+
+    def _remove_legacy_files(self, referenced: List[str], grace_seconds: float) -> int:
+        """
+        Remove as imagens antigas migradas, sem referência e fora da carência.
+
+        Só são removidos os arquivos registrados no manifesto cujo conteúdo
+        ainda é o do blob; os demais registros fora da carência saem do
+        manifesto sem remover o arquivo.
+        """
+        records = self._load_migrated()
+        if not records:
+            return 0
+
+        in_use = {os.path.realpath(path) for path in referenced}
+        cutoff = time.time() - grace_seconds
+        pending = []
+        removed = 0
+
+        for record in records:
+            path = record["path"]
+            if os.path.realpath(path) in in_use or record["migrated_at"] > cutoff:
+                pending.append(record)
+                continue
+            # Arquivo já removido ou substituído por outro conteúdo: é mantido
+            if not self._is_migrated_copy(path, record["blob"]):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pending.append(record)
+                continue
+            removed += 1
+
+        manifest = self.migrated_manifest
+        tmp_path = manifest.with_name(f"{manifest.name}.{os.getpid()}.part")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(record) + "\n" for record in pending)
+        os.replace(tmp_path, manifest)
+
+        if removed:
+            logger.info(f"🧹 {removed} imagens antigas já migradas para blobs removidas")
+        return removed
+
     def _verify_image_integrity(self, file_path: str, expected_size: int) -> bool:
         """
         Verifica a integridade de um arquivo de imagem.
 
+        Blobs são verificados pelo hash do conteúdo, que deve ser igual ao
+        nome do arquivo; arquivos anteriores ao armazenamento de blobs, pelo
+        tamanho e pelos magic bytes.
+
         Args:
             file_path: Caminho do arquivo
             expected_size: Tamanho esperado em bytes
@@ -490,6 +898,12 @@ class ImageCacheService:
                 logger.warning(f"Tamanho incorreto: esperado {expected_size}, atual {actual_size}")
                 return False
 
+            if self.blob_store.contains(file_path):
+                if not self.blob_store.verify(file_path):
+                    logger.warning(f"Hash do conteúdo não corresponde ao blob: {file_path}")
+                    return False
+                return True
+
             # Verifica se é uma imagem válida lendo os primeiros bytes
             with open(file_path, 'rb') as f:
                 header = f.read(20)
@@ -553,6 +967,7 @@ class ImageCacheService:
         """
         try:
             logger.info(f"🔄 Forçando download: Pokémon {pokemon_id}, tipo {image_type}")
+            self.index.invalidate(pokemon_id, image_type)
 
             # Remove entrada existente do cache
             existing_entry = db.query(PokemonImageCache).filter(
@@ -561,8 +976,9 @@ class ImageCacheService:
             ).first()
 
             if existing_entry:
-                # Remove arquivo físico se existir
-                if os.path.exists(existing_entry.local_path):
+                # Remove arquivo físico se existir; blobs podem ser
+                # compartilhados e são removidos pela coleta de lixo
+                if os.path.exists(existing_entry.local_path) and not self.blob_store.contains(existing_entry.local_path):
                     try:
                         os.remove(existing_entry.local_path)
                         logger.info(f"🗑️ Arquivo antigo removido: {existing_entry.local_path}")
@@ -581,6 +997,27 @@ class ImageCacheService:
             logger.error(f"Erro ao forçar download {pokemon_id}/{image_type}: {e}")
             return None
 
+    async def retry_pokemon_image(self, db: Session, pokemon_id: int, image_type: str = 'official-artwork') -> Optional[str]:
+        """
+        Tenta novamente o download de uma imagem que falhou.
+
+        Diferente de get_pokemon_image, ignora o limite de tentativas e o
+        intervalo entre tentativas; o histórico de tentativas é mantido.
+        Usado pelos scripts de recuperação do cache.
+
+        Args:
+            db: Sessão do banco de dados
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+
+        Returns:
+            Caminho local da imagem ou None se falhou
+        """
+        entry = self.index.get(pokemon_id, image_type)
+        if entry is not None:
+            return entry.path
+        return await self._download_pokemon_image(db, pokemon_id, image_type, ignore_retry_window=True)
+
     async def download_image_async(self, pokemon_id: int, image_type: str = 'official-artwork') -> bool:
         """
         Método assíncrono para download de imagem, usado pelo retry script.
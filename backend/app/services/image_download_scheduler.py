@@ -0,0 +1,407 @@
+"""
+Agendador de downloads em massa de imagens dos Pokémons.
+
+Este módulo substitui os lotes fixos com pausas (asyncio.gather de 10 em 10
+e sleep entre lotes) por:
+- AdaptiveDownloadGate: controle de concorrência AIMD (aumento aditivo,
+  redução multiplicativa) guiado pela latência e pelas respostas 429/5xx,
+  com limite de requisições por segundo por host. Usado pelo
+  ImageCacheService em todo download de imagem.
+- ImageDownloadScheduler: fila de prioridade consumida por um pool de
+  workers, com novas tentativas com backoff e progresso persistido em
+  arquivo para retomar execuções interrompidas.
+
+Por padrão os Pokémons da Geração 1 (IDs 1-151) têm prioridade, como no
+automation/cache_recovery_scheduler.py.
+
+Example:
+    >>> from app.services.image_download_scheduler import DownloadJob, ImageDownloadScheduler
+    >>> scheduler = ImageDownloadScheduler(fetch, progress_path="preload_progress.json")
+    >>> stats = await scheduler.run([DownloadJob(25, "official-artwork")])
+    >>> stats["success"]
+    1
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pokémons baixados primeiro (Geração 1)
+PRIORITY_POKEMON_IDS = range(1, 152)
+
+
+class AdaptiveDownloadGate:
+    """
+    Limita os downloads simultâneos e a taxa de requisições por host.
+
+    O limite de concorrência segue AIMD: cada download rápido e bem-sucedido
+    aumenta o limite em 1/limite (cerca de +1 a cada "janela" completa) e um
+    download lento, com timeout/erro de rede, 429 ou 5xx reduz o limite pela
+    metade. Reduções ficam espaçadas por ``decrease_interval`` para que uma
+    rajada de falhas simultâneas conte como um único sinal de congestionamento.
+
+    A taxa por host é controlada por agendamento de horários: cada
+    requisição reserva o próximo intervalo livre de 1/rate segundos do host.
+    """
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        min_limit: int = 1,
+        target_latency: Optional[float] = None,
+        rate_per_host: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        decrease_interval: float = 1.0
+    ):
+        """
+        Args:
+            initial_limit: Downloads simultâneos iniciais
+                (padrão: settings.image_download_initial_concurrency)
+            max_limit: Limite superior de downloads simultâneos
+                (padrão: settings.image_download_max_concurrency)
+            min_limit: Limite inferior de downloads simultâneos
+            target_latency: Latência em segundos acima da qual a concorrência
+                é reduzida (padrão: settings.image_download_target_latency)
+            rate_per_host: Requisições por segundo a cada host; 0 desativa
+                (padrão: settings.image_download_rate_per_host)
+            decrease_factor: Fator da redução multiplicativa
+            decrease_interval: Intervalo mínimo em segundos entre reduções
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit or settings.image_download_max_concurrency
+        self.limit = float(min(
+            max(initial_limit or settings.image_download_initial_concurrency, min_limit), self.max_limit
+        ))
+        self.target_latency = target_latency or settings.image_download_target_latency
+        self.rate_per_host = settings.image_download_rate_per_host if rate_per_host is None else rate_per_host
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+
+        self.in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+        self._next_slot: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self.stats = {"requests": 0, "congested": 0, "slow": 0}
+
+    async def acquire(self, url: str):
+        """
+        Aguarda uma vaga de download e o próximo horário livre do host.
+
+        Args:
+            url: URL que será baixada
+        """
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # A vaga recebida passa para o próximo da fila
+                    self._wake_waiters()
+                raise
+        self.in_flight += 1
+
+        try:
+            delay = self._reserve_slot(urlsplit(url).netloc)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.in_flight -= 1
+            self._wake_waiters()
+            raise
+
+    def release(self, url: str, status: Optional[int], elapsed: float):
+        """
+        Libera a vaga de um download e ajusta o limite de concorrência.
+
+        Args:
+            url: URL baixada
+            status: Status HTTP da resposta ou None em timeout/erro de rede
+            elapsed: Duração do download em segundos
+        """
+        self.in_flight -= 1
+        self.stats["requests"] += 1
+
+        if status is None or status == 429 or status >= 500:
+            self.stats["congested"] += 1
+            self._decrease()
+        elif elapsed > self.target_latency:
+            self.stats["slow"] += 1
+            self._decrease()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake_waiters()
+
+    def _decrease(self):
+        """Reduz o limite multiplicativamente, no máximo uma vez por intervalo."""
+        now = time.monotonic()
+        if now - self._last_decrease >= self.decrease_interval:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            self._last_decrease = now
+
+    def _reserve_slot(self, host: str) -> float:
+        """Reserva o próximo horário livre do host e retorna a espera em segundos."""
+        if not self.rate_per_host:
+            return 0.0
+
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + 1 / self.rate_per_host
+        return slot - now
+
+    def _wake_waiters(self):
+        """Acorda os downloads em espera para as vagas livres."""
+        available = int(self.limit) - self.in_flight
+        while available > 0 and self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    def get_status(self) -> Dict:
+        """Retorna o estado atual do controle de concorrência."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_limit": self.max_limit,
+            "rate_per_host": self.rate_per_host,
+            **self.stats
+        }
+
+
+class DownloadJob:
+    """
+    Imagem a ser baixada pelo agendador.
+
+    Attributes:
+        pokemon_id (int): ID do Pokémon.
+        image_type (str): Tipo de imagem.
+        priority (int): Prioridade (menor = primeiro). Por padrão 0 para a
+            Geração 1 e 1 para os demais.
+        attempts (int): Tentativas já realizadas.
+    """
+
+    __slots__ = ("pokemon_id", "image_type", "priority", "attempts")
+
+    def __init__(self, pokemon_id: int, image_type: str = 'official-artwork', priority: Optional[int] = None):
+        self.pokemon_id = pokemon_id
+        self.image_type = image_type
+        self.priority = default_priority(pokemon_id) if priority is None else priority
+        self.attempts = 0
+
+    @property
+    def key(self) -> str:
+        """Chave do job no arquivo de progresso."""
+        return f"{self.pokemon_id}:{self.image_type}"
+
+
+def default_priority(pokemon_id: int) -> int:
+    """Prioridade padrão de um Pokémon: Geração 1 primeiro."""
+    return 0 if pokemon_id in PRIORITY_POKEMON_IDS else 1
+
+
+def build_jobs(pokemon_ids: Iterable[int], image_types: Iterable[str]) -> List[DownloadJob]:
+    """Cria os jobs de todas as combinações de Pokémon e tipo de imagem."""
+    image_types = list(image_types)
+    return [DownloadJob(pokemon_id, image_type) for pokemon_id in pokemon_ids for image_type in image_types]
+
+
+class ImageDownloadScheduler:
+    """
+    Fila de prioridade de downloads consumida por um pool de workers.
+
+    Cada job é executado pela função ``fetch``, que retorna o caminho da
+    imagem (sucesso), None (imagem ignorada, ex: já tentada recentemente) ou
+    gera uma exceção (falha). Falhas são repetidas com backoff exponencial
+    até ``max_attempts``, atrás dos jobs ainda não tentados da mesma
+    prioridade.
+
+    Com ``progress_path``, os jobs concluídos são gravados em arquivo e
+    ignorados na próxima execução, de forma que uma execução interrompida
+    pode ser retomada.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[DownloadJob], Awaitable[Optional[str]]],
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_delay: Optional[float] = None,
+        progress_path: Optional[str] = None,
+        save_every: int = 25
+    ):
+        """
+        Args:
+            fetch: Corrotina que executa um job
+            workers: Número de workers (padrão: settings.image_download_workers)
+            max_attempts: Tentativas por job (padrão: settings.image_download_max_attempts)
+            retry_delay: Espera inicial antes de repetir um job
+                (padrão: settings.image_download_retry_delay)
+            progress_path: Arquivo de progresso para retomar execuções
+            save_every: Jobs concluídos entre gravações do progresso
+        """
+        self.fetch = fetch
+        self.workers = workers or settings.image_download_workers
+        self.max_attempts = max_attempts or settings.image_download_max_attempts
+        self.retry_delay = settings.image_download_retry_delay if retry_delay is None else retry_delay
+        self.progress_path = Path(progress_path) if progress_path else None
+        self.save_every = save_every
+
+        self.running = False
+        self.completed: Set[str] = set()
+        self.results: Dict[str, Dict] = {}
+        self.stats = self._empty_stats(0)
+        self._unsaved = 0
+        self._requeues: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _empty_stats(total: int) -> Dict:
+        return {'total': total, 'success': 0, 'failed': 0, 'skipped': 0, 'resumed': 0, 'retries': 0}
+
+    def load_progress(self) -> Set[str]:
+        """Carrega os jobs concluídos de uma execução anterior."""
+        if not self.progress_path or not self.progress_path.exists():
+            return set()
+
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                return set(json.load(f).get('completed', []))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Progresso de downloads ilegível, recomeçando: {e}")
+            return set()
+
+    def save_progress(self):
+        """Grava o progresso atual (escrita atômica)."""
+        if not self.progress_path:
+            return
+
+        data = {
+            'updated_at': datetime.now().isoformat(),
+            'completed': sorted(self.completed),
+            'failed': sorted(key for key, result in self.results.items() if result['status'] == 'failed'),
+            'stats': self.stats
+        }
+        tmp_path = self.progress_path.with_name(self.progress_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.progress_path)
+        self._unsaved = 0
+
+    async def run(self, jobs: Iterable[DownloadJob]) -> Dict:
+        """
+        Executa os jobs até a fila esvaziar ou o agendador ser parado.
+
+        Args:
+            jobs: Jobs a executar (na ordem de entrada dentro de cada prioridade)
+
+        Returns:
+            Estatísticas: total, success, failed, skipped, resumed e retries
+        """
+        jobs = list(jobs)
+        self.completed = self.load_progress()
+        self.results = {}
+        self.stats = self._empty_stats(len(jobs))
+        self.running = True
+
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for sequence, job in enumerate(jobs):
+            if job.key in self.completed:
+                self.stats['resumed'] += 1
+            else:
+                queue.put_nowait((job.priority, job.attempts, sequence, job))
+
+        if self.stats['resumed']:
+            logger.info(f"⏩ Retomando downloads: {self.stats['resumed']} imagens já concluídas")
+
+        workers = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(min(self.workers, queue.qsize()))
+        ]
+        try:
+            if workers:
+                await queue.join()
+        finally:
+            self.running = False
+            for task in [*workers, *self._requeues]:
+                task.cancel()
+            await asyncio.gather(*workers, *self._requeues, return_exceptions=True)
+            self._requeues.clear()
+            await asyncio.to_thread(self.save_progress)
+
+        logger.info(f"📦 Downloads concluídos: {self.stats}")
+        return self.stats
+
+    def stop(self):
+        """Interrompe a execução; jobs pendentes ficam para a próxima."""
+        self.running = False
+
+    async def _worker(self, queue: asyncio.PriorityQueue):
+        """Consome a fila até ela esvaziar ou o agendador ser parado."""
+        while True:
+            _, _, sequence, job = await queue.get()
+            if not self.running:
+                # Descarta os jobs restantes para liberar o queue.join()
+                queue.task_done()
+                continue
+
+            job.attempts += 1
+            try:
+                result = await self.fetch(job)
+            except Exception as e:
+                logger.debug(f"Falha no download {job.key} (tentativa {job.attempts}): {e}")
+                if job.attempts < self.max_attempts and self.running:
+                    self.stats['retries'] += 1
+                    delay = self.retry_delay * 2 ** (job.attempts - 1)
+                    task = asyncio.create_task(self._requeue(queue, (job.priority, job.attempts, sequence, job), delay))
+                    self._requeues.add(task)
+                    task.add_done_callback(self._requeues.discard)
+                    continue
+                self._record(job, 'failed', error=str(e))
+            else:
+                self._record(job, 'success' if result else 'skipped', path=result)
+
+            queue.task_done()
+
+    async def _requeue(self, queue: asyncio.PriorityQueue, item, delay: float):
+        """Devolve um job à fila após o backoff."""
+        try:
+            await asyncio.sleep(delay)
+            if self.running:
+                queue.put_nowait(item)
+        finally:
+            # O task_done do job original só acontece depois de ele voltar à
+            # fila, para que o queue.join() não termine antes da nova tentativa
+            queue.task_done()
+
+    def _record(self, job: DownloadJob, status: str, **details):
+        """Registra o resultado final de um job."""
+        self.stats[status] += 1
+        self.results[job.key] = {'status': status, 'attempts': job.attempts, **details}
+        if status == 'success':
+            self.completed.add(job.key)
+            self._unsaved += 1
+            if self.progress_path and self._unsaved >= self.save_every:
+                self.save_progress()
+
+    def get_status(self) -> Dict:
+        """Retorna o estado atual do agendador."""
+        return {"running": self.running, "workers": self.workers, **self.stats}
+
+
+# Controle de concorrência compartilhado pelos downloads de imagens
+image_download_gate = AdaptiveDownloadGate()
@@ -0,0 +1,93 @@
+"""
+Cliente HTTP compartilhado para download de imagens dos Pokémons.
+
+Todas as instâncias do ImageCacheService usam uma única sessão aiohttp com
+pool de conexões e keep-alive, em vez de abrir uma sessão (e um novo
+handshake TCP/TLS) por imagem. O limite de conexões simultâneas por host é
+configurável em settings.
+
+Na aplicação, a sessão é aberta e fechada pelo lifespan do FastAPI (main.py).
+Scripts avulsos podem usar o serviço diretamente: a sessão é criada sob
+demanda e deve ser fechada com ``await image_http_client.close()``.
+
+Example:
+    >>> from app.services.image_http_client import image_http_client
+    >>> session = await image_http_client.get_session()
+    >>> async with session.get(url) as response:
+    ...     content = await response.read()
+"""
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Headers enviados em todos os downloads de imagens
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Cache-Control': 'no-cache'
+}
+
+
+class ImageHTTPClient:
+    """
+    Sessão aiohttp de longa duração, com pool de conexões por host.
+
+    Uma sessão aiohttp pertence ao event loop em que foi criada; se o
+    cliente for usado a partir de outro loop (ex: scripts ou testes que
+    executam vários ``asyncio.run``), uma nova sessão é criada para ele.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Cria a sessão com o pool configurado em settings."""
+        connector = aiohttp.TCPConnector(
+            limit=settings.image_http_max_connections,
+            limit_per_host=settings.image_http_max_connections_per_host,
+            keepalive_timeout=settings.image_http_keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.image_http_timeout,
+            connect=10,  # 10s para conectar
+            sock_read=20  # 20s para ler dados
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=DEFAULT_HEADERS)
+
+    async def start(self):
+        """Abre a sessão compartilhada no event loop atual."""
+        await self.get_session()
+        logger.info("🌐 Cliente HTTP de imagens iniciado")
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Retorna a sessão compartilhada, criando-a se necessário.
+
+        Returns:
+            aiohttp.ClientSession: Sessão do event loop atual
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        """Fecha a sessão compartilhada e suas conexões."""
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("🛑 Cliente HTTP de imagens fechado")
+
+
+# Instância global compartilhada pelos serviços de imagem
+image_http_client = ImageHTTPClient()
@@ -7,6 +7,7 @@ Este módulo implementa técnicas avançadas de otimização de imagens incluind
 - Redimensionamento inteligente
 - Cache otimizado de imagens processadas
 - Verificação de integridade
+- Codificação em um pool de processos, fora do event loop
 """
 
 import os
@@ -18,11 +19,97 @@ import logging
 from datetime import datetime
 import hashlib
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, inspect, text
+from sqlalchemy.engine import Engine
 from app.core.database import Base
+from app.services.image_download_scheduler import DownloadJob, ImageDownloadScheduler, build_jobs
+from app.services.image_process_pool import image_process_pool
+from app.services.image_variant_cache import ImageVariantCache
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Variantes sendo geradas, para que requisições concorrentes pela mesma
+# variante executem uma única codificação
+_variant_flights = SingleFlight()
+
+
+def encode_optimized_image(
+    original_path: str,
+    optimized_path: str,
+    target_format: str,
+    quality: int,
+    width: Optional[int] = None
+) -> Dict:
+    """
+    Codifica a imagem otimizada (executada no pool de processos).
+
+    A imagem é gravada em um arquivo temporário e renomeada ao final, para
+    que uma leitura simultânea nunca encontre um arquivo incompleto.
+
+    Args:
+        original_path: Caminho da imagem original
+        optimized_path: Caminho da imagem otimizada
+        target_format: Formato alvo ('webp', 'jpeg', 'png')
+        quality: Qualidade da compressão (1-100)
+        width: Largura máxima em pixels (None = largura original); a
+            proporção é mantida e imagens menores não são ampliadas
+
+    Returns:
+        original_size, optimized_size, compression_ratio, dimensions e quality
+    """
+    with Image.open(original_path) as img:
+        # Converte para RGB se necessário
+        if img.mode in ('RGBA', 'LA') and target_format == 'jpeg':
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+            img = background
+        elif target_format in ['webp', 'avif']:
+            # WebP e AVIF suportam transparência
+            has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if has_alpha else 'RGB')
+        elif img.mode != 'RGB' and target_format == 'jpeg':
+            img = img.convert('RGB')
+
+        # Redimensiona mantendo a proporção
+        if width and img.width > width:
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+
+        # Salva com otimização
+        save_kwargs = {
+            'format': target_format.upper(),
+            'optimize': True,
+            'quality': quality
+        }
+
+        if target_format == 'webp':
+            save_kwargs['method'] = 6  # Método mais lento mas melhor compressão
+            save_kwargs['lossless'] = False
+
+        tmp_path = f"{optimized_path}.{os.getpid()}.part"
+        try:
+            img.save(tmp_path, **save_kwargs)
+            os.replace(tmp_path, optimized_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        dimensions = f"{img.width}x{img.height}"
+
+    original_size = os.path.getsize(original_path)
+    optimized_size = os.path.getsize(optimized_path)
+    return {
+        'original_size': original_size,
+        'optimized_size': optimized_size,
+        'compression_ratio': int(((original_size - optimized_size) / original_size) * 100),
+        'dimensions': dimensions,
+        'quality': quality
+    }
+
 
 class OptimizedImageCache(Base):
     """
@@ -43,11 +130,40 @@ class OptimizedImageCache(Base):
     optimized_size = Column(Integer, default=0)
     compression_ratio = Column(Integer, default=0)  # Porcentagem de redução
     dimensions = Column(String(20), nullable=True)  # "WxH"
+    width = Column(Integer, nullable=True)  # Largura padrão da variante (None = original)
+    image_format = Column(String(10), nullable=True)  # 'webp', 'avif', 'png', 'jpeg'
     is_optimized = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# Colunas adicionadas após a criação da tabela: nome -> tipo SQL
+_ADDED_COLUMNS = {
+    "width": "INTEGER",
+    "image_format": "VARCHAR(10)",
+}
+
+
+def ensure_optimized_image_schema(engine: Engine):
+    """
+    Adiciona ao optimized_image_cache colunas criadas após a tabela existir.
+
+    O create_all não altera tabelas existentes; esta função é chamada na
+    inicialização, logo após ele, e é idempotente.
+
+    Args:
+        engine: Engine do banco de dados
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns(OptimizedImageCache.__tablename__)}
+    for name, sql_type in _ADDED_COLUMNS.items():
+        if name not in columns:
+            with engine.begin() as connection:
+                connection.execute(text(
+                    f"ALTER TABLE {OptimizedImageCache.__tablename__} ADD COLUMN {name} {sql_type}"
+                ))
+            logger.info(f"Coluna {name} adicionada ao optimized_image_cache")
+
+
 class ImageOptimizationService:
     """
     Serviço de otimização avançada de imagens dos Pokémons.
@@ -65,6 +181,9 @@ class ImageOptimizationService:
         """
         self.optimized_dir = Path(optimized_dir)
         self.optimized_dir.mkdir(parents=True, exist_ok=True)
+
+        # Variantes responsivas (largura/formato), com limite de tamanho
+        self.variant_cache = ImageVariantCache(str(self.optimized_dir / "variants"))
         
         # Configurações de otimização
         self.quality_settings = {
@@ -125,18 +244,19 @@ class ImageOptimizationService:
                 return existing.optimized_path
 
             # Processa otimização
-            optimized_path = await self._process_optimization(
+            result = await self._process_optimization(
                 original_path, pokemon_id, image_type, optimization_type, target_format
             )
             
-            if optimized_path:
-                # Registra no banco
-                await self._save_optimization_record(
-                    db, pokemon_id, image_type, original_path, optimized_path, 
-                    optimization_type, target_format
-                )
+            if not result:
+                return None
+
+            # Registra no banco
+            await self._save_optimization_record(
+                db, pokemon_id, image_type, original_path, optimization_type, target_format, result
+            )
                 
-            return optimized_path
+            return result['path']
 
         except Exception as e:
             logger.error(f"Erro ao otimizar imagem {pokemon_id}: {e}")
@@ -148,63 +268,133 @@ class ImageOptimizationService:
         pokemon_id: int,
         image_type: str,
         optimization_type: str,
-        target_format: str
-    ) -> Optional[str]:
+        target_format: str,
+        optimized_path: Optional[str] = None,
+        width: Optional[int] = None
+    ) -> Optional[Dict]:
         """
         Processa a otimização real da imagem.
+
+        A codificação é executada no pool de processos (image_process_pool),
+        sem bloquear o event loop.
+
+        Returns:
+            Resultado de encode_optimized_image com o caminho em 'path',
+            ou None se falhou
         """
         try:
-            with Image.open(original_path) as img:
-                # Converte para RGB se necessário
-                if img.mode in ('RGBA', 'LA') and target_format == 'jpeg':
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB' and target_format in ['jpeg', 'webp']:
-                    img = img.convert('RGB')
-
-                # Determina qualidade
-                if optimization_type == 'auto':
-                    quality = self._determine_optimal_quality(original_path)
-                else:
-                    quality = self.quality_settings.get(optimization_type, 85)
-
-                # Define caminho otimizado
+            # Determina qualidade
+            if optimization_type == 'auto':
+                quality = self._determine_optimal_quality(original_path)
+            else:
+                quality = self.quality_settings.get(optimization_type, 85)
+
+            # Define caminho otimizado
+            if optimized_path is None:
                 filename = f"{pokemon_id}_{image_type}_{optimization_type}.{target_format}"
-                optimized_path = self.optimized_dir / filename
+                optimized_path = str(self.optimized_dir / filename)
+
+            result = await image_process_pool.run(
+                encode_optimized_image, original_path, optimized_path, target_format, quality, width
+            )
 
-                # Salva com otimização
-                save_kwargs = {
-                    'format': target_format.upper(),
-                    'optimize': True,
-                    'quality': quality
-                }
+            logger.info(
+                f"Imagem otimizada: {pokemon_id}/{image_type} | "
+                f"{result['original_size']} → {result['optimized_size']} bytes | "
+                f"Redução: {result['compression_ratio']}%"
+            )
+
+            return {**result, 'path': optimized_path}
+
+        except Exception as e:
+            logger.error(f"Erro no processamento de otimização: {e}")
+            return None
 
-                if target_format == 'webp':
-                    save_kwargs['method'] = 6  # Método mais lento mas melhor compressão
-                    save_kwargs['lossless'] = False
+    async def get_image_variant(
+        self,
+        db: Session,
+        original_path: str,
+        source_version: str,
+        pokemon_id: int,
+        image_type: str,
+        width: Optional[int] = None,
+        target_format: str = 'webp',
+        optimization_type: str = 'medium'
+    ) -> Optional[str]:
+        """
+        Retorna uma variante responsiva da imagem, gerando-a se necessário.
 
-                # Salva imagem otimizada
-                img.save(optimized_path, **save_kwargs)
+        A variante é gerada a partir do original cacheado no pool de
+        processos, guardada no cache de variantes (LRU em disco) e registrada
+        no OptimizedImageCache. Acertos no cache não consultam o banco.
 
-                # Verifica integridade
-                if os.path.exists(optimized_path):
-                    original_size = os.path.getsize(original_path)
-                    optimized_size = os.path.getsize(optimized_path)
-                    compression_ratio = int(((original_size - optimized_size) / original_size) * 100)
+        O nome da variante inclui a versão do original: quando o original
+        é substituído (novo download), a variante antiga deixa de ser
+        encontrada e é removida pelo LRU.
 
-                    logger.info(
-                        f"Imagem otimizada: {pokemon_id}/{image_type} | "
-                        f"{original_size} → {optimized_size} bytes | "
-                        f"Redução: {compression_ratio}%"
-                    )
+        Args:
+            db: Sessão do banco de dados
+            original_path: Caminho da imagem original cacheada
+            source_version: Versão do original (ETag da entrada do índice)
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+            width: Largura padrão (ver snap_width); None = largura original
+            target_format: Formato ('avif', 'webp', 'png')
+            optimization_type: Nível de otimização ('high', 'medium', 'low', 'auto')
 
-                    return str(optimized_path)
+        Returns:
+            Caminho da variante ou None se falhou
+        """
+        version = hashlib.sha256(source_version.encode()).hexdigest()[:12]
+        size = f'w{width}' if width else 'orig'
+        name = f"{pokemon_id}_{image_type}_{optimization_type}_{size}_{version}.{target_format}"
+        path = self.variant_cache.get(name)
+        if path:
+            return path
+
+        return await _variant_flights.do(
+            (str(self.variant_cache.directory.resolve()), name),
+            lambda: self._generate_variant(
+                db, original_path, pokemon_id, image_type, width, target_format, optimization_type, name
+            )
+        )
 
-        except Exception as e:
-            logger.error(f"Erro no processamento de otimização: {e}")
+    async def _generate_variant(
+        self,
+        db: Session,
+        original_path: str,
+        pokemon_id: int,
+        image_type: str,
+        width: Optional[int],
+        target_format: str,
+        optimization_type: str,
+        name: str
+    ) -> Optional[str]:
+        """Gera uma variante, registra-a e aplica o limite do cache."""
+        result = await self._process_optimization(
+            original_path, pokemon_id, image_type, optimization_type, target_format,
+            optimized_path=self.variant_cache.path_for(name), width=width
+        )
+        if not result:
             return None
 
+        await self._save_optimization_record(
+            db, pokemon_id, image_type, original_path, optimization_type, target_format, result, width
+        )
+
+        evicted = self.variant_cache.put(name, result['optimized_size'])
+        if evicted:
+            try:
+                db.query(OptimizedImageCache).filter(
+                    OptimizedImageCache.optimized_path.in_(evicted)
+                ).delete(synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                logger.error(f"Erro ao remover registros de variantes: {e}")
+                db.rollback()
+
+        return result['path']
+
     def _determine_optimal_quality(self, image_path: str) -> int:
         """
         Determina qualidade ótima baseada no tamanho original.
@@ -228,17 +418,25 @@ class ImageOptimizationService:
         pokemon_id: int, 
         image_type: str, 
         optimization_type: str, 
-        target_format: str
+        target_format: str,
+        width: Optional[int] = None
     ) -> Optional[OptimizedImageCache]:
         """
         Busca otimização existente no banco.
+
+        Sem ``width``, busca a otimização na largura original; registros
+        anteriores às variantes não têm width nem image_format.
         """
-        return db.query(OptimizedImageCache).filter(
+        query = db.query(OptimizedImageCache).filter(
             OptimizedImageCache.pokemon_id == pokemon_id,
             OptimizedImageCache.image_type == image_type,
             OptimizedImageCache.optimization_type == optimization_type,
+            OptimizedImageCache.width == width,
             OptimizedImageCache.is_optimized == True
-        ).first()
+        )
+        if width is not None:
+            query = query.filter(OptimizedImageCache.image_format == target_format)
+        return query.first()
 
     async def _save_optimization_record(
         self, 
@@ -246,24 +444,21 @@ class ImageOptimizationService:
         pokemon_id: int,
         image_type: str,
         original_path: str,
-        optimized_path: str,
         optimization_type: str,
-        target_format: str
+        target_format: str,
+        result: Dict,
+        width: Optional[int] = None
     ):
         """
         Salva registro de otimização no banco.
+
+        Usa os tamanhos e dimensões calculados no pool de processos, sem
+        reabrir a imagem otimizada no event loop.
         """
         try:
-            with Image.open(optimized_path) as img:
-                dimensions = f"{img.width}x{img.height}"
-
-            original_size = os.path.getsize(original_path)
-            optimized_size = os.path.getsize(optimized_path)
-            compression_ratio = int(((original_size - optimized_size) / original_size) * 100)
-
             # Remove registro antigo se existir
             existing = self._get_existing_optimization(
-                db, pokemon_id, image_type, optimization_type, target_format
+                db, pokemon_id, image_type, optimization_type, target_format, width
             )
             if existing:
                 db.delete(existing)
@@ -273,13 +468,15 @@ class ImageOptimizationService:
                 pokemon_id=pokemon_id,
                 image_type=image_type,
                 original_path=original_path,
-                optimized_path=optimized_path,
+                optimized_path=result['path'],
                 optimization_type=optimization_type,
-                quality=self.quality_settings.get(optimization_type, 85),
-                original_size=original_size,
-                optimized_size=optimized_size,
-                compression_ratio=compression_ratio,
-                dimensions=dimensions,
+                quality=result['quality'],
+                original_size=result['original_size'],
+                optimized_size=result['optimized_size'],
+                compression_ratio=result['compression_ratio'],
+                dimensions=result['dimensions'],
+                width=width,
+                image_format=target_format,
                 is_optimized=True
             )
 
@@ -299,6 +496,10 @@ class ImageOptimizationService:
     ) -> Dict[str, int]:
         """
         Otimiza imagens em lote para múltiplos Pokémons.
+
+        As imagens são processadas em paralelo por uma fila com um worker
+        por vaga do pool de processos; a codificação escala com o número de
+        núcleos e o event loop continua livre para as requisições da API.
         
         Args:
             db: Sessão do banco de dados
@@ -312,29 +513,19 @@ class ImageOptimizationService:
         if image_types is None:
             image_types = ['official-artwork', 'sprite', 'home']
 
-        stats = {
-            'total': len(pokemon_ids) * len(image_types),
-            'optimized': 0,
-            'failed': 0,
+        async def optimize(job: DownloadJob) -> Optional[str]:
+            return await self.optimize_pokemon_image(db, job.pokemon_id, job.image_type, optimization_type)
+
+        scheduler = ImageDownloadScheduler(optimize, workers=image_process_pool.max_pending, max_attempts=1)
+        result = await scheduler.run(build_jobs(pokemon_ids, image_types))
+
+        return {
+            'total': result['total'],
+            'optimized': result['success'],
+            'failed': result['failed'] + result['skipped'],
             'skipped': 0
         }
 
-        for pokemon_id in pokemon_ids:
-            for image_type in image_types:
-                try:
-                    result = await self.optimize_pokemon_image(
-                        db, pokemon_id, image_type, optimization_type
-                    )
-                    if result:
-                        stats['optimized'] += 1
-                    else:
-                        stats['failed'] += 1
-                except Exception as e:
-                    logger.error(f"Erro ao otimizar {pokemon_id}/{image_type}: {e}")
-                    stats['failed'] += 1
-
-        return stats
-
     def get_optimization_stats(self, db: Session) -> Dict[str, any]:
         """
         Retorna estatísticas de otimização.
@@ -0,0 +1,146 @@
+"""
+Pool de processos compartilhado para o processamento de imagens.
+
+A codificação de imagens com Pillow (ex: WebP com ``method=6``) consome CPU
+e, executada dentro de uma corrotina, bloqueia o event loop e todas as
+requisições da API. Este módulo executa esse trabalho em um
+ProcessPoolExecutor com um worker por núcleo, fora do processo da API.
+
+O número de tarefas enviadas ao pool ao mesmo tempo é limitado
+(``max_pending``): quando o limite é atingido, quem envia uma nova tarefa
+aguarda até que outra termine (backpressure), em vez de acumular milhares
+de imagens na fila interna do executor.
+
+Os processos são iniciados pelo método ``forkserver`` (``spawn`` onde ele não
+existe): o processo da API tem várias threads (asyncio.to_thread, verificador
+do índice), e um ``fork`` direto dele pode herdar locks travados e deixar o
+processo filho bloqueado.
+
+O pool é criado sob demanda e encerrado pelo lifespan do FastAPI (main.py).
+Scripts avulsos devem chamar ``image_process_pool.shutdown()`` ao terminar.
+
+Example:
+    >>> from app.services.image_process_pool import image_process_pool
+    >>> result = await image_process_pool.run(encode_image, "in.png", "out.webp")
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    """Contexto de multiprocessing seguro em processos com várias threads."""
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+class ImageProcessPool:
+    """
+    ProcessPoolExecutor com limite de tarefas em andamento.
+
+    As funções enviadas ao pool devem ser definidas no nível do módulo e
+    receber/retornar apenas valores serializáveis (caminhos, números,
+    dicionários), pois são executadas em outro processo.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Args:
+            workers: Número de processos (padrão: settings ou núcleos disponíveis)
+            max_pending: Máximo de tarefas enviadas ao pool ao mesmo tempo
+                (padrão: settings ou duas por processo)
+        """
+        self.workers = workers or settings.image_optimization_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or settings.image_optimization_max_pending or self.workers * 2
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Retorna o executor, criando-o se necessário."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+            logger.info(f"⚙️ Pool de processamento de imagens iniciado ({self.workers} processos)")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Retorna o limite de tarefas do event loop atual."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa ``func(*args)`` em um processo do pool.
+
+        Aguarda uma vaga se ``max_pending`` tarefas já estiverem em andamento.
+
+        Args:
+            func: Função definida no nível do módulo
+            *args: Argumentos serializáveis
+
+        Returns:
+            Retorno de ``func``; exceções geradas no processo são propagadas
+        """
+        async with self._get_semaphore():
+            self.pending += 1
+            try:
+                executor = self._get_executor()
+                result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+                self.completed += 1
+                return result
+            except BrokenProcessPool:
+                # Um processo morreu (ex: falta de memória): o executor não
+                # aceita mais tarefas e é recriado na próxima chamada
+                logger.error("❌ Pool de processamento de imagens interrompido; será recriado")
+                self.failed += 1
+                self._discard_executor(executor)
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.pending -= 1
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Descarta um executor quebrado."""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Encerra os processos do pool."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("🛑 Pool de processamento de imagens encerrado")
+
+    def get_status(self) -> Dict:
+        """Retorna status do pool."""
+        return {
+            "active": self._executor is not None,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+
+# Instância global compartilhada pelos serviços de imagem
+image_process_pool = ImageProcessPool()
@@ -0,0 +1,202 @@
+"""
+Cache em disco das variantes responsivas das imagens dos Pokémons.
+
+Variantes são imagens derivadas do original cacheado, em uma das larguras
+padrão (ex: thumbnails de 96px para as grades) e no formato negociado com o
+cliente (AVIF, WebP ou PNG). Como podem ser geradas novamente a qualquer
+momento, o diretório é limitado em bytes: ao ultrapassar o limite, as
+variantes usadas há mais tempo são removidas (LRU).
+
+O índice LRU fica em memória e é reconstruído do diretório na primeira
+consulta, ordenado pela data de modificação dos arquivos; acertos não
+alteram o disco.
+
+O mesmo cache guarda os atlas do SpriteAtlasService (outro diretório).
+
+Example:
+    >>> from app.services.image_variant_cache import ImageVariantCache
+    >>> cache = ImageVariantCache("app/data/optimized/variants", max_bytes=50 * 1024 * 1024)
+    >>> cache.get("25_official-artwork_medium_w96.webp")
+    None
+"""
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from PIL import features
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Formatos das variantes, em ordem de preferência, e seus tipos MIME
+VARIANT_MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'png': 'image/png'
+}
+
+
+def snap_width(width: Optional[int], widths: Optional[Sequence[int]] = None) -> Optional[int]:
+    """
+    Arredonda a largura pedida para a menor largura padrão que a comporta.
+
+    Limitar as larguras a alguns valores padrão mantém o número de variantes
+    por imagem pequeno (e o cache eficiente), qualquer que seja o ``?w=``.
+
+    Args:
+        width: Largura pedida em pixels (None = largura original)
+        widths: Larguras padrão (padrão: settings.image_variant_widths)
+
+    Returns:
+        Largura padrão ou None para a largura original
+    """
+    if not width:
+        return None
+    widths = sorted(widths or settings.image_variant_widths)
+    return next((standard for standard in widths if standard >= width), widths[-1])
+
+
+def negotiate_image_format(accept: Optional[str]) -> str:
+    """
+    Escolhe o formato da variante pelo cabeçalho Accept.
+
+    Prefere AVIF (se suportado pelo Pillow instalado), depois WebP; clientes
+    que não anunciam nenhum dos dois recebem PNG.
+
+    Args:
+        accept: Valor do cabeçalho Accept
+
+    Returns:
+        'avif', 'webp' ou 'png'
+    """
+    accepted = set()
+    for item in (accept or "").lower().split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            if float(quality) <= 0:
+                continue  # q=0: tipo recusado explicitamente
+        except ValueError:
+            pass
+        accepted.add(media_type)
+
+    if 'image/avif' in accepted and features.check('avif'):
+        return 'avif'
+    if 'image/webp' in accepted:
+        return 'webp'
+    return 'png'
+
+
+class ImageVariantCache:
+    """
+    Diretório de variantes limitado em bytes, com remoção LRU.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Diretório das variantes
+            max_bytes: Tamanho máximo do diretório
+                (padrão: settings.image_variant_cache_max_bytes)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes or settings.image_variant_cache_max_bytes
+
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # nome -> bytes
+        self._loaded = False
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load(self):
+        """Reconstrói o índice a partir do diretório (mais antigas primeiro)."""
+        self._loaded = True
+        files = []
+        for path in self.directory.iterdir():
+            if path.is_file() and not path.name.endswith(".part"):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self.total_bytes += size
+
+    def path_for(self, name: str) -> str:
+        """Retorna o caminho de uma variante no diretório."""
+        return str(self.directory / name)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Busca uma variante e a marca como usada recentemente.
+
+        Args:
+            name: Nome do arquivo da variante
+
+        Returns:
+            Caminho da variante ou None se não estiver no cache
+        """
+        if not self._loaded:
+            self._load()
+
+        if name in self._entries:
+            path = self.path_for(name)
+            if os.path.exists(path):
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return path
+            # Removida do disco por fora do cache
+            self.total_bytes -= self._entries.pop(name)
+
+        self.misses += 1
+        return None
+
+    def put(self, name: str, size: int) -> List[str]:
+        """
+        Registra uma variante recém-gerada e remove as menos usadas se o
+        limite for ultrapassado. A variante registrada nunca é removida.
+
+        Args:
+            name: Nome do arquivo da variante
+            size: Tamanho em bytes
+
+        Returns:
+            Caminhos das variantes removidas
+        """
+        if not self._loaded:
+            self._load()
+
+        self.total_bytes += size - self._entries.pop(name, 0)
+        self._entries[name] = size
+
+        evicted = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_name, old_size = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+            path = self.path_for(old_name)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            evicted.append(path)
+
+        if evicted:
+            self.evictions += len(evicted)
+            logger.info(f"🧹 {len(evicted)} variantes de imagem removidas do cache (LRU)")
+        return evicted
+
+    def get_status(self) -> Dict:
+        """Retorna status do cache de variantes."""
+        return {
+            "directory": str(self.directory),
+            "variants": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,189 @@
+"""
+Espelho persistente das respostas da PokeAPI.
+
+Este módulo armazena no banco de dados da aplicação os payloads JSON já
+buscados pelo PokeAPIService, indexados por tipo de recurso e identificador.
+O espelho sobrevive a reinicializações e redeploys, permitindo que o serviço:
+- Responda sem acessar a PokeAPI após um restart (warm start)
+- Continue servindo as rotas /pokemon/* quando a PokeAPI estiver lenta
+- Carregue os dados de forma preguiçosa, apenas quando solicitados
+
+Os payloads são gravados como JSON compactado com zlib.
+
+Example:
+    >>> from app.services.pokeapi_mirror_service import pokeapi_mirror
+    >>> pokeapi_mirror.put("pokemon", ["25", "pikachu"], {"id": 25, "name": "pikachu"})
+    >>> data, age = pokeapi_mirror.get("pokemon", "pikachu")
+    >>> data["id"]
+    25
+"""
+
+import json
+import logging
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint, func
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class PokeAPIMirrorEntry(Base):
+    """
+    Modelo para payloads espelhados da PokeAPI.
+
+    Cada linha guarda a resposta completa de um recurso da PokeAPI. Um mesmo
+    payload pode aparecer sob vários identificadores (ex: "25" e "pikachu").
+    """
+
+    __tablename__ = "pokeapi_mirror"
+
+    # Campos principais
+    id = Column(Integer, primary_key=True, index=True)
+    resource = Column(String(20), nullable=False)  # 'pokemon', 'species', 'type', 'list'
+    identifier = Column(String(100), nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # JSON compactado com zlib
+
+    # Auditoria
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('resource', 'identifier', name='_pokeapi_mirror_resource_identifier_uc'),
+    )
+
+
+class PokeAPIMirror:
+    """
+    Repositório do espelho persistente da PokeAPI.
+
+    Os métodos são síncronos e abrem sua própria sessão, para que possam
+    ser executados em uma thread auxiliar sem bloquear o event loop.
+
+    Attributes:
+        session_factory: Fábrica de sessões SQLAlchemy usada nas operações.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        """
+        Inicializa o espelho.
+
+        Args:
+            session_factory: Fábrica de sessões (padrão: SessionLocal da aplicação)
+        """
+        self.session_factory = session_factory
+
+    def get(self, resource: str, identifier: str) -> Optional[Tuple[Dict, float]]:
+        """
+        Busca um payload espelhado.
+
+        Args:
+            resource: Tipo de recurso
+            identifier: Identificador normalizado do recurso
+
+        Returns:
+            Tupla (payload, idade em segundos) ou None se não espelhado
+        """
+        db = self.session_factory()
+        try:
+            entry = db.query(PokeAPIMirrorEntry).filter(
+                PokeAPIMirrorEntry.resource == resource,
+                PokeAPIMirrorEntry.identifier == identifier
+            ).first()
+
+            if not entry:
+                return None
+
+            data = json.loads(zlib.decompress(entry.payload))
+            age = (datetime.utcnow() - entry.fetched_at).total_seconds()
+            return data, max(age, 0.0)
+
+        except (SQLAlchemyError, zlib.error, ValueError) as e:
+            logger.error(f"Erro ao ler espelho da PokeAPI {resource}/{identifier}: {e}")
+            return None
+        finally:
+            db.close()
+
+    def put(self, resource: str, identifiers: List[str], data: Dict) -> bool:
+        """
+        Grava (ou atualiza) um payload sob um ou mais identificadores.
+
+        Args:
+            resource: Tipo de recurso
+            identifiers: Identificadores que devem apontar para o payload
+            data: Resposta da PokeAPI
+
+        Returns:
+            True se gravou com sucesso, False caso contrário
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        now = datetime.utcnow()
+
+        db = self.session_factory()
+        try:
+            existing = {
+                entry.identifier: entry
+                for entry in db.query(PokeAPIMirrorEntry).filter(
+                    PokeAPIMirrorEntry.resource == resource,
+                    PokeAPIMirrorEntry.identifier.in_(identifiers)
+                ).all()
+            }
+
+            for identifier in identifiers:
+                entry = existing.get(identifier)
+                if entry:
+                    entry.payload = payload
+                    entry.fetched_at = now
+                else:
+                    db.add(PokeAPIMirrorEntry(
+                        resource=resource,
+                        identifier=identifier,
+                        payload=payload,
+                        fetched_at=now
+                    ))
+
+            db.commit()
+            return True
+
+        except SQLAlchemyError as e:
+            # Outra gravação concorrente pode ter inserido a mesma chave
+            db.rollback()
+            logger.warning(f"Erro ao gravar espelho da PokeAPI {resource}/{identifiers}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna estatísticas do espelho.
+
+        Returns:
+            Dicionário com total de entradas por recurso e tamanho compactado
+        """
+        db = self.session_factory()
+        try:
+            rows = db.query(
+                PokeAPIMirrorEntry.resource,
+                func.count(PokeAPIMirrorEntry.id),
+                func.sum(func.length(PokeAPIMirrorEntry.payload))
+            ).group_by(PokeAPIMirrorEntry.resource).all()
+
+            return {
+                "entries": {resource: count for resource, count, _ in rows},
+                "total_entries": sum(count for _, count, _ in rows),
+                "compressed_size_mb": round(sum(size or 0 for _, _, size in rows) / (1024 * 1024), 2)
+            }
+
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao obter estatísticas do espelho da PokeAPI: {e}")
+            return {}
+        finally:
+            db.close()
+
+
+# Instância global do espelho usada pelo pokeapi_service
+pokeapi_mirror = PokeAPIMirror()
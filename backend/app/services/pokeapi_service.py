@@ -6,15 +6,48 @@ encapsulando chamadas HTTP, tratamento de erros e transformação de dados.
 Inclui métodos para buscar Pokémons individuais, listas paginadas, espécies,
 tipos e funcionalidades de busca.
 
+As respostas são mantidas em um cache LRU em memória com TTL por tipo de
+recurso. Respostas expiradas continuam sendo servidas durante uma janela de
+tolerância enquanto são revalidadas em background (stale-while-revalidate).
+Opcionalmente, um espelho persistente (PokeAPIMirror) guarda as respostas no
+banco de dados para que reinicializações não precisem buscar tudo de novo.
+Chamadas concorrentes pelo mesmo recurso compartilham uma única busca
+em andamento (single-flight).
+
 Example:
     >>> from app.services.pokeapi_service import pokeapi_service
     >>> pokemon = await pokeapi_service.get_pokemon("pikachu")
     >>> print(pokemon["name"])
     'pikachu'
 """
+import asyncio
 import httpx
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from app.core.config import settings
+from app.utils.cache_utils import ResponseCache, CACHE_FRESH, CACHE_STALE
+from app.utils.single_flight import SingleFlight
+from app.services.pokeapi_mirror_service import PokeAPIMirror, pokeapi_mirror
+from app.services.pokemon_search_index import PokemonNameIndex, normalize_query
+from app.utils.projection import project_fields
+
+# Limite usado para obter todas as espécies em uma única página da PokeAPI
+SPECIES_LIST_LIMIT = 10000
+
+# Campos da visão resumida de um Pokémon (view=summary), sem os arrays
+# grandes como moves e game_indices
+POKEMON_SUMMARY_FIELDS = [
+    "id",
+    "name",
+    "height",
+    "weight",
+    "base_experience",
+    "types",
+    "abilities",
+    "stats",
+    "sprites.front_default",
+    "sprites.front_shiny",
+    "sprites.other.official-artwork.front_default",
+]
 
 
 class PokeAPIService:
@@ -25,10 +58,18 @@ class PokeAPIService:
     fornecendo métodos assíncronos para buscar informações sobre Pokémons,
     espécies, tipos e realizar buscas. Inclui tratamento de erros HTTP
     e configuração de timeouts apropriados.
-    
+
+    Respostas bem-sucedidas são armazenadas em cache por tipo de recurso.
+    Os dicionários retornados são compartilhados com o cache e não devem
+    ser modificados pelos chamadores.
+
     Attributes:
         base_url (str): URL base da PokeAPI (https://pokeapi.co/api/v2).
         client (httpx.AsyncClient): Cliente HTTP assíncrono com timeout de 30 segundos.
+        cache (ResponseCache): Cache LRU de respostas com TTL e janela stale.
+        cache_ttls (Dict[str, int]): TTL em segundos por tipo de recurso.
+        mirror (Optional[PokeAPIMirror]): Espelho persistente consultado em caso
+            de miss no cache em memória, ou None para desabilitá-lo.
         
     Example:
         >>> service = PokeAPIService()
@@ -37,10 +78,209 @@ class PokeAPIService:
         'pikachu'
     """
 
-    def __init__(self):
+    def __init__(self, mirror: Optional[PokeAPIMirror] = None):
         self.base_url = settings.pokeapi_base_url
         self.client = httpx.AsyncClient(timeout=30.0)
 
+        # Cache de respostas em memória
+        self.cache = ResponseCache(
+            max_entries=settings.pokeapi_cache_max_entries,
+            stale_ttl=settings.pokeapi_cache_stale_ttl
+        )
+        self.cache_ttls = {
+            "pokemon": settings.pokeapi_cache_ttl_pokemon,
+            "species": settings.pokeapi_cache_ttl_species,
+            "type": settings.pokeapi_cache_ttl_type,
+            "list": settings.pokeapi_cache_ttl_list
+        }
+
+        # Espelho persistente (opcional)
+        self.mirror = mirror
+
+        # Buscas em andamento compartilhadas entre chamadas concorrentes
+        self._flights = SingleFlight()
+
+        # Índice local de nomes para busca por prefixo/aproximada
+        self.search_index = PokemonNameIndex()
+
+        # Revalidações em andamento (evita refresh duplicado da mesma chave)
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    async def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Executa um GET na PokeAPI e retorna o JSON da resposta.
+
+        Args:
+            url (str): URL completa do recurso.
+            params (Optional[Dict]): Parâmetros de query string.
+
+        Returns:
+            Optional[Dict]: JSON da resposta ou None em caso de erro HTTP.
+        """
+        try:
+            if params is None:
+                response = await self.client.get(url)
+            else:
+                response = await self.client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError:
+            return None
+
+    async def _get_cached(
+        self, resource: str, identifier: str, url: str, params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Retorna um recurso do cache ou busca na PokeAPI em caso de miss.
+
+        Entradas frescas são retornadas diretamente. Entradas expiradas,
+        mas ainda dentro da janela stale, são retornadas imediatamente e
+        revalidadas em background. Em caso de miss, chamadas concorrentes
+        para a mesma chave compartilham uma única carga (ver _load).
+
+        Args:
+            resource (str): Tipo de recurso ('pokemon', 'species', 'type', 'list').
+            identifier (str): Identificador normalizado do recurso.
+            url (str): URL completa do recurso na PokeAPI.
+            params (Optional[Dict]): Parâmetros de query string.
+
+        Returns:
+            Optional[Dict]: Dados do recurso ou None se indisponível.
+        """
+        key = (resource, identifier)
+        value, state = self.cache.get(key)
+
+        if state == CACHE_FRESH:
+            return value
+
+        if state == CACHE_STALE:
+            self._schedule_refresh(key, url, params)
+            return value
+
+        return await self._flights.do(key, lambda: self._load(key, url, params))
+
+    async def _load(self, key: Tuple[str, str], url: str, params: Optional[Dict]) -> Optional[Dict]:
+        """
+        Carrega um recurso ausente do cache em memória.
+
+        O espelho persistente é consultado antes da PokeAPI; payloads
+        espelhados mais antigos que o TTL também são servidos e revalidados
+        em background. Erros não são armazenados em cache.
+
+        Args:
+            key (Tuple[str, str]): Chave (recurso, identificador).
+            url (str): URL completa do recurso na PokeAPI.
+            params (Optional[Dict]): Parâmetros de query string.
+
+        Returns:
+            Optional[Dict]: Dados do recurso ou None se indisponível.
+        """
+        resource, identifier = key
+
+        if self.mirror is not None:
+            mirrored = await asyncio.to_thread(self.mirror.get, resource, identifier)
+            if mirrored is not None:
+                data, age = mirrored
+                ttl = self.cache_ttls[resource]
+                self.cache.set(key, data, ttl=ttl - age)
+                if age >= ttl:
+                    self._schedule_refresh(key, url, params)
+                return data
+
+        data = await self._fetch_json(url, params)
+        if data is not None:
+            self._store(key, data)
+        return data
+
+    def _store(self, key: Tuple[str, str], data: Dict):
+        """
+        Armazena uma resposta no cache com o TTL do seu tipo de recurso.
+
+        Pokémons e espécies também são indexados pelo ID e pelo nome, para
+        que buscas por "25" e "pikachu" compartilhem a mesma entrada. Se o
+        espelho estiver habilitado, a gravação é feita em background.
+
+        Args:
+            key (Tuple[str, str]): Chave (recurso, identificador).
+            data (Dict): Resposta da PokeAPI.
+        """
+        resource, identifier = key
+        identifiers = [identifier]
+
+        if resource in ("pokemon", "species") and isinstance(data, dict):
+            for alias in (data.get("id"), data.get("name")):
+                if alias is not None:
+                    identifiers.append(str(alias).lower())
+
+        ttl = self.cache_ttls[resource]
+        for alias in identifiers:
+            self.cache.set((resource, alias), data, ttl=ttl)
+
+        if self.mirror is not None:
+            self._spawn(asyncio.to_thread(self.mirror.put, resource, identifiers, data))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """
+        Cria uma tarefa em background mantendo uma referência até sua conclusão.
+
+        Args:
+            coro: Corrotina a executar.
+
+        Returns:
+            asyncio.Task: Tarefa criada.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _schedule_refresh(self, key: Tuple[str, str], url: str, params: Optional[Dict]):
+        """
+        Agenda a revalidação em background de uma entrada expirada.
+
+        Args:
+            key (Tuple[str, str]): Chave (recurso, identificador).
+            url (str): URL completa do recurso.
+            params (Optional[Dict]): Parâmetros de query string.
+        """
+        if key in self._refreshing:
+            return
+
+        self._refreshing.add(key)
+        self._spawn(self._refresh(key, url, params))
+
+    async def _refresh(self, key: Tuple[str, str], url: str, params: Optional[Dict]):
+        """
+        Busca novamente um recurso e atualiza o cache se a busca tiver sucesso.
+
+        Em caso de falha a entrada obsoleta permanece no cache até o fim da
+        janela stale.
+        """
+        try:
+            data = await self._fetch_json(url, params)
+            if data is not None:
+                self._store(key, data)
+        finally:
+            self._refreshing.discard(key)
+
+    def get_cache_stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache de respostas da PokeAPI.
+
+        Returns:
+            Dict: Tamanho, limite, hits, stale hits, misses, despejos,
+            e revalidações em andamento.
+
+        Examples:
+            >>> service = PokeAPIService()
+            >>> service.get_cache_stats()["size"]
+            0
+        """
+        stats = self.cache.stats()
+        stats["refreshing"] = len(self._refreshing)
+        return stats
+
     async def get_pokemon(self, pokemon_id_or_name: str) -> Optional[Dict]:
         """
         Busca dados completos de um Pokémon específico da PokeAPI.
@@ -69,13 +309,75 @@ class PokeAPIService:
             >>> print(charizard["name"])
             'charizard'
         """
-        try:
-            url = f"{self.base_url}/pokemon/{pokemon_id_or_name}"
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
+        url = f"{self.base_url}/pokemon/{pokemon_id_or_name}"
+        return await self._get_cached("pokemon", str(pokemon_id_or_name).lower(), url)
+
+    async def get_pokemon_projection(self, pokemon_id_or_name: str, fields: List[str]) -> Optional[Dict]:
+        """
+        Busca um Pokémon mantendo apenas os campos solicitados.
+
+        A resposta completa vem do cache de respostas; a projeção é refeita a
+        cada chamada (é barata) e não é guardada, para não manter respostas
+        completas vivas por conjuntos de campos arbitrários.
+
+        Args:
+            pokemon_id_or_name (str): ID numérico ou nome do Pokémon.
+            fields (List[str]): Campos a manter (ver app.utils.projection),
+                ex: POKEMON_SUMMARY_FIELDS.
+
+        Returns:
+            Optional[Dict]: Pokémon projetado ou None se não encontrado.
+
+        Examples:
+            >>> service = PokeAPIService()
+            >>> await service.get_pokemon_projection("pikachu", ["id", "name"])
+            {'id': 25, 'name': 'pikachu'}
+        """
+        pokemon = await self.get_pokemon(pokemon_id_or_name)
+        if pokemon is None:
             return None
+        return project_fields(pokemon, fields)
+
+    async def get_pokemon_batch(
+        self, pokemon_ids_or_names: List[str], fields: Optional[List[str]] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Busca vários Pokémons de uma vez, em paralelo.
+
+        Cada item é resolvido pelo cache (ver get_pokemon); os que não estão
+        em cache são buscados simultaneamente na PokeAPI, limitados por um
+        semáforo para não abrir conexões demais no cliente HTTP compartilhado.
+        Identificadores repetidos são buscados uma única vez.
+
+        Args:
+            pokemon_ids_or_names (List[str]): IDs ou nomes dos Pokémons.
+            fields (Optional[List[str]]): Campos a manter em cada Pokémon
+                (ver app.utils.projection). None retorna os dados completos.
+
+        Returns:
+            List[Optional[Dict]]: Dados de cada Pokémon na mesma ordem da
+            entrada, com None para os que não foram encontrados.
+
+        Examples:
+            >>> service = PokeAPIService()
+            >>> results = await service.get_pokemon_batch(["1", "pikachu"], fields=["id", "name"])
+            >>> print(results)
+            [{'id': 1, 'name': 'bulbasaur'}, {'id': 25, 'name': 'pikachu'}]
+        """
+        keys = [str(item).strip().lower() for item in pokemon_ids_or_names]
+        semaphore = asyncio.Semaphore(settings.pokeapi_batch_concurrency)
+
+        async def fetch(key: str) -> Optional[Dict]:
+            async with semaphore:
+                if fields:
+                    return await self.get_pokemon_projection(key, fields)
+                return await self.get_pokemon(key)
+
+        unique_keys = list(dict.fromkeys(keys))
+        responses = await asyncio.gather(*(fetch(key) for key in unique_keys))
+        found = dict(zip(unique_keys, responses))
+
+        return [found[key] for key in keys]
 
     async def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> Optional[Dict]:
         """
@@ -104,14 +406,9 @@ class PokeAPIService:
             >>> print(page2["results"][0]["name"])
             'caterpie'
         """
-        try:
-            url = f"{self.base_url}/pokemon"
-            params = {"limit": limit, "offset": offset}
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
-            return None
+        url = f"{self.base_url}/pokemon"
+        params = {"limit": limit, "offset": offset}
+        return await self._get_cached("list", f"{limit}:{offset}", url, params=params)
 
     async def get_pokemon_species(self, pokemon_id_or_name: str) -> Optional[Dict]:
         """
@@ -137,13 +434,8 @@ class PokeAPIService:
             >>> print(species["evolution_chain"]["url"])
             'https://pokeapi.co/api/v2/evolution-chain/10/'
         """
-        try:
-            url = f"{self.base_url}/pokemon-species/{pokemon_id_or_name}"
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
-            return None
+        url = f"{self.base_url}/pokemon-species/{pokemon_id_or_name}"
+        return await self._get_cached("species", str(pokemon_id_or_name).lower(), url)
 
     async def get_pokemon_types(self) -> Optional[List[Dict]]:
         """
@@ -165,14 +457,11 @@ class PokeAPIService:
             >>> print(types[0]["url"])
             'https://pokeapi.co/api/v2/type/1/'
         """
-        try:
-            url = f"{self.base_url}/type"
-            response = await self.client.get(url, params={"limit": 100})
-            response.raise_for_status()
-            data = response.json()
-            return data.get("results", [])
-        except httpx.HTTPError:
+        url = f"{self.base_url}/type"
+        data = await self._get_cached("type", "__all__", url, params={"limit": 100})
+        if data is None:
             return None
+        return data.get("results", [])
 
     async def get_type(self, type_name: str) -> Optional[Dict]:
         """
@@ -201,59 +490,104 @@ class PokeAPIService:
             >>> print(water_type["pokemon"][0]["pokemon"]["name"])
             'squirtle'
         """
-        try:
-            url = f"{self.base_url}/type/{type_name}"
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
+        url = f"{self.base_url}/type/{type_name}"
+        return await self._get_cached("type", str(type_name).lower(), url)
+
+    async def get_pokemon_species_list(self) -> Optional[Dict]:
+        """
+        Busca a lista completa de espécies de Pokémon (nome e URL).
+
+        Returns:
+            Optional[Dict]: Resposta paginada da PokeAPI com todas as espécies
+            em 'results' ou None em caso de erro.
+
+        Examples:
+            >>> service = PokeAPIService()
+            >>> species = await service.get_pokemon_species_list()
+            >>> print(species["results"][0]["name"])
+            'bulbasaur'
+        """
+        url = f"{self.base_url}/pokemon-species"
+        params = {"limit": SPECIES_LIST_LIMIT}
+        return await self._get_cached("list", "species:all", url, params=params)
+
+    async def _ensure_search_index(self) -> Optional[PokemonNameIndex]:
+        """
+        Retorna o índice de nomes, construindo-o na primeira chamada.
+
+        A lista de espécies passa pelo cache, pelo espelho persistente e pela
+        coalescência de chamadas, então o índice é montado uma única vez por
+        processo mesmo com buscas concorrentes.
+
+        Returns:
+            Optional[PokemonNameIndex]: Índice construído ou None se a lista de
+            espécies não puder ser obtida.
+        """
+        if self.search_index.is_built:
+            return self.search_index
+
+        data = await self.get_pokemon_species_list()
+        if not data:
             return None
 
-    async def search_pokemon(self, query: str) -> List[Dict]:
+        if not self.search_index.is_built:
+            self.search_index.build(data.get("results", []))
+        return self.search_index if self.search_index.is_built else None
+
+    async def search_pokemon(self, query: str, limit: int = 10) -> List[Dict]:
         """
-        Realiza busca de Pokémon por nome com fallback para busca direta.
+        Realiza busca de Pokémon por nome exato, prefixo ou aproximação.
         
-        Como a PokeAPI não possui endpoint de busca fuzzy, este método
-        implementa uma busca básica tentando encontrar o Pokémon exato
-        pelo nome. Em caso de não encontrar, retorna lista vazia.
-        
-        Para implementações futuras, pode ser estendido com:
-        - Busca fuzzy (Levenshtein distance)
-        - Busca por prefixo
-        - Cache de resultados populares
+        Como a PokeAPI não possui endpoint de busca, os nomes de todas as
+        espécies são mantidos em um índice local (PokemonNameIndex). Buscas
+        por nome são respondidas pelo índice, sem acessar a rede, com os
+        candidatos ordenados por relevância: nome exato, nomes que começam
+        com o termo e nomes com pequena distância de edição (erros de
+        digitação).
+
+        Buscas por ID numérico, ou quando o índice não puder ser construído,
+        consultam o Pokémon diretamente e retornam seus dados completos.
         
         Args:
-            query (str): Termo de busca (nome do Pokémon).
+            query (str): Termo de busca (nome, parte do nome ou ID do Pokémon).
+            limit (int): Número máximo de candidatos. Padrão: 10.
             
         Returns:
-            List[Dict]: Lista com o Pokémon encontrado (se houver) ou lista vazia.
+            List[Dict]: Candidatos com 'id', 'name', 'url' e 'match' ('exact',
+            'prefix' ou 'fuzzy'), ou lista com o Pokémon encontrado na busca
+            direta. Lista vazia se nada for encontrado.
             
         Examples:
             >>> service = PokeAPIService()
-            >>> # Busca exata
-            >>> results = await service.search_pokemon("pikachu")
-            >>> print(len(results))
-            1
+            >>> # Busca por prefixo
+            >>> results = await service.search_pokemon("pika")
             >>> print(results[0]["name"])
             'pikachu'
-            >>> # Busca com erro de digitação (retorna vazio)
+            >>> # Busca com erro de digitação
             >>> results = await service.search_pokemon("pikachuu")
-            >>> print(results)
-            []
+            >>> print(results[0]["name"], results[0]["match"])
+            pikachu fuzzy
             >>> # Busca case-insensitive
             >>> results = await service.search_pokemon("PIKACHU")
-            >>> print(len(results))
-            1
+            >>> print(results[0]["match"])
+            'exact'
         """
         try:
-            # A PokeAPI não tem busca direta, então fazemos uma busca básica
-            # Primeiro tentamos buscar diretamente
+            normalized = normalize_query(query)
+            if not normalized:
+                return []
+
+            index = None if normalized.isdigit() else await self._ensure_search_index()
+            if index is not None:
+                return [
+                    {**candidate, "url": f"{self.base_url}/pokemon/{candidate['id']}/"}
+                    for candidate in index.search(normalized, limit=limit)
+                ]
+
+            # Busca direta por ID ou quando o índice não está disponível
             pokemon = await self.get_pokemon(query.lower())
             if pokemon:
                 return [pokemon]
-
-            # Se não encontrar, retorna lista vazia
-            # Em uma implementação real, poderíamos fazer busca fuzzy
             return []
         except Exception:
             return []
@@ -272,6 +606,8 @@ class PokeAPIService:
             >>> await service.close()
             >>> # Cliente HTTP está agora fechado
         """
+        for task in list(self._background_tasks):
+            task.cancel()
         await self.client.aclose()
 
 
@@ -286,4 +622,4 @@ class PokeAPIService:
 # 
 # Nota: Para uso em contextos assíncronos longos, considere criar
 # uma nova instância para evitar problemas de estado compartilhado.
-pokeapi_service = PokeAPIService()
+pokeapi_service = PokeAPIService(mirror=pokeapi_mirror if settings.pokeapi_mirror_enabled else None)
@@ -0,0 +1,210 @@
+"""
+Registro dos nomes dos Pokémons por ID.
+
+O ranking, a sincronização pull e os favoritos precisam do nome de cada
+Pokémon a partir do seu ID. Este módulo carrega uma única vez a lista de
+espécies e a lista de Pokémons, que inclui as formas alternativas (IDs
+10001+), pelo PokeAPIService (cache em memória, espelho persistente ou
+PokeAPI, nessa ordem), e guarda os nomes em uma lista indexada pelo ID: cada
+consulta é O(1) e não acessa a rede.
+
+Enquanto as listas não são carregadas (ex: PokeAPI fora do ar na
+inicialização), apenas os Pokémons do mapeamento estático STATIC_NAMES têm
+nome; novas tentativas de carga são feitas a cada RETRY_INTERVAL segundos.
+``get`` devolve ``pokemon_{id}`` para IDs sem nome, para exibição; quem grava
+nomes no banco usa ``resolve``/``resolve_many`` e adia os IDs sem nome.
+
+Example:
+    >>> from app.services.pokemon_name_registry import pokemon_names
+    >>> await pokemon_names.ensure_loaded()
+    >>> pokemon_names.get(25)
+    'pikachu'
+    >>> pokemon_names.get_many([1, 4])
+    {1: 'bulbasaur', 4: 'charmander'}
+    >>> pokemon_names.resolve_many([25, 99999])
+    {25: 'pikachu'}
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.services.pokemon_search_index import id_from_url
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Intervalo mínimo (segundos) entre tentativas de carga que falharam
+RETRY_INTERVAL = 300
+
+# Nomes disponíveis mesmo sem a lista de espécies (Pokémons mais populares)
+STATIC_NAMES = {
+    1: "bulbasaur", 2: "ivysaur", 3: "venusaur", 4: "charmander",
+    5: "charmeleon", 6: "charizard", 7: "squirtle", 8: "wartortle",
+    9: "blastoise", 10: "caterpie", 11: "metapod", 12: "butterfree",
+    13: "weedle", 14: "kakuna", 15: "beedrill", 16: "pidgey",
+    17: "pidgeotto", 18: "pidgeot", 19: "rattata", 20: "raticate",
+    21: "spearow", 22: "fearow", 23: "ekans", 24: "arbok",
+    25: "pikachu", 26: "raichu", 27: "sandshrew", 28: "sandslash",
+    29: "nidoran-f", 30: "nidorina", 31: "nidoqueen", 32: "nidoran-m",
+    33: "nidorino", 34: "nidoking", 35: "clefairy", 36: "clefable",
+    37: "vulpix", 38: "ninetales", 39: "jigglypuff", 40: "wigglytuff",
+    94: "gengar", 130: "gyarados", 144: "articuno", 150: "mewtwo"
+}
+
+
+def fallback_name(pokemon_id: int) -> str:
+    """Nome usado para IDs desconhecidos."""
+    return f"pokemon_{pokemon_id}"
+
+
+class PokemonNameRegistry:
+    """
+    Nomes das espécies em uma lista indexada pelo ID.
+
+    Attributes:
+        names (List[Optional[str]]): Nome de cada ID (posição 0 sem uso).
+    """
+
+    def __init__(self):
+        self.names: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._flights = SingleFlight()
+        self._last_attempt: Optional[float] = None  # Nenhuma carga tentada ainda
+
+    @property
+    def is_loaded(self) -> bool:
+        """Indica se a lista de espécies já foi carregada."""
+        return bool(self._ids)
+
+    def build(self, entries: List[Dict], form_entries: Iterable[Dict] = ()):
+        """
+        Constrói o registro a partir dos resultados da lista de espécies.
+
+        Args:
+            entries: Itens {"name", "url"} retornados por /pokemon-species.
+            form_entries: Itens {"name", "url"} retornados por /pokemon; usados
+                apenas para os IDs que não são espécies (formas alternativas).
+        """
+        ids = {}
+        for entry in entries:
+            pokemon_id = id_from_url(entry.get("url", ""))
+            name = entry.get("name")
+            if name and pokemon_id is not None and pokemon_id > 0:
+                ids[name.lower()] = pokemon_id
+
+        species_ids = set(ids.values())
+        for entry in form_entries:
+            pokemon_id = id_from_url(entry.get("url", ""))
+            name = entry.get("name")
+            if name and pokemon_id is not None and pokemon_id > 0 and pokemon_id not in species_ids:
+                ids[name.lower()] = pokemon_id
+
+        names: List[Optional[str]] = [None] * (max(ids.values(), default=0) + 1)
+        for name, pokemon_id in ids.items():
+            names[pokemon_id] = name
+
+        self.names = names
+        self._ids = ids
+
+    async def ensure_loaded(self) -> bool:
+        """
+        Carrega a lista de espécies, se ainda não estiver carregada.
+
+        Chamadas concorrentes compartilham a mesma carga, e uma carga que
+        falhou só é repetida após RETRY_INTERVAL segundos.
+
+        Returns:
+            True se o registro estiver carregado
+        """
+        if self.is_loaded:
+            return True
+        last_attempt = self._last_attempt
+        if last_attempt is not None and time.monotonic() - last_attempt < RETRY_INTERVAL:
+            return False
+        return await self._flights.do("species", self._load)
+
+    async def _load(self) -> bool:
+        """Busca as listas de espécies e de Pokémons pelo PokeAPIService."""
+        from app.services.pokeapi_service import SPECIES_LIST_LIMIT, pokeapi_service
+
+        self._last_attempt = time.monotonic()
+        try:
+            data = await pokeapi_service.get_pokemon_species_list()
+        except Exception as e:
+            logger.error(f"❌ Erro ao carregar nomes dos Pokémons: {e}")
+            return False
+
+        # As formas alternativas são opcionais: sem elas, apenas ficam sem nome
+        try:
+            forms = await pokeapi_service.get_pokemon_list(limit=SPECIES_LIST_LIMIT)
+        except Exception as e:
+            logger.warning(f"⚠️ Nomes das formas alternativas indisponíveis: {e}")
+            forms = None
+
+        if data:
+            self.build(data.get("results", []), (forms or {}).get("results", []))
+        if self.is_loaded:
+            logger.info(f"📖 Nomes de {len(self._ids)} Pokémons carregados")
+        else:
+            logger.warning("⚠️ Lista de espécies indisponível; usando nomes provisórios")
+        return self.is_loaded
+
+    def resolve(self, pokemon_id: int) -> Optional[str]:
+        """
+        Retorna o nome de um Pokémon, sem nome provisório.
+
+        Args:
+            pokemon_id: ID do Pokémon na PokeAPI
+
+        Returns:
+            Nome carregado da PokeAPI ou de STATIC_NAMES, ou None se o ID
+            ainda não tiver nome
+        """
+        if 0 < pokemon_id < len(self.names) and self.names[pokemon_id]:
+            return self.names[pokemon_id]
+        return STATIC_NAMES.get(pokemon_id)
+
+    def resolve_many(self, pokemon_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Retorna os nomes de vários Pokémons, omitindo os IDs sem nome.
+
+        Args:
+            pokemon_ids: IDs dos Pokémons
+
+        Returns:
+            Mapa ID -> nome apenas dos IDs com nome conhecido
+        """
+        names = {pokemon_id: self.resolve(pokemon_id) for pokemon_id in pokemon_ids}
+        return {pokemon_id: name for pokemon_id, name in names.items() if name}
+
+    def get(self, pokemon_id: int) -> str:
+        """
+        Retorna o nome de um Pokémon, para exibição.
+
+        Args:
+            pokemon_id: ID do Pokémon na PokeAPI
+
+        Returns:
+            Nome do Pokémon ou ``pokemon_{id}`` se o ID for desconhecido
+        """
+        return self.resolve(pokemon_id) or fallback_name(pokemon_id)
+
+    def get_many(self, pokemon_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Retorna os nomes de vários Pokémons.
+
+        Args:
+            pokemon_ids: IDs dos Pokémons
+
+        Returns:
+            Mapa ID -> nome (``pokemon_{id}`` para IDs desconhecidos)
+        """
+        return {pokemon_id: self.get(pokemon_id) for pokemon_id in pokemon_ids}
+
+    def id_for(self, name: str) -> Optional[int]:
+        """Retorna o ID de um Pokémon pelo nome, ou None se desconhecido."""
+        return self._ids.get(name.strip().lower())
+
+
+# Instância global compartilhada por ranking, sincronização e favoritos
+pokemon_names = PokemonNameRegistry()
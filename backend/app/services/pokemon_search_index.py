@@ -0,0 +1,191 @@
+"""
+Índice local de nomes de Pokémons para busca por prefixo e busca aproximada.
+
+Este módulo mantém em memória os nomes de todas as espécies, permitindo que
+buscas parciais ou com erros de digitação sejam respondidas sem acessar a
+PokeAPI:
+- Busca por prefixo com array ordenado e busca binária (bisect)
+- Busca aproximada com índice de trigramas e distância de Levenshtein
+
+Example:
+    >>> from app.services.pokemon_search_index import PokemonNameIndex
+    >>> index = PokemonNameIndex()
+    >>> index.build([{"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon-species/25/"}])
+    >>> index.search("pikachuu")[0]["name"]
+    'pikachu'
+"""
+
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Retorna os trigramas de um texto com marcadores de início e fim."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Calcula a distância de edição entre dois textos com corte antecipado.
+
+    Returns:
+        A distância, ou max_distance + 1 se ela exceder o limite.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return previous[-1]
+
+
+def id_from_url(url: str) -> Optional[int]:
+    """Extrai o ID numérico do final de uma URL da PokeAPI."""
+    try:
+        return int(url.rstrip("/").rsplit("/", 1)[-1])
+    except (ValueError, AttributeError):
+        return None
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza um termo de busca para o formato dos nomes da PokeAPI."""
+    return "-".join(query.strip().lower().split())
+
+
+class PokemonNameIndex:
+    """
+    Índice em memória dos nomes das espécies de Pokémon.
+
+    Attributes:
+        names (List[str]): Nomes ordenados alfabeticamente (busca por prefixo).
+        ids (Dict[str, int]): Mapa nome -> ID.
+        trigrams (Dict[str, Set[str]]): Mapa trigrama -> nomes que o contêm.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    @property
+    def is_built(self) -> bool:
+        """Indica se o índice já foi construído."""
+        return bool(self.names)
+
+    def build(self, entries: List[Dict]):
+        """
+        Constrói o índice a partir dos resultados da lista de espécies.
+
+        Args:
+            entries: Itens {"name", "url"} retornados por /pokemon-species.
+        """
+        ids = {}
+        for entry in entries:
+            pokemon_id = id_from_url(entry.get("url", ""))
+            name = entry.get("name")
+            if name and pokemon_id is not None:
+                ids[name.lower()] = pokemon_id
+
+        trigrams: Dict[str, Set[str]] = {}
+        for name in ids:
+            for trigram in _trigrams(name):
+                trigrams.setdefault(trigram, set()).add(name)
+
+        self.ids = ids
+        self.names = sorted(ids)
+        self.trigrams = trigrams
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Retorna os nomes que começam com o prefixo, ordenados por ID.
+
+        Args:
+            prefix: Prefixo normalizado.
+            limit: Número máximo de resultados.
+        """
+        start = bisect.bisect_left(self.names, prefix)
+        end = bisect.bisect_right(self.names, prefix + "￿")
+        return sorted(self.names[start:end], key=self.ids.__getitem__)[:limit]
+
+    def fuzzy_search(self, query: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Retorna os nomes próximos do termo por distância de edição.
+
+        Apenas nomes que compartilham ao menos um trigrama com o termo são
+        comparados. O limite de distância cresce com o tamanho do termo.
+
+        Args:
+            query: Termo normalizado.
+            limit: Número máximo de resultados.
+
+        Returns:
+            Lista de pares (nome, distância) ordenada por distância e ID.
+        """
+        max_distance = 1 if len(query) <= 4 else 2 if len(query) <= 8 else 3
+
+        candidates: Set[str] = set()
+        for trigram in _trigrams(query):
+            candidates.update(self.trigrams.get(trigram, ()))
+
+        matches = []
+        for name in candidates:
+            distance = _levenshtein(query, name, max_distance)
+            if distance <= max_distance:
+                matches.append((name, distance))
+
+        matches.sort(key=lambda match: (match[1], self.ids[match[0]]))
+        return matches[:limit]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Busca nomes por igualdade, prefixo e aproximação, nessa ordem.
+
+        Args:
+            query: Termo de busca (será normalizado).
+            limit: Número máximo de resultados.
+
+        Returns:
+            Lista de {"id", "name", "match"} ordenada por relevância, onde
+            match é 'exact', 'prefix' ou 'fuzzy'.
+        """
+        query = normalize_query(query)
+        if not query or limit <= 0:
+            return []
+
+        results: List[Dict] = []
+        seen: Set[str] = set()
+
+        def add(name: str, match: str):
+            if name not in seen and len(results) < limit:
+                seen.add(name)
+                results.append({"id": self.ids[name], "name": name, "match": match})
+
+        if query in self.ids:
+            add(query, "exact")
+
+        for name in self.prefix_search(query, limit):
+            add(name, "prefix")
+
+        if len(results) < limit:
+            for name, _ in self.fuzzy_search(query, limit):
+                add(name, "fuzzy")
+
+        return results
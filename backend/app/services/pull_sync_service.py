@@ -1,15 +1,22 @@
 """
 Serviço para sistema pull-based de sincronização.
 O backend puxa dados dos clientes ao invés de receber push.
+
+Os clientes registrados são consultados em paralelo (até
+settings.pull_sync_max_concurrency ao mesmo tempo), cada um com seu prazo, e
+as respostas são processadas na ordem em que chegam: um cliente fora do ar
+atrasa apenas a si mesmo, e o ciclo inteiro termina dentro de
+settings.pull_sync_cycle_timeout, qualquer que seja o número de clientes.
 """
 import httpx
 import asyncio
 import logging
 import time
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.schemas.schemas import (
     ClientSyncData,
     PullRequest,
@@ -20,6 +27,7 @@ from app.schemas.schemas import (
 )
 from app.services.favorite_service import FavoriteService
 from app.services.client_storage_service import ClientStorageService
+from app.services.pokemon_name_registry import pokemon_names
 from app.services.ranking_service import RankingService
 
 logger = logging.getLogger(__name__)
@@ -29,13 +37,22 @@ class PullSyncService:
     """Serviço para puxar dados dos clientes."""
 
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=settings.pull_sync_max_concurrency,
+                max_keepalive_connections=settings.pull_sync_max_concurrency
+            )
+        )
         self.registered_clients: Dict[str, ClientRegistration] = {}
 
         # Inicializar serviços de storage e ranking
         self.storage_service = ClientStorageService()
         self.ranking_service = RankingService(self.storage_service)
 
+        # Versão (last_updated) do storage refletida no ranking e nos favoritos
+        self._ranked_storage_version: Optional[str] = None
+
     async def register_client(self, registration: ClientRegistration) -> bool:
         """Registra um novo cliente para sincronização."""
         try:
@@ -58,9 +75,15 @@ class PullSyncService:
             return False
 
     async def unregister_client(self, user_id: str) -> bool:
-        """Remove cliente do registro."""
+        """
+        Remove cliente do registro.
+
+        As capturas do cliente também saem do storage; o próximo ciclo de
+        sincronização percebe a mudança e atualiza o ranking.
+        """
         if user_id in self.registered_clients:
             del self.registered_clients[user_id]
+            self.storage_service.remove_client(user_id)
             logger.info(f"🗑️  Cliente removido: {user_id}")
             return True
         return False
@@ -69,7 +92,66 @@ class PullSyncService:
         """Retorna lista de clientes registrados."""
         return list(self.registered_clients.values())
 
-    async def pull_client_data(self, client_url: str, since: Optional[datetime] = None) -> Optional[ClientSyncData]:
+    async def _pull_from_clients(
+        self,
+        fetch: Callable[[ClientRegistration, float], Awaitable[Any]],
+        client_timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, ClientRegistration, Any, Optional[Exception]]]:
+        """
+        Consulta todos os clientes registrados em paralelo.
+
+        No máximo settings.pull_sync_max_concurrency consultas ficam em
+        andamento ao mesmo tempo. Cada cliente tem até ``client_timeout``
+        segundos para responder, sem ultrapassar o prazo do ciclo
+        (settings.pull_sync_cycle_timeout); clientes que ainda aguardavam
+        vaga quando o ciclo expira falham sem serem consultados.
+
+        Args:
+            fetch: Corrotina que consulta um cliente: fetch(registration, timeout)
+            client_timeout: Prazo por cliente (padrão: settings.pull_sync_client_timeout)
+
+        Yields:
+            Tuplas (user_id, registration, resultado, erro), na ordem em que
+            as consultas terminam; ``erro`` é None quando a consulta funcionou
+        """
+        clients = list(self.registered_clients.items())
+        if not clients:
+            return
+
+        client_timeout = client_timeout or settings.pull_sync_client_timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.pull_sync_cycle_timeout
+        semaphore = asyncio.Semaphore(settings.pull_sync_max_concurrency)
+
+        async def pull(user_id: str, registration: ClientRegistration):
+            async with semaphore:
+                timeout = min(client_timeout, deadline - loop.time())
+                try:
+                    if timeout <= 0:
+                        raise asyncio.TimeoutError()
+                    result = await asyncio.wait_for(fetch(registration, timeout), timeout)
+                    return user_id, registration, result, None
+                except (asyncio.TimeoutError, httpx.TimeoutException):
+                    logger.warning(f"⏰ Timeout ao consultar cliente: {registration.client_url}")
+                    return user_id, registration, None, TimeoutError(f"Cliente não respondeu em {client_timeout:.0f}s")
+                except Exception as e:
+                    return user_id, registration, None, e
+
+        tasks = [asyncio.create_task(pull(user_id, registration)) for user_id, registration in clients]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Interrompido pelo chamador: cancela as consultas restantes
+            for task in tasks:
+                task.cancel()
+
+    async def pull_client_data(
+        self,
+        client_url: str,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> Optional[ClientSyncData]:
         """Puxa dados de um cliente específico."""
         try:
             params = {}
@@ -81,7 +163,7 @@ class PullSyncService:
             response = await self.http_client.get(
                 f"{client_url}/api/client/sync-data",
                 params=params,
-                timeout=15.0
+                timeout=timeout or settings.pull_sync_client_timeout
             )
 
             if response.status_code == 200:
@@ -185,10 +267,16 @@ class PullSyncService:
         failed_clients = []
         errors = []
 
-        for user_id, registration in self.registered_clients.items():
+        acknowledgements = []
+
+        # Puxar dados dos clientes em paralelo, processando conforme chegam
+        pulls = self._pull_from_clients(
+            lambda registration, timeout: self.pull_client_data(registration.client_url, since, timeout)
+        )
+        async for user_id, registration, sync_data, error in pulls:
             try:
-                # Puxar dados do cliente
-                sync_data = await self.pull_client_data(registration.client_url, since)
+                if error is not None:
+                    raise error
 
                 if sync_data:
                     # Processar dados
@@ -196,10 +284,9 @@ class PullSyncService:
 
                     # Confirmar sincronização se houve dados processados
                     if result["capture_ids"]:
-                        await self.acknowledge_sync(
-                            registration.client_url,
-                            result["capture_ids"]
-                        )
+                        acknowledgements.append(asyncio.create_task(
+                            self.acknowledge_sync(registration.client_url, result["capture_ids"])
+                        ))
 
                     clients_processed += 1
                     total_captures += result["processed"]
@@ -215,6 +302,9 @@ class PullSyncService:
                 failed_clients.append(registration.client_url)
                 logger.error(error_msg)
 
+        # Confirmações enviadas em paralelo durante o processamento
+        await asyncio.gather(*acknowledgements)
+
         processing_time = time.time() - start_time
 
         logger.info(f"🎯 Sync concluído: {clients_processed} clientes, {total_captures} capturas, {processing_time:.2f}s")
@@ -237,17 +327,15 @@ class PullSyncService:
         """Remove clientes inativos."""
         inactive_clients = []
 
-        for user_id, registration in self.registered_clients.items():
-            try:
-                response = await self.http_client.get(
-                    f"{registration.client_url}/api/client/health",
-                    timeout=5.0
-                )
-
-                if response.status_code != 200:
-                    inactive_clients.append(user_id)
-
-            except Exception:
+        checks = self._pull_from_clients(
+            lambda registration, timeout: self.http_client.get(
+                f"{registration.client_url}/api/client/health",
+                timeout=timeout
+            ),
+            client_timeout=5.0
+        )
+        async for user_id, registration, response, error in checks:
+            if error is not None or response.status_code != 200:
                 inactive_clients.append(user_id)
 
         # Remover clientes inativos
@@ -273,15 +361,14 @@ class PullSyncService:
 
         # 1. Coletar todos os Pokémons capturados de todos os clientes
         all_client_captures = set()  # Set de (user_id, pokemon_id)
+        capture_snapshot = {}  # Capturas de cada cliente neste ciclo, para os nomes
         failed_clients = []
 
-        for user_id, registration in self.registered_clients.items():
+        # Obter TODOS os dados dos clientes (não apenas pendentes)
+        async for user_id, registration, response, error in self._pull_from_clients(self._get_all_captures):
             try:
-                # Obter TODOS os dados do cliente (não apenas pendentes)
-                response = await self.http_client.get(
-                    f"{registration.client_url}/api/client/all-captures",
-                    timeout=15.0
-                )
+                if error is not None:
+                    raise error
 
                 if response.status_code == 200:
                     client_data = response.json()
@@ -293,6 +380,7 @@ class PullSyncService:
 
                     # Ordenar capturas por timestamp
                     sorted_captures = sorted(captures, key=lambda c: c.get('timestamp', ''))
+                    capture_snapshot[user_id] = self._index_captures(sorted_captures)
 
                     for capture in sorted_captures:
                         pokemon_id = capture['pokemon_id']
@@ -343,10 +431,12 @@ class PullSyncService:
         removed_count = 0
 
         # 4. Adicionar Pokémons que estão nos clientes mas não no banco
+        if to_add:
+            await pokemon_names.ensure_loaded()
         for user_id, pokemon_id in to_add:
             try:
-                # Encontrar nome do Pokémon (buscar nos dados dos clientes)
-                pokemon_name = await self._get_pokemon_name_from_clients(pokemon_id)
+                # Encontrar nome do Pokémon (nos dados dos clientes já consultados)
+                pokemon_name = await self._get_pokemon_name_from_clients(pokemon_id, capture_snapshot)
                 if pokemon_name:
                     fav_create = FavoritePokemonCreate(
                         user_id=user_id,
@@ -407,13 +497,11 @@ class PullSyncService:
             all_captured_pokemons = set()
             client_errors = []
 
-            for user_id, registration in self.registered_clients.items():
+            # Buscar TODAS as capturas dos clientes (não apenas pendentes)
+            async for user_id, registration, response, error in self._pull_from_clients(self._get_all_captures):
                 try:
-                    # Buscar TODAS as capturas do cliente (não apenas pendentes)
-                    response = await self.http_client.get(
-                        f"{registration.client_url}/api/client/all-captures",
-                        timeout=15.0
-                    )
+                    if error is not None:
+                        raise error
 
                     if response.status_code == 200:
                         data = response.json()
@@ -449,11 +537,17 @@ class PullSyncService:
             removed_count = 0
 
             # Adicionar pokémons que estão nos clientes mas não no banco
-            for pokemon_id in to_add:
+            if to_add:
+                await pokemon_names.ensure_loaded()
+            names = pokemon_names.resolve_many(to_add)
+            unresolved = to_add - names.keys()
+            if unresolved:
+                # Adiados para a próxima sincronização, em vez de gravar nomes provisórios
+                logger.warning(
+                    f"⏳ {len(unresolved)} pokémons sem nome adiados: {sorted(unresolved)}"
+                )
+            for pokemon_id, pokemon_name in names.items():
                 try:
-                    # Buscar nome do pokémon (simplificado - poderia buscar da PokeAPI)
-                    pokemon_name = f"pokemon_{pokemon_id}"  # Placeholder
-
                     fav_create = FavoritePokemonCreate(
                         user_id=1,
                         pokemon_id=pokemon_id,
@@ -488,6 +582,7 @@ class PullSyncService:
                 "total_in_database": len(current_pokemon_ids),
                 "added_to_database": added_count,
                 "removed_from_database": removed_count,
+                "unresolved_count": len(unresolved),
                 "processing_time": processing_time
             }
 
@@ -589,56 +684,98 @@ class PullSyncService:
                 "processing_time": time.time() - start_time
             }
 
-    async def _get_pokemon_name_from_clients(self, pokemon_id: int) -> Optional[str]:
-        """Busca o nome do Pokémon nos dados dos clientes."""
-        for user_id, registration in self.registered_clients.items():
-            try:
-                response = await self.http_client.get(
-                    f"{registration.client_url}/api/client/all-captures",
-                    timeout=10.0
-                )
+    async def _get_sync_data(self, registration: ClientRegistration, timeout: float) -> httpx.Response:
+        """Consulta as capturas de um cliente posteriores ao seu cursor."""
+        params = {}
+        cursor = self.storage_service.get_sync_cursor(registration.user_id)
+        if cursor is not None:
+            params["since"] = cursor
+
+        return await self.http_client.get(
+            f"{registration.client_url}/api/client/sync-data",
+            params=params,
+            timeout=timeout
+        )
 
-                if response.status_code == 200:
-                    client_data = response.json()
-                    captures = client_data.get('captures', [])
+    async def _get_all_captures(self, registration: ClientRegistration, timeout: float) -> httpx.Response:
+        """Consulta todas as capturas de um cliente."""
+        return await self.http_client.get(
+            f"{registration.client_url}/api/client/all-captures",
+            timeout=timeout
+        )
+
+    @staticmethod
+    def _index_captures(captures: List[Dict]) -> Dict[int, Dict]:
+        """Indexa as capturas de um cliente por pokemon_id (a última prevalece)."""
+        return {capture['pokemon_id']: capture for capture in captures if 'pokemon_id' in capture}
+
+    async def _fetch_capture_snapshot(self) -> Dict[str, Dict[int, Dict]]:
+        """
+        Consulta todas as capturas de cada cliente uma única vez.
 
-                    for capture in captures:
-                        if capture.get('pokemon_id') == pokemon_id:
-                            return capture.get('pokemon_name')
+        Returns:
+            Capturas indexadas por cliente e pokemon_id: {user_id: {pokemon_id: captura}}
+        """
+        snapshot = {}
+        async for user_id, registration, response, error in self._pull_from_clients(self._get_all_captures):
+            if error is None and response.status_code == 200:
+                snapshot[user_id] = self._index_captures(response.json().get('captures', []))
+        return snapshot
+
+    async def _get_pokemon_name_from_clients(
+        self,
+        pokemon_id: int,
+        snapshot: Optional[Dict[str, Dict[int, Dict]]] = None
+    ) -> Optional[str]:
+        """
+        Busca o nome do Pokémon nos dados dos clientes.
 
-            except Exception:
-                continue
+        Args:
+            pokemon_id: ID do Pokémon
+            snapshot: Capturas dos clientes já consultadas no ciclo atual
+                (ver _fetch_capture_snapshot); sem ele, os clientes são consultados
 
-        return f"pokemon_{pokemon_id}"  # Fallback
+        Returns:
+            Nome do Pokémon informado pelos clientes ou, se nenhum cliente o
+            tiver, o nome do PokemonNameRegistry (None se ainda não tiver nome)
+        """
+        if snapshot is None:
+            snapshot = await self._fetch_capture_snapshot()
+
+        # Ordem de registro dos clientes, independente da ordem das respostas
+        for user_id in self.registered_clients:
+            capture = snapshot.get(user_id, {}).get(pokemon_id)
+            if capture is not None:
+                return capture.get('pokemon_name')
+
+        return pokemon_names.resolve(pokemon_id)  # Fallback
 
     async def sync_with_storage_system(self, db: Session) -> Dict[str, any]:
         """
-        Sincronização completa usando o novo sistema de storage.
+        Sincronização incremental usando o novo sistema de storage.
 
-        1. Coleta dados de todos os clientes
-        2. Atualiza o client_storage com os dados consolidados
-        3. Atualiza o ranking baseado no storage
+        1. Puxa de cada cliente apenas as capturas posteriores ao seu cursor
+        2. Aplica as alterações no client_storage e avança os cursores
+        3. Atualiza o ranking baseado no storage, se o storage mudou
         4. Atualiza a tabela de favoritos para manter compatibilidade
+
+        O storage nunca é limpo durante o ciclo: clientes que não respondem
+        mantêm o último estado sincronizado, e um ciclo sem capturas novas
+        não reconstrói ranking nem favoritos.
         """
         start_time = time.time()
         logger.info("🔄 Iniciando sincronização com sistema de storage")
 
-        # LIMPA O STORAGE consolidado antes de processar os clientes
-        self.storage_service.clear_storage()
-
         clients_processed = 0
         failed_clients = []
         total_captures = 0
 
         try:
-            # 1. Coletar dados de todos os clientes
-            for user_id, registration in self.registered_clients.items():
+            # 1. Coletar as capturas novas de todos os clientes
+            async for user_id, registration, response, error in self._pull_from_clients(self._get_sync_data):
                 try:
-                    # Buscar capturas pendentes do cliente (não todas)
-                    response = await self.http_client.get(
-                        f"{registration.client_url}/api/client/sync-data",
-                        timeout=15.0
-                    )
+                    if error is not None:
+                        raise error
 
                     if response.status_code == 200:
                         client_data = response.json()
@@ -648,46 +785,36 @@ class PullSyncService:
                         # Ordenar por timestamp para processar em ordem cronológica
                         sorted_captures = sorted(captures, key=lambda c: c.get('timestamp', ''))
 
-                        # Determinar estado final de cada pokémon
+                        # Determinar estado final de cada pokémon alterado
                         pokemon_states = {}
                         for capture in sorted_captures:
                             pokemon_id = capture['pokemon_id']
                             metadata = capture.get('metadata', {})
                             is_removed = metadata.get('removed', False)
+                            action = capture.get('action')
 
-                            if capture.get('action') in ('capture', 'favorite'):
+                            if action in ('remove', 'unfavorite'):
+                                pokemon_states[pokemon_id] = False  # Removido
+                            elif action in ('capture', 'favorite'):
                                 if is_removed:
                                     pokemon_states[pokemon_id] = False  # Removido
                                 else:
                                     pokemon_states[pokemon_id] = True   # Capturado
 
-                        # Criar lista apenas com pokémons ativos (capturados)
-                        active_captures = []
-                        for pokemon_id, is_captured in pokemon_states.items():
-                            if is_captured:
-                                # Buscar nome do pokémon
-                                pokemon_name = next(
-                                    (c['pokemon_name'] for c in captures if c['pokemon_id'] == pokemon_id),
-                                    f"pokemon_{pokemon_id}"
-                                )
-                                active_captures.append({
-                                    'pokemon_id': pokemon_id,
-                                    'pokemon_name': pokemon_name,
-                                    'timestamp': datetime.now().isoformat()
-                                })
-
-                        # Atualizar storage do cliente
-                        storage_stats = self.storage_service.update_client_captures(
-                            user_id, active_captures
+                        # Aplicar alterações e avançar o cursor do cliente
+                        cursor = sorted_captures[-1].get('timestamp') if sorted_captures else None
+                        storage_stats = self.storage_service.apply_client_changes(
+                            user_id, pokemon_states, cursor
                         )
 
                         clients_processed += 1
-                        total_captures += len(active_captures)
+                        total_captures += len(captures)
 
-                        logger.info(
-                            f"✅ Cliente {user_id}: {len(active_captures)} capturas ativas "
-                            f"(+{storage_stats['added_count']}, -{storage_stats['removed_count']})"
-                        )
+                        if captures:
+                            logger.info(
+                                f"✅ Cliente {user_id}: {len(captures)} capturas novas "
+                                f"(+{storage_stats['added_count']}, -{storage_stats['removed_count']})"
+                            )
 
                     else:
                         logger.warning(f"❌ Cliente {user_id} retornou erro {response.status_code}")
@@ -697,11 +824,24 @@ class PullSyncService:
                     logger.error(f"❌ Erro ao processar cliente {user_id}: {e}")
                     failed_clients.append(user_id)
 
-            # 2. Atualizar ranking baseado no storage
-            ranking_stats = self.ranking_service.update_ranking_from_storage(db)
-
-            # 3. Atualizar tabela de favoritos para manter compatibilidade
-            favorites_stats = await self._sync_favorites_with_storage(db)
+            # 2 e 3. Atualizar ranking e favoritos apenas se o storage mudou
+            # desde a última atualização (capturas novas ou storage limpo)
+            storage_version = self.storage_service.get_storage_stats()["last_updated"]
+            storage_changed = storage_version != self._ranked_storage_version
+            ranking_stats = None
+            favorites_stats = None
+
+            if storage_changed:
+                await pokemon_names.ensure_loaded()
+                ranking_stats = self.ranking_service.update_ranking_from_storage(db)
+                favorites_stats = await self._sync_favorites_with_storage(db)
+                # Pokémons sem nome foram adiados: enquanto a lista de nomes não
+                # for carregada, o próximo ciclo tenta de novo
+                unresolved = (
+                    ranking_stats.get("unresolved_count") or favorites_stats.get("unresolved_count")
+                )
+                if not unresolved or pokemon_names.is_loaded:
+                    self._ranked_storage_version = storage_version
 
             processing_time = time.time() - start_time
 
@@ -710,6 +850,7 @@ class PullSyncService:
                 "clients_processed": clients_processed,
                 "failed_clients": failed_clients,
                 "total_captures": total_captures,
+                "storage_changed": storage_changed,
                 "ranking_stats": ranking_stats,
                 "favorites_stats": favorites_stats,
                 "storage_stats": self.storage_service.get_storage_stats(),
@@ -718,8 +859,8 @@ class PullSyncService:
 
             logger.info(
                 f"🎯 Sincronização com storage concluída: "
-                f"{clients_processed} clientes, {total_captures} capturas, "
-                f"{ranking_stats['inserted_count']} ranking entries, "
+                f"{clients_processed} clientes, {total_captures} capturas novas, "
+                f"{ranking_stats['inserted_count'] if ranking_stats else 0} ranking entries, "
                 f"{processing_time:.2f}s"
             )
 
@@ -755,13 +896,13 @@ class PullSyncService:
 
         # Adicionar favoritos baseados no storage
         pokemon_counts = self.storage_service.get_pokemon_counts()
+        names = pokemon_names.resolve_many(pokemon_counts)
+        unresolved_count = len(pokemon_counts) - len(names)
         added_count = 0
 
-        for pokemon_id, count in pokemon_counts.items():
+        for pokemon_id, pokemon_name in names.items():
             try:
                 # Adicionar como favorito (representa que foi capturado)
-                pokemon_name = self.ranking_service._get_pokemon_name(pokemon_id)
-
                 fav_create = FavoritePokemonCreate(
                     user_id=1,  # User ID fixo por enquanto
                     pokemon_id=pokemon_id,
@@ -775,10 +916,13 @@ class PullSyncService:
                 logger.error(f"Erro ao adicionar favorito {pokemon_id}: {e}")
 
         logger.info(f"✅ Favoritos sincronizados: -{removed_count}, +{added_count}")
+        if unresolved_count:
+            logger.warning(f"⏳ {unresolved_count} pokémons sem nome adiados nos favoritos")
 
         return {
             "removed_count": removed_count,
             "added_count": added_count,
+            "unresolved_count": unresolved_count,
             "total_favorites": added_count
         }
 
@@ -787,12 +931,14 @@ class PullSyncService:
         Retorna ranking baseado no storage (sem acessar banco de dados).
         """
         ranking_data = self.storage_service.get_ranking_data(limit)
+        await pokemon_names.ensure_loaded()
+        names = pokemon_names.get_many(pokemon_id for pokemon_id, _ in ranking_data)
 
         return [
             {
                 "position": i + 1,
                 "pokemon_id": pokemon_id,
-                "pokemon_name": self.ranking_service._get_pokemon_name(pokemon_id),
+                "pokemon_name": names[pokemon_id],
                 "capture_count": count
             }
             for i, (pokemon_id, count) in enumerate(ranking_data)
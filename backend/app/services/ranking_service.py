@@ -13,6 +13,7 @@ from datetime import datetime
 
 from app.models.models import PokemonRanking
 from app.services.client_storage_service import ClientStorageService
+from app.services.pokemon_name_registry import pokemon_names
 
 logger = logging.getLogger(__name__)
 
@@ -55,10 +56,15 @@ class RankingService:
                 - deleted_count: Número de entradas removidas
                 - inserted_count: Número de entradas inseridas
                 - errors_count: Número de erros durante inserção
+                - unresolved_count: Pokémons adiados por ainda não terem nome
 
         Note:
             Esta operação é custosa pois reconstrói todo o ranking.
             Use com moderação em sistemas com muitos dados.
+
+            Pokémons sem nome no PokemonNameRegistry não são gravados com
+            nome provisório: ficam fora do ranking até a próxima atualização.
+            Chame ``pokemon_names.ensure_loaded()`` antes desta operação.
         """
         logger.info("🏆 Iniciando atualização do ranking baseado no storage")
 
@@ -74,11 +80,16 @@ class RankingService:
         # Insere novas entradas baseadas nos dados consolidados
         inserted_count = 0
         errors_count = 0
+        names = pokemon_names.resolve_many(pokemon_id for pokemon_id, _ in ranking_data)
+        unresolved = [pokemon_id for pokemon_id, _ in ranking_data if pokemon_id not in names]
+        if unresolved:
+            logger.warning(f"⏳ {len(unresolved)} pokémons sem nome adiados no ranking")
 
         for pokemon_id, capture_count in ranking_data:
+            if pokemon_id not in names:
+                continue
             try:
-                # Obtém nome do Pokémon (pode ser otimizado com cache futuro)
-                pokemon_name = self._get_pokemon_name(pokemon_id)
+                pokemon_name = names[pokemon_id]
 
                 # Cria nova entrada de ranking
                 ranking_entry = PokemonRanking(
@@ -111,6 +122,7 @@ class RankingService:
             "deleted_count": deleted_count,
             "inserted_count": inserted_count,
             "errors_count": errors_count,
+            "unresolved_count": len(unresolved),
             "total_unique_pokemons": len(ranking_data),
             "top_pokemon_id": ranking_data[0][0] if ranking_data else None,
             "top_pokemon_count": ranking_data[0][1] if ranking_data else 0
@@ -188,6 +200,8 @@ class RankingService:
                     "database": None
                 })
 
+        names = pokemon_names.get_many(pokemon_id for pokemon_id, _ in storage_ranking)
+
         return {
             "database_ranking": [
                 {
@@ -204,7 +218,7 @@ class RankingService:
                     "position": i + 1,
                     "pokemon_id": pokemon_id,
                     "capture_count": count,
-                    "pokemon_name": self._get_pokemon_name(pokemon_id)
+                    "pokemon_name": names[pokemon_id]
                 }
                 for i, (pokemon_id, count) in enumerate(storage_ranking)
             ],
@@ -217,34 +231,17 @@ class RankingService:
         """
         Obtém o nome do Pokémon baseado no seu ID.
 
-        Implementação temporária usando mapeamento estático dos Pokémons
-        mais comuns. Em produção, deveria usar cache ou busca na API/database.
-
         Args:
             pokemon_id: ID do Pokémon na PokeAPI
 
         Returns:
             str: Nome do Pokémon ou fallback "pokemon_{id}"
 
-        TODO:
-            Implementar cache persistente ou integração com PokeAPI
-            para obter nomes de todos os Pokémons dinamicamente.
+        Note:
+            Os nomes vêm do PokemonNameRegistry; para vários IDs, prefira
+            ``pokemon_names.get_many``.
         """
-        # Mapeamento estático dos Pokémons mais populares
-        pokemon_names = {
-            1: "bulbasaur", 2: "ivysaur", 3: "venusaur", 4: "charmander",
-            5: "charmeleon", 6: "charizard", 7: "squirtle", 8: "wartortle",
-            9: "blastoise", 10: "caterpie", 11: "metapod", 12: "butterfree",
-            13: "weedle", 14: "kakuna", 15: "beedrill", 16: "pidgey",
-            17: "pidgeotto", 18: "pidgeot", 19: "rattata", 20: "raticate",
-            21: "spearow", 22: "fearow", 23: "ekans", 24: "arbok",
-            25: "pikachu", 26: "raichu", 27: "sandshrew", 28: "sandslash",
-            29: "nidoran-f", 30: "nidorina", 31: "nidoqueen", 32: "nidoran-m",
-            33: "nidorino", 34: "nidoking", 35: "clefairy", 36: "clefable",
-            37: "vulpix", 38: "ninetales", 39: "jigglypuff", 40: "wigglytuff",
-            94: "gengar", 130: "gyarados", 144: "articuno", 150: "mewtwo"
-        }
-        return pokemon_names.get(pokemon_id, f"pokemon_{pokemon_id}")
+        return pokemon_names.get(pokemon_id)
 
     def force_ranking_rebuild(self, db: Session) -> Dict[str, int]:
         """
@@ -0,0 +1,225 @@
+"""
+Sprite sheets (atlas) das imagens dos Pokémons para as páginas em grade.
+
+Uma página da Pokédex faz uma requisição de imagem por Pokémon. Este
+serviço empacota as imagens de um intervalo de IDs (ou de uma lista) em uma
+única imagem, com um mapa JSON das coordenadas de cada Pokémon, reduzindo
+dezenas de requisições a duas (mapa e atlas).
+
+Os atlas são montados a partir das imagens já cacheadas pelo
+ImageCacheService (índice em memória, sem downloads), no pool de processos,
+e guardados em disco com remoção LRU. O nome de cada atlas é derivado dos
+IDs, dos parâmetros e do ETag de cada imagem: quando uma imagem muda ou uma
+imagem ausente é baixada, o próximo pedido gera um novo atlas.
+
+Example:
+    >>> from app.services.sprite_atlas_service import SpriteAtlasService
+    >>> atlas = await SpriteAtlasService(image_cache_service).get_atlas(range(1, 51))
+    >>> atlas["sprites"]["25"]
+    {'x': 384, 'y': 192, 'w': 96, 'h': 96}
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from app.core.config import settings
+from app.services.image_cache_index import ImageIndexEntry
+from app.services.image_cache_service import ImageCacheService
+from app.services.image_process_pool import image_process_pool
+from app.services.image_variant_cache import ImageVariantCache
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Atlas sendo montados, para que requisições concorrentes pelo mesmo atlas
+# executem uma única composição
+_atlas_flights = SingleFlight()
+
+
+def compose_atlas(
+    sprites: List[Tuple[int, str]],
+    cell_size: int,
+    columns: int,
+    atlas_path: str,
+    image_format: str
+) -> Dict[str, Dict[str, int]]:
+    """
+    Monta o atlas (executada no pool de processos).
+
+    Cada imagem é reduzida para caber em uma célula quadrada, mantendo a
+    proporção, e centralizada nela. As células são dispostas em linhas de
+    ``columns`` imagens, na ordem recebida.
+
+    Args:
+        sprites: Pares (pokemon_id, caminho da imagem)
+        cell_size: Lado da célula em pixels
+        columns: Células por linha
+        atlas_path: Caminho do atlas gerado
+        image_format: Formato do atlas ('avif', 'webp', 'png')
+
+    Returns:
+        Coordenadas de cada Pokémon no atlas: {id: {x, y, w, h}}
+    """
+    rows = math.ceil(len(sprites) / columns)
+    atlas = Image.new('RGBA', (columns * cell_size, rows * cell_size), (0, 0, 0, 0))
+    coordinates = {}
+
+    for position, (pokemon_id, path) in enumerate(sprites):
+        with Image.open(path) as img:
+            sprite = img.convert('RGBA')
+        sprite.thumbnail((cell_size, cell_size), Image.Resampling.LANCZOS)
+
+        x = (position % columns) * cell_size + (cell_size - sprite.width) // 2
+        y = (position // columns) * cell_size + (cell_size - sprite.height) // 2
+        atlas.paste(sprite, (x, y), sprite)
+        coordinates[str(pokemon_id)] = {"x": x, "y": y, "w": sprite.width, "h": sprite.height}
+
+    save_kwargs = {'format': image_format.upper(), 'optimize': True}
+    if image_format in ('webp', 'avif'):
+        save_kwargs['quality'] = 90
+    if image_format == 'webp':
+        save_kwargs['method'] = 6
+
+    tmp_path = f"{atlas_path}.{os.getpid()}.part"
+    try:
+        atlas.save(tmp_path, **save_kwargs)
+        os.replace(tmp_path, atlas_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return coordinates
+
+
+class SpriteAtlasService:
+    """
+    Geração e cache dos atlas de imagens dos Pokémons.
+    """
+
+    def __init__(self, cache_service: ImageCacheService, atlas_dir: str = "app/data/atlases"):
+        """
+        Args:
+            cache_service: ImageCacheService com as imagens cacheadas
+            atlas_dir: Diretório dos atlas gerados
+        """
+        self.cache_service = cache_service
+        self.cache = ImageVariantCache(atlas_dir, settings.sprite_atlas_cache_max_bytes)
+        self.max_sprites = settings.sprite_atlas_max_sprites
+        self.columns = settings.sprite_atlas_columns
+
+    def _atlas_name(self, sprites: List[Tuple[int, str]], image_type: str, cell_size: int) -> str:
+        """Nome do atlas: hash dos IDs, parâmetros e ETags das imagens."""
+        digest = hashlib.sha256(f"{image_type}|{cell_size}|{self.columns}".encode())
+        for pokemon_id, etag in sprites:
+            digest.update(f"|{pokemon_id}:{etag}".encode())
+        return digest.hexdigest()[:32]
+
+    async def get_atlas(
+        self,
+        pokemon_ids: Iterable[int],
+        image_type: str = 'sprite',
+        cell_size: int = 96,
+        image_format: str = 'webp'
+    ) -> Optional[Dict]:
+        """
+        Retorna o mapa de coordenadas de um atlas, gerando-o se necessário.
+
+        Args:
+            pokemon_ids: IDs dos Pokémons, na ordem do atlas
+            image_type: Tipo de imagem
+            cell_size: Lado da célula em pixels
+            image_format: Formato do atlas ('avif', 'webp', 'png')
+
+        Returns:
+            Mapa do atlas (file, image_type, cell_size, columns, width,
+            height, sprites e missing), ou None se nenhuma imagem estiver
+            cacheada
+
+        Raises:
+            ValueError: Se houver mais IDs que settings.sprite_atlas_max_sprites
+        """
+        pokemon_ids = list(dict.fromkeys(pokemon_ids))
+        if len(pokemon_ids) > self.max_sprites:
+            raise ValueError(f"Máximo de {self.max_sprites} Pokémons por atlas")
+
+        entries, missing = [], []
+        for pokemon_id in pokemon_ids:
+            entry = self.cache_service.index.get(pokemon_id, image_type)
+            if entry is None:
+                missing.append(pokemon_id)
+            else:
+                entries.append((pokemon_id, entry))
+
+        if not entries:
+            return None
+
+        name = self._atlas_name([(pokemon_id, entry.etag) for pokemon_id, entry in entries], image_type, cell_size)
+        atlas_file = f"{name}.{image_format}"
+        map_file = f"{name}.{image_format}.json"
+
+        if self.cache.get(atlas_file) and self.cache.get(map_file):
+            with open(self.cache.path_for(map_file), encoding='utf-8') as f:
+                atlas_map = json.load(f)
+        else:
+            atlas_map = await _atlas_flights.do(
+                (str(self.cache.directory.resolve()), atlas_file),
+                lambda: self._build_atlas(entries, image_type, cell_size, image_format, atlas_file, map_file)
+            )
+
+        return {**atlas_map, "missing": missing}
+
+    async def _build_atlas(
+        self,
+        entries: List[Tuple[int, ImageIndexEntry]],
+        image_type: str,
+        cell_size: int,
+        image_format: str,
+        atlas_file: str,
+        map_file: str
+    ) -> Dict:
+        """Monta o atlas no pool de processos e grava o mapa de coordenadas."""
+        columns = min(self.columns, len(entries))
+        coordinates = await image_process_pool.run(
+            compose_atlas,
+            [(pokemon_id, entry.path) for pokemon_id, entry in entries],
+            cell_size,
+            columns,
+            self.cache.path_for(atlas_file),
+            image_format
+        )
+
+        atlas_map = {
+            "file": atlas_file,
+            "image_type": image_type,
+            "cell_size": cell_size,
+            "columns": columns,
+            "width": columns * cell_size,
+            "height": math.ceil(len(entries) / columns) * cell_size,
+            "sprites": coordinates
+        }
+        map_path = self.cache.path_for(map_file)
+        with open(f"{map_path}.part", 'w', encoding='utf-8') as f:
+            json.dump(atlas_map, f)
+        os.replace(f"{map_path}.part", map_path)
+
+        self.cache.put(atlas_file, os.path.getsize(self.cache.path_for(atlas_file)))
+        self.cache.put(map_file, os.path.getsize(map_path))
+        logger.info(f"🧩 Atlas gerado: {len(entries)} imagens ({image_type}, {cell_size}px)")
+        return atlas_map
+
+    def get_atlas_path(self, atlas_file: str) -> Optional[str]:
+        """
+        Retorna o caminho de um atlas gerado.
+
+        Args:
+            atlas_file: Nome do arquivo do atlas (campo ``file`` do mapa)
+
+        Returns:
+            Caminho do atlas ou None se não estiver no cache
+        """
+        return self.cache.get(atlas_file)
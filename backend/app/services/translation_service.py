@@ -1,48 +1,68 @@
-import os
-import json
+from functools import lru_cache
+from typing import Dict, List
 from sqlalchemy.orm import Session
 from app.models.models import PokemonFlavorTranslation
+from app.services.flavor_store import get_flavor_store
 
-# Carregar traduções manuais para PT-BR
-FLAVORS_PTBR_PATH = os.path.join(os.path.dirname(__file__), '../data/flavors_ptbr.json')
-FLAVORS_EN_PATH = os.path.join(os.path.dirname(__file__), '../data/flavors_en.json')
+# As traduções manuais PT-BR ficam em data/flavors_ptbr.json, paralelas a
+# data/flavors_en.json, e são lidas sob demanda pelo flavor_store.
 
-try:
-    with open(FLAVORS_PTBR_PATH, encoding='utf-8') as f:
-        FLAVORS_PTBR = json.load(f)
-except Exception:
-    FLAVORS_PTBR = {}
 
-try:
-    with open(FLAVORS_EN_PATH, encoding='utf-8') as f:
-        FLAVORS_EN = json.load(f)
-except Exception:
-    FLAVORS_EN = {}
+def _build_translation_index(en_flavors: List[str], translated_flavors: List[str]) -> Dict[str, str]:
+    """
+    Monta o índice {texto_en: texto_traduzido} a partir das listas paralelas
+    dos arquivos de flavors de um Pokémon.
+
+    Quando um texto em inglês se repete, vale a primeira ocorrência.
+    """
+    index = {}
+    for flavor_en, flavor_translated in zip(en_flavors, translated_flavors):
+        index.setdefault(flavor_en, flavor_translated)
+    return index
+
+
+@lru_cache(maxsize=2048)
+def _manual_translations(pokemon_id: int, lang: str) -> Dict[str, str]:
+    """Retorna (e memoiza) o índice de traduções manuais de um Pokémon."""
+    en_store = get_flavor_store('en')
+    translated_store = get_flavor_store(lang)
+    if en_store is None or translated_store is None:
+        return {}
+    return _build_translation_index(en_store.get(pokemon_id), translated_store.get(pokemon_id))
+
 
 def get_manual_flavor_ptbr(pokemon_id: int) -> list[str]:
-    return FLAVORS_PTBR.get(str(pokemon_id), [])
+    return get_flavor_store('pt-BR').get(pokemon_id)
+
+
+def get_or_translate_flavors(db: Session, pokemon_id: int, flavors_en: List[str], lang: str) -> List[str]:
+    """
+    Busca traduções de vários flavor texts de um Pokémon de uma só vez.
+
+    Faz uma única consulta ao cache de traduções para todos os textos e usa o
+    índice de traduções manuais para os demais. Textos sem tradução são
+    retornados no original, mantendo a ordem de entrada.
+    """
+    if not flavors_en:
+        return []
+
+    rows = db.query(
+        PokemonFlavorTranslation.flavor_en, PokemonFlavorTranslation.flavor_translated
+    ).filter(
+        PokemonFlavorTranslation.pokemon_id == pokemon_id,
+        PokemonFlavorTranslation.lang == lang,
+        PokemonFlavorTranslation.flavor_en.in_(set(flavors_en))
+    ).all()
+    cached = {flavor_en: flavor_translated for flavor_en, flavor_translated in rows}
+
+    manual = _manual_translations(pokemon_id, lang) if lang == 'pt-BR' else {}
+
+    return [
+        cached[flavor_en] if flavor_en in cached else manual.get(flavor_en, flavor_en)
+        for flavor_en in flavors_en
+    ]
+
 
 def get_or_translate_flavor(db: Session, pokemon_id: int, flavor_en: str, lang: str) -> str:
     """Busca tradução de flavor text ou retorna o original se não encontrar."""
-    # Busca no cache (mantém para compatibilidade, pode ser removido se não usar mais cache)
-    cache = db.query(PokemonFlavorTranslation).filter_by(
-        pokemon_id=pokemon_id, flavor_en=flavor_en, lang=lang
-    ).first()
-    if cache:
-        return cache.flavor_translated
-
-    # Se for pt-BR, tenta buscar tradução manual
-    if lang == 'pt-BR':
-        try:
-            ptbr_flavors = FLAVORS_PTBR.get(str(pokemon_id), [])
-            en_flavors = FLAVORS_EN.get(str(pokemon_id), [])
-
-            if ptbr_flavors and en_flavors and flavor_en in en_flavors:
-                idx = en_flavors.index(flavor_en)
-                if idx < len(ptbr_flavors):
-                    return ptbr_flavors[idx]
-        except Exception as e:
-            print(f"Erro na tradução: {e}")
-
-    # Se não houver tradução manual, retorna o texto original
-    return flavor_en
\ No newline at end of file
+    return get_or_translate_flavors(db, pokemon_id, [flavor_en], lang)[0]
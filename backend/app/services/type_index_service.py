@@ -0,0 +1,252 @@
+"""
+Índice local de tipos de Pokémon: efetividade de dano e Pokémons por tipo.
+
+Este módulo monta, uma única vez, a partir dos tipos da PokeAPI:
+- A matriz de efetividade 18x18 (tipo atacante x tipo defensor)
+- O índice tipo -> IDs dos Pokémons que possuem o tipo
+
+Com isso, cálculos de vantagem entre tipos e consultas como "Pokémons que
+são de fogo e voador" são respondidos localmente, sem acessar a PokeAPI.
+
+A matriz é um array compacto de bytes com os multiplicadores codificados
+em dobro (0, 1, 2, 4 = 0x, 0.5x, 1x, 2x). O índice de Pokémons guarda, por
+tipo, um array ordenado de IDs e um bitset (inteiro Python com um bit por
+ID), de forma que a interseção de tipos é uma única operação AND.
+
+Example:
+    >>> from app.services.type_index_service import type_index_service
+    >>> index = await type_index_service.get_index()
+    >>> index.multiplier("fire", ["grass", "steel"])
+    4.0
+    >>> index.pokemon_with_types(["fire", "flying"])[:3]
+    [6, 146, 250]
+"""
+import asyncio
+import logging
+from array import array
+from typing import Dict, List, Optional
+
+from app.services.pokeapi_service import PokeAPIService, pokeapi_service
+from app.services.pokemon_search_index import id_from_url
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Multiplicadores codificados em dobro para caber em inteiros pequenos
+_NO_DAMAGE = 0
+_HALF_DAMAGE = 1
+_NORMAL_DAMAGE = 2
+_DOUBLE_DAMAGE = 4
+
+_RELATION_CODES = {
+    "no_damage_to": _NO_DAMAGE,
+    "half_damage_to": _HALF_DAMAGE,
+    "double_damage_to": _DOUBLE_DAMAGE,
+}
+
+
+class TypeIndex:
+    """
+    Matriz de efetividade e índice de Pokémons por tipo.
+
+    Attributes:
+        types (List[str]): Nomes dos tipos, na ordem da PokeAPI.
+        positions (Dict[str, int]): Mapa tipo -> linha/coluna na matriz.
+    """
+
+    def __init__(self):
+        self.types: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self._matrix = array("B")
+        self._members: Dict[str, array] = {}
+        self._bitsets: Dict[str, int] = {}
+
+    @property
+    def is_built(self) -> bool:
+        """Indica se o índice já foi construído."""
+        return bool(self.types)
+
+    def build(self, type_payloads: List[Dict]):
+        """
+        Constrói a matriz e o índice a partir dos payloads de /type/{name}.
+
+        Tipos sem relações de dano (ex: 'unknown', 'shadow') são ignorados.
+
+        Args:
+            type_payloads: Respostas completas da PokeAPI para cada tipo.
+        """
+        payloads = sorted(
+            (
+                payload for payload in type_payloads
+                if any(payload.get("damage_relations", {}).get(relation) for relation in _RELATION_CODES)
+            ),
+            key=lambda payload: payload["id"]
+        )
+
+        types = [payload["name"] for payload in payloads]
+        positions = {name: position for position, name in enumerate(types)}
+        size = len(types)
+
+        matrix = array("B", [_NORMAL_DAMAGE]) * (size * size)
+        members: Dict[str, array] = {}
+        bitsets: Dict[str, int] = {}
+
+        for payload in payloads:
+            attacker = positions[payload["name"]]
+            relations = payload.get("damage_relations", {})
+            for relation, code in _RELATION_CODES.items():
+                for target in relations.get(relation, []):
+                    defender = positions.get(target["name"])
+                    if defender is not None:
+                        matrix[attacker * size + defender] = code
+
+            ids = sorted({
+                pokemon_id for pokemon_id in (
+                    id_from_url(entry["pokemon"]["url"]) for entry in payload.get("pokemon", [])
+                ) if pokemon_id is not None
+            })
+            bitset = 0
+            for pokemon_id in ids:
+                bitset |= 1 << pokemon_id
+            members[payload["name"]] = array("I", ids)
+            bitsets[payload["name"]] = bitset
+
+        self.types = types
+        self.positions = positions
+        self._matrix = matrix
+        self._members = members
+        self._bitsets = bitsets
+
+    def _position(self, type_name: str) -> int:
+        """Retorna a posição de um tipo na matriz ou gera ValueError."""
+        try:
+            return self.positions[type_name.lower()]
+        except KeyError:
+            raise ValueError(f"Tipo desconhecido: {type_name}")
+
+    def multiplier(self, attacking_type: str, defending_types: List[str]) -> float:
+        """
+        Calcula o multiplicador de dano de um ataque contra um ou dois tipos.
+
+        Args:
+            attacking_type: Tipo do ataque.
+            defending_types: Tipos do Pokémon defensor.
+
+        Returns:
+            float: Multiplicador total (ex: 0.0, 0.25, 0.5, 1.0, 2.0, 4.0).
+
+        Raises:
+            ValueError: Se algum tipo não existir.
+        """
+        row = self._position(attacking_type) * len(self.types)
+        product = 1
+        for defending_type in defending_types:
+            product *= self._matrix[row + self._position(defending_type)]
+        return product / (_NORMAL_DAMAGE ** len(defending_types))
+
+    def defensive_profile(self, defending_types: List[str]) -> Dict[str, float]:
+        """
+        Calcula o multiplicador de cada tipo atacante contra os tipos dados.
+
+        Cada tipo defensor corresponde a uma coluna da matriz; as colunas
+        são multiplicadas elemento a elemento.
+
+        Args:
+            defending_types: Tipos do Pokémon defensor.
+
+        Returns:
+            Dict[str, float]: Mapa tipo atacante -> multiplicador.
+
+        Raises:
+            ValueError: Se algum tipo não existir.
+        """
+        size = len(self.types)
+        products = [1] * size
+        for defending_type in defending_types:
+            column = self._matrix[self._position(defending_type)::size]
+            products = [product * code for product, code in zip(products, column)]
+
+        divisor = _NORMAL_DAMAGE ** len(defending_types)
+        return {name: product / divisor for name, product in zip(self.types, products)}
+
+    def matrix(self) -> List[List[float]]:
+        """Retorna a matriz de efetividade (linhas: atacante, colunas: defensor)."""
+        size = len(self.types)
+        return [
+            [code / _NORMAL_DAMAGE for code in self._matrix[row * size:(row + 1) * size]]
+            for row in range(size)
+        ]
+
+    def pokemon_with_types(self, type_names: List[str]) -> List[int]:
+        """
+        Retorna os IDs dos Pokémons que possuem todos os tipos informados.
+
+        Args:
+            type_names: Um ou mais tipos.
+
+        Returns:
+            List[int]: IDs em ordem crescente.
+
+        Raises:
+            ValueError: Se algum tipo não existir.
+        """
+        names = [self.types[self._position(name)] for name in type_names]
+        if not names:
+            return []
+        if len(names) == 1:
+            return self._members[names[0]].tolist()
+
+        bitset = self._bitsets[names[0]]
+        for name in names[1:]:
+            bitset &= self._bitsets[name]
+        return [pokemon_id for pokemon_id in self._members[names[0]] if bitset >> pokemon_id & 1]
+
+
+class TypeIndexService:
+    """
+    Mantém o índice de tipos, construindo-o sob demanda a partir da PokeAPI.
+
+    Os tipos são obtidos pelo PokeAPIService (e portanto pelo seu cache e
+    espelho persistente); buscas concorrentes compartilham uma única
+    construção.
+
+    Attributes:
+        pokeapi (PokeAPIService): Serviço usado para buscar os tipos.
+        index (TypeIndex): Índice construído (vazio até a primeira consulta).
+    """
+
+    def __init__(self, pokeapi: PokeAPIService):
+        self.pokeapi = pokeapi
+        self.index = TypeIndex()
+        self._flights = SingleFlight()
+
+    async def get_index(self) -> Optional[TypeIndex]:
+        """
+        Retorna o índice de tipos, construindo-o na primeira chamada.
+
+        Returns:
+            Optional[TypeIndex]: Índice construído ou None se os tipos não
+            puderem ser obtidos da PokeAPI.
+        """
+        if self.index.is_built:
+            return self.index
+        return await self._flights.do("build", self._build)
+
+    async def _build(self) -> Optional[TypeIndex]:
+        """Busca todos os tipos e constrói o índice."""
+        types = await self.pokeapi.get_pokemon_types()
+        if not types:
+            return None
+
+        payloads = await asyncio.gather(*(self.pokeapi.get_type(entry["name"]) for entry in types))
+        if any(payload is None for payload in payloads):
+            logger.warning("Não foi possível obter todos os tipos da PokeAPI; índice de tipos não construído")
+            return None
+
+        self.index.build(payloads)
+        logger.info(f"Índice de tipos construído: {len(self.index.types)} tipos")
+        return self.index
+
+
+# Instância global do serviço
+type_index_service = TypeIndexService(pokeapi_service)
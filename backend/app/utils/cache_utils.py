@@ -0,0 +1,185 @@
+"""
+Utilitários de cache em memória para respostas de APIs externas.
+
+Este módulo fornece um cache LRU com expiração por entrada (TTL) e janela
+de tolerância para dados obsoletos (stale-while-revalidate). É usado para
+evitar chamadas repetidas à PokeAPI, cujos dados mudam raramente.
+
+Funcionalidades:
+    - Limite de tamanho com despejo LRU (least recently used)
+    - TTL configurável por entrada
+    - Janela "stale" em que o valor expirado ainda pode ser servido
+      enquanto o chamador o revalida em background
+    - Estatísticas de hits, misses e despejos
+
+Classes:
+    ResponseCache: Cache LRU com TTL e suporte a stale-while-revalidate
+
+Example:
+    >>> from app.utils.cache_utils import ResponseCache, CACHE_FRESH
+    >>> cache = ResponseCache(max_entries=2, default_ttl=60)
+    >>> cache.set(("pokemon", "25"), {"name": "pikachu"})
+    >>> value, status = cache.get(("pokemon", "25"))
+    >>> status == CACHE_FRESH
+    True
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Estados possíveis retornados por ResponseCache.get
+CACHE_FRESH = "fresh"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+
+class _CacheEntry:
+    """Entrada interna do cache com valor e prazos de expiração."""
+
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """
+    Cache LRU em memória com TTL e janela de dados obsoletos.
+
+    Cada entrada possui dois prazos: ``expires_at`` (fim do período em que
+    o valor é considerado fresco) e ``stale_until`` (fim do período em que
+    o valor expirado ainda pode ser servido). Após ``stale_until`` a entrada
+    é descartada e a leitura conta como miss.
+
+    Não é thread-safe: foi projetado para uso dentro de um único event loop
+    asyncio, onde não há preempção entre as operações.
+
+    Attributes:
+        max_entries (int): Número máximo de entradas antes do despejo LRU.
+        default_ttl (float): TTL padrão em segundos.
+        stale_ttl (float): Tempo adicional, após o TTL, em que o valor
+            ainda pode ser servido como obsoleto.
+
+    Example:
+        >>> cache = ResponseCache(max_entries=100, default_ttl=3600, stale_ttl=86400)
+        >>> cache.set("chave", "valor", ttl=10)
+        >>> cache.get("chave")
+        ('valor', 'fresh')
+    """
+
+    def __init__(self, max_entries: int = 2048, default_ttl: float = 3600.0, stale_ttl: float = 0.0):
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser maior que zero")
+
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+
+        # Estatísticas de uso
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[Optional[Any], str]:
+        """
+        Busca um valor no cache.
+
+        Args:
+            key: Chave da entrada.
+
+        Returns:
+            Tuple[Optional[Any], str]: Par (valor, estado), onde estado é
+            CACHE_FRESH, CACHE_STALE ou CACHE_MISS. Em caso de miss o valor
+            é None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, CACHE_MISS
+
+        now = time.monotonic()
+        if now >= entry.stale_until:
+            del self._entries[key]
+            self.misses += 1
+            return None, CACHE_MISS
+
+        self._entries.move_to_end(key)
+
+        if now < entry.expires_at:
+            self.hits += 1
+            return entry.value, CACHE_FRESH
+
+        self.stale_hits += 1
+        return entry.value, CACHE_STALE
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        """
+        Armazena um valor no cache, despejando a entrada LRU se necessário.
+
+        Args:
+            key: Chave da entrada.
+            value: Valor a armazenar.
+            ttl: TTL em segundos. Usa default_ttl se omitido.
+            stale_ttl: Janela de obsolescência em segundos. Usa o valor da
+                instância se omitido.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+
+        now = time.monotonic()
+        expires_at = now + ttl
+        self._entries[key] = _CacheEntry(value, expires_at, expires_at + stale_ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Remove uma entrada do cache.
+
+        Args:
+            key: Chave da entrada.
+
+        Returns:
+            bool: True se a entrada existia, False caso contrário.
+        """
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """Remove todas as entradas e zera as estatísticas."""
+        self._entries.clear()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            Dict[str, Any]: Tamanho atual, limite e contadores de hits,
+            stale hits, misses e despejos.
+        """
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
@@ -0,0 +1,64 @@
+"""
+Projeção de campos de respostas JSON.
+
+Este módulo permite reduzir payloads grandes da PokeAPI aos campos que o
+cliente realmente usa, evitando serializar e transferir dados desnecessários.
+Os campos podem ser de primeiro nível ("name") ou caminhos aninhados
+separados por ponto ("sprites.front_default").
+
+Example:
+    >>> from app.utils.projection import project_fields
+    >>> pokemon = {"id": 25, "name": "pikachu", "sprites": {"front_default": "url", "back_default": "url2"}}
+    >>> project_fields(pokemon, ["id", "sprites.front_default"])
+    {'id': 25, 'sprites': {'front_default': 'url'}}
+"""
+from typing import Any, Dict, Iterable, List
+
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Converte uma lista de campos separados por vírgula em lista de caminhos.
+
+    Args:
+        fields: Texto no formato "id,name,sprites.front_default".
+
+    Returns:
+        List[str]: Caminhos não vazios, sem espaços e sem repetição.
+    """
+    return list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+
+
+def project_fields(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Retorna um novo dicionário apenas com os campos solicitados.
+
+    O dicionário original não é modificado; os valores selecionados são
+    compartilhados com ele. Campos inexistentes são ignorados.
+
+    Args:
+        data: Dicionário de origem.
+        fields: Caminhos de campos, com '.' para campos aninhados.
+
+    Returns:
+        Dict[str, Any]: Dicionário projetado.
+    """
+    result: Dict[str, Any] = {}
+    selected = set()
+    # Caminhos mais curtos primeiro: um campo já selecionado por inteiro
+    # torna redundantes os seus subcampos (e evita escrever no original)
+    for field in sorted(fields, key=lambda f: f.count(".")):
+        path = field.split(".")
+        if any(".".join(path[:i]) in selected for i in range(1, len(path) + 1)):
+            continue
+        value: Any = data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+            selected.add(field)
+    return result
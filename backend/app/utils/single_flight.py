@@ -0,0 +1,77 @@
+"""
+Coalescência de chamadas assíncronas concorrentes (single-flight).
+
+Este módulo garante que chamadas concorrentes com a mesma chave compartilhem
+uma única execução em andamento e o seu resultado. É usado para evitar que
+vários requests simultâneos pelo mesmo recurso disparem várias requisições
+idênticas à PokeAPI ou vários downloads do mesmo arquivo.
+
+Classes:
+    SingleFlight: Grupo de chamadas coalescidas por chave
+
+Example:
+    >>> from app.utils.single_flight import SingleFlight
+    >>> flights = SingleFlight()
+    >>> result = await flights.do("pokemon/25", lambda: fetch("pokemon/25"))
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Grupo de chamadas assíncronas coalescidas por chave.
+
+    A primeira chamada para uma chave inicia a execução em uma tarefa
+    própria; chamadas concorrentes com a mesma chave aguardam essa mesma
+    tarefa. Ao terminar, a chave é liberada e a próxima chamada inicia uma
+    nova execução. Exceções são propagadas para todos os chamadores.
+
+    O cancelamento de um chamador não cancela a execução compartilhada,
+    para que os demais chamadores continuem recebendo o resultado.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> a, b = await asyncio.gather(
+        ...     flights.do("k", slow_fetch),
+        ...     flights.do("k", slow_fetch)
+        ... )  # slow_fetch executa apenas uma vez
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa ``fn`` ou aguarda a execução em andamento para a mesma chave.
+
+        Args:
+            key: Chave que identifica a chamada.
+            fn: Função sem argumentos que retorna um awaitable.
+
+        Returns:
+            Any: Resultado da execução compartilhada.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Libera a chave se ela ainda aponta para a tarefa concluída."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Evita aviso de exceção não recuperada quando todos os chamadores
+        # foram cancelados antes do término
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Retorna o número de chamadas em andamento."""
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
@@ -7,6 +7,7 @@ incluindo configuração de logging, middleware, CORS e inicialização do banco
 Exemplo:
     >>> uvicorn main:app --host 0.0.0.0 --port 8000 --reload
 """
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -69,9 +70,48 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"❌ Erro ao iniciar scheduler: {e}")
 
+    try:
+        from app.services.image_http_client import image_http_client
+        await image_http_client.start()
+    except Exception as e:
+        print(f"❌ Erro ao iniciar cliente HTTP de imagens: {e}")
+
+    try:
+        from app.core.database import SessionLocal
+        from app.routes.images import image_cache_service, image_index_verifier
+        db = SessionLocal()
+        try:
+            image_cache_service.load_index(db)
+        finally:
+            db.close()
+        await image_index_verifier.start()
+        print("🔍 Índice de imagens carregado")
+    except Exception as e:
+        print(f"❌ Erro ao carregar índice de imagens: {e}")
+
+    try:
+        from app.core.config import settings
+        from app.routes.images import cache_recovery_engine
+        if settings.cache_recovery_enabled:
+            await cache_recovery_engine.start()
+            print("🩹 Recuperação do cache de imagens iniciada")
+    except Exception as e:
+        print(f"❌ Erro ao iniciar recuperação do cache de imagens: {e}")
+
+    # Nomes dos Pokémons carregados em background (não atrasa a inicialização)
+    name_registry_task = None
+    try:
+        from app.services.pokemon_name_registry import pokemon_names
+        name_registry_task = asyncio.create_task(pokemon_names.ensure_loaded())
+    except Exception as e:
+        print(f"❌ Erro ao carregar nomes dos Pokémons: {e}")
+
     yield
 
     # Shutdown - executado quando a aplicação encerra
+    if name_registry_task is not None:
+        name_registry_task.cancel()
+
     try:
         from app.services.pull_sync_scheduler import pull_scheduler
         await pull_scheduler.stop()
@@ -79,6 +119,30 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"❌ Erro ao parar scheduler: {e}")
 
+    try:
+        from app.routes.images import cache_recovery_engine
+        await cache_recovery_engine.stop()
+    except Exception as e:
+        print(f"❌ Erro ao parar recuperação do cache de imagens: {e}")
+
+    try:
+        from app.routes.images import image_index_verifier
+        await image_index_verifier.stop()
+    except Exception as e:
+        print(f"❌ Erro ao parar verificador do índice de imagens: {e}")
+
+    try:
+        from app.services.image_http_client import image_http_client
+        await image_http_client.close()
+    except Exception as e:
+        print(f"❌ Erro ao fechar cliente HTTP de imagens: {e}")
+
+    try:
+        from app.services.image_process_pool import image_process_pool
+        image_process_pool.shutdown(wait=False)
+    except Exception as e:
+        print(f"❌ Erro ao encerrar pool de processamento de imagens: {e}")
+
 
 # Configuração básica
 app = FastAPI(
@@ -218,12 +282,16 @@ app.add_middleware(
 try:
     from app.core.database import engine
     from app.models.models import Base, User
-    from app.services.image_cache_service import PokemonImageCache
+    from app.services.image_cache_service import PokemonImageCache, ensure_image_cache_schema
+    from app.services.image_optimization_service import ensure_optimized_image_schema
+    from app.services.pokeapi_mirror_service import PokeAPIMirrorEntry
     from app.routes import favorites, ranking, pokemon, sync_capture, admin, pull_sync, auth, pokemon_management, images
 
     # Criar tabelas vazias (sem dados iniciais)
     # Em produção, o banco é criado vazio e alimentado apenas pelo frontend
     Base.metadata.create_all(bind=engine)
+    ensure_image_cache_schema(engine)
+    ensure_optimized_image_schema(engine)
 
     # CORREÇÃO CRÍTICA: Garantir persistência de usuários de teste
     try:
@@ -8,9 +8,10 @@ armazenamento local completo e otimizado.
 
 import asyncio
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import argparse
 from datetime import datetime
 
@@ -21,7 +22,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.database import Base
 from app.services.image_cache_service import ImageCacheService
+from app.services.image_download_scheduler import DownloadJob, ImageDownloadScheduler, build_jobs
+from app.services.image_http_client import image_http_client
 from app.services.image_optimization_service import ImageOptimizationService
+from app.services.image_process_pool import image_process_pool
 from app.core.config import settings
 
 # Configuração de logging
@@ -60,24 +64,37 @@ class MassImagePreloader:
         
         # Configurações
         self.max_pokemon = 1010
-        self.batch_size = 10
-        self.max_concurrent = 5
-        
+        self.image_types = ['official-artwork', 'sprite', 'home', 'sprite-shiny', 'home-shiny']
+        self.optimization_types = ['high', 'medium', 'low']
+
         logger.info(f"MassImagePreloader inicializado - Máximo: {self.max_pokemon} Pokémons")
 
-    async def preload_all_images(self, start_id: int = 1, end_id: int = 1010) -> Dict[str, any]:
+    async def preload_all_images(
+        self,
+        start_id: int = 1,
+        end_id: int = 1010,
+        workers: int = None,
+        progress_path: str = 'mass_preload_progress.json'
+    ) -> Dict[str, any]:
         """
         Pré-carrega todas as imagens dos Pokémons com otimização completa.
-        
+
+        As imagens são processadas por um ImageDownloadScheduler: Geração 1
+        primeiro, concorrência adaptativa e progresso salvo em
+        ``progress_path``, de forma que uma execução interrompida continua de
+        onde parou.
+
         Args:
             start_id: ID inicial do Pokémon
             end_id: ID final do Pokémon
-            
+            workers: Número de workers (padrão: settings.image_download_workers)
+            progress_path: Arquivo de progresso (None para não retomar)
+
         Returns:
             Estatísticas completas do processamento
         """
         start_time = datetime.now()
-        
+
         stats = {
             'start_time': start_time.isoformat(),
             'total_pokemons': 0,
@@ -88,131 +105,98 @@ class MassImagePreloader:
             'space_saved_mb': 0,
             'pokemon_details': {}
         }
-        
+
         pokemon_range = range(start_id, min(end_id + 1, self.max_pokemon + 1))
         stats['total_pokemons'] = len(pokemon_range)
-        
+
         logger.info(f"Iniciando pré-carregamento de {len(pokemon_range)} Pokémons")
-        
-        # Processa em lotes
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-        
-        async def process_pokemon_batch(pokemon_ids: List[int]):
-            """Processa um lote de Pokémons."""
-            async with semaphore:
-                return await self._process_pokemon_batch(pokemon_ids)
-        
-        # Divide em lotes
-        batches = [list(pokemon_range)[i:i + self.batch_size] 
-                  for i in range(0, len(pokemon_range), self.batch_size)]
-        
-        # Processa todos os lotes
-        for i, batch in enumerate(batches):
-            logger.info(f"Processando lote {i+1}/{len(batches)}: Pokémons {batch[0]}-{batch[-1]}")
-            
-            batch_stats = await process_pokemon_batch(batch)
-            
-            # Atualiza estatísticas gerais
-            stats['total_images_downloaded'] += batch_stats['downloaded']
-            stats['total_images_optimized'] += batch_stats['optimized']
-            stats['download_failures'] += batch_stats['download_failures']
-            stats['optimization_failures'] += batch_stats['optimization_failures']
-            
-            # Atualiza detalhes por Pokémon
-            for pokemon_id, details in batch_stats['details'].items():
-                stats['pokemon_details'][pokemon_id] = details
-        
+
+        def details_for(pokemon_id: int) -> Dict[str, any]:
+            return stats['pokemon_details'].setdefault(pokemon_id, {
+                'id': pokemon_id,
+                'images_downloaded': 0,
+                'images_optimized': 0,
+                'failed_downloads': [],
+                'failed_optimizations': []
+            })
+
+        async def process_image(job: DownloadJob):
+            result = await self._process_image(job.pokemon_id, job.image_type, details_for(job.pokemon_id))
+            if result is None:
+                raise RuntimeError(f"Falha no download de {job.key}")
+            return result
+
+        # Novas tentativas seguem a janela de retry do ImageCacheService
+        scheduler = ImageDownloadScheduler(
+            process_image, workers=workers, max_attempts=1, progress_path=progress_path
+        )
+        jobs = build_jobs(pokemon_range, self.image_types)
+        result = await scheduler.run(jobs)
+
+        stats['total_images_downloaded'] = result['success']
+        stats['download_failures'] = result['failed']
+        stats['resumed_images'] = result['resumed']
+        for job in jobs:
+            if scheduler.results.get(job.key, {}).get('status') == 'failed':
+                details_for(job.pokemon_id)['failed_downloads'].append(job.image_type)
+        for details in stats['pokemon_details'].values():
+            stats['total_images_optimized'] += details['images_optimized']
+            stats['optimization_failures'] += len(details['failed_optimizations'])
+
         # Calcula economia de espaço
         optimization_stats = self.optimization_service.get_optimization_stats(self.db)
         stats['space_saved_mb'] = optimization_stats.get('space_saved_mb', 0)
-        
+
         end_time = datetime.now()
         stats['end_time'] = end_time.isoformat()
         stats['duration_seconds'] = (end_time - start_time).total_seconds()
-        
+
         # Salva relatório
         await self._save_report(stats)
-        
+
         logger.info(f"Pré-carregamento concluído: {stats['total_images_downloaded']} imagens baixadas, "
                    f"{stats['total_images_optimized']} otimizadas, "
                    f"{stats['space_saved_mb']}MB economizados")
-        
+
         return stats
 
-    async def _process_pokemon_batch(self, pokemon_ids: List[int]) -> Dict[str, any]:
+    async def _process_image(self, pokemon_id: int, image_type: str, pokemon_details: Dict[str, any]) -> Optional[str]:
         """
-        Processa um lote específico de Pokémons.
-        
+        Baixa uma imagem e gera suas versões otimizadas.
+
         Args:
-            pokemon_ids: Lista de IDs para processar
-            
+            pokemon_id: ID do Pokémon
+            image_type: Tipo de imagem
+            pokemon_details: Detalhes do Pokémon no relatório (downloads e
+                otimizações; falhas de download são registradas após a fila)
+
         Returns:
-            Estatísticas do lote
+            Caminho local da imagem ou None se o download falhou
         """
-        batch_stats = {
-            'downloaded': 0,
-            'optimized': 0,
-            'download_failures': 0,
-            'optimization_failures': 0,
-            'details': {}
-        }
-        
-        image_types = ['official-artwork', 'sprite', 'home', 'sprite-shiny', 'home-shiny']
-        optimization_types = ['high', 'medium', 'low']
-        
-        for pokemon_id in pokemon_ids:
-            pokemon_details = {
-                'id': pokemon_id,
-                'images_downloaded': 0,
-                'images_optimized': 0,
-                'failed_downloads': [],
-                'failed_optimizations': []
-            }
-            
-            # Baixa todas as imagens para este Pokémon
-            for image_type in image_types:
-                try:
-                    result = await self.cache_service.get_pokemon_image(
-                        self.db, pokemon_id, image_type
-                    )
-                    
-                    if result and os.path.exists(result):
-                        batch_stats['downloaded'] += 1
-                        pokemon_details['images_downloaded'] += 1
-                        
-                        # Otimiza com diferentes configurações
-                        for opt_type in optimization_types:
-                            try:
-                                optimized = await self.optimization_service.optimize_pokemon_image(
-                                    self.db, pokemon_id, image_type, opt_type, 'webp'
-                                )
-                                
-                                if optimized:
-                                    batch_stats['optimized'] += 1
-                                    pokemon_details['images_optimized'] += 1
-                                else:
-                                    batch_stats['optimization_failures'] += 1
-                                    pokemon_details['failed_optimizations'].append(
-                                        f"{image_type}_{opt_type}"
-                                    )
-                                    
-                            except Exception as e:
-                                batch_stats['optimization_failures'] += 1
-                                pokemon_details['failed_optimizations'].append(
-                                    f"{image_type}_{opt_type}"
-                                )
-                                
-                    else:
-                        batch_stats['download_failures'] += 1
-                        pokemon_details['failed_downloads'].append(image_type)
-                        
-                except Exception as e:
-                    batch_stats['download_failures'] += 1
-                    pokemon_details['failed_downloads'].append(image_type)
-            
-            batch_stats['details'][pokemon_id] = pokemon_details
-        
-        return batch_stats
+        result = await self.cache_service.get_pokemon_image(self.db, pokemon_id, image_type)
+
+        if not result or not os.path.exists(result):
+            return None
+
+        pokemon_details['images_downloaded'] += 1
+
+        # Otimiza com diferentes configurações
+        for opt_type in self.optimization_types:
+            try:
+                optimized = await self.optimization_service.optimize_pokemon_image(
+                    self.db, pokemon_id, image_type, opt_type, 'webp'
+                )
+
+                if optimized:
+                    pokemon_details['images_optimized'] += 1
+                else:
+                    pokemon_details['failed_optimizations'].append(f"{image_type}_{opt_type}")
+
+            except Exception as e:
+                logger.debug(f"Erro ao otimizar {pokemon_id}/{image_type}/{opt_type}: {e}")
+                pokemon_details['failed_optimizations'].append(f"{image_type}_{opt_type}")
+
+        return result
 
     async def create_thumbnails(self, pokemon_ids: List[int] = None) -> Dict[str, int]:
         """
@@ -273,15 +257,22 @@ def main():
     parser = argparse.ArgumentParser(description='Pré-carrega imagens de Pokémons')
     parser.add_argument('--start', type=int, default=1, help='ID inicial do Pokémon')
     parser.add_argument('--end', type=int, default=1010, help='ID final do Pokémon')
-    parser.add_argument('--batch-size', type=int, default=10, help='Tamanho do lote')
-    parser.add_argument('--max-concurrent', type=int, default=5, help='Máximo de downloads simultâneos')
+    parser.add_argument('--workers', type=int, default=None, help='Número de workers de download')
+    parser.add_argument('--progress-file', default='mass_preload_progress.json',
+                        help='Arquivo de progresso usado para retomar execuções')
+    parser.add_argument('--fresh', action='store_true', help='Ignora o progresso salvo e recomeça')
     
     args = parser.parse_args()
     
     async def run():
         preloader = MassImagePreloader()
         try:
-            stats = await preloader.preload_all_images(args.start, args.end)
+            progress_path = args.progress_file
+            if args.fresh and os.path.exists(progress_path):
+                os.remove(progress_path)
+            stats = await preloader.preload_all_images(
+                args.start, args.end, workers=args.workers, progress_path=progress_path
+            )
             
             print(f"\n{'='*60}")
             print("RELATÓRIO DE PRÉ-CARREGAMENTO")
@@ -297,6 +288,8 @@ def main():
             
         finally:
             preloader.close()
+            await image_http_client.close()
+            image_process_pool.shutdown()
     
     asyncio.run(run())
 
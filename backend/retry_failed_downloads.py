@@ -2,17 +2,16 @@
 """
 Script para retry inteligente de downloads falhados.
 
-Este script identifica imagens que falharam no download e tenta baixá-las novamente,
-respeitando rate limits e implementando backoff exponencial.
+Este script identifica imagens que falharam no download e tenta baixá-las novamente
+pela fila de downloads (ImageDownloadScheduler), respeitando rate limits e
+implementando backoff exponencial.
 """
 
 import os
 import sys
-import time
 import json
 import asyncio
-import aiohttp
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 # Adicionar o diretório atual ao path para importações
@@ -21,31 +20,20 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.core.database import SessionLocal
 from app.services.image_cache_service import PokemonImageCache
 from app.services.image_cache_service import ImageCacheService
+from app.services.image_download_scheduler import DownloadJob, ImageDownloadScheduler
+from app.services.image_http_client import image_http_client
 
 
 class RetryManager:
     def __init__(self):
         self.service = ImageCacheService()
-        self.session = None
         self.retry_config = {
             'max_retries': 3,
-            'initial_delay': 2,  # segundos
-            'max_delay': 60,     # segundos
-            'batch_size': 5,     # downloads por batch
-            'batch_delay': 10    # segundos entre batches
+            'initial_delay': 2,  # segundos, dobrando a cada tentativa
+            'workers': 5,
+            'progress_file': 'retry_progress.json'
         }
-    
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            connector=aiohttp.TCPConnector(limit=10, limit_per_host=5)
-        )
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
+
     def get_failed_downloads(self):
         """Identifica imagens que falharam no download."""
         db = SessionLocal()
@@ -67,73 +55,56 @@ class RetryManager:
         finally:
             db.close()
     
-    async def download_with_retry(self, pokemon_id: int, image_type: str):
-        """Faz download com retry inteligente."""
-        delay = self.retry_config['initial_delay']
-        
-        for attempt in range(self.retry_config['max_retries']):
-            try:
-                print(f"🔄 Tentando {image_type} do Pokémon {pokemon_id} (tentativa {attempt + 1})")
-                
-                # Usa o serviço existente para fazer o download
-                success = await self.service.download_image_async(pokemon_id, image_type)
-                
-                if success:
-                    print(f"✅ Sucesso: {image_type} do Pokémon {pokemon_id}")
-                    return True
-                else:
-                    print(f"❌ Falha: {image_type} do Pokémon {pokemon_id}")
-                    
-            except Exception as e:
-                print(f"❌ Erro: {e}")
-            
-            # Aguarda antes de tentar novamente (exceto na última tentativa)
-            if attempt < self.retry_config['max_retries'] - 1:
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, self.retry_config['max_delay'])
-        
-        return False
-    
+    async def download(self, job: DownloadJob) -> str:
+        """Baixa novamente uma imagem falhada; gera exceção se falhar."""
+        print(f"🔄 Tentando {job.image_type} do Pokémon {job.pokemon_id} (tentativa {job.attempts})")
+
+        db = SessionLocal()
+        try:
+            result = await self.service.retry_pokemon_image(db, job.pokemon_id, job.image_type)
+        finally:
+            db.close()
+
+        if not result:
+            print(f"❌ Falha: {job.image_type} do Pokémon {job.pokemon_id}")
+            raise RuntimeError(f"download de {job.image_type} do Pokémon {job.pokemon_id} falhou")
+
+        print(f"✅ Sucesso: {job.image_type} do Pokémon {job.pokemon_id}")
+        return result
+
     async def retry_batch(self, failed_images):
-        """Processa um lote de imagens falhadas."""
+        """
+        Processa as imagens falhadas pela fila de downloads.
+
+        A fila prioriza a Geração 1, ajusta a concorrência conforme as
+        respostas do servidor e salva o progresso para retomar a execução.
+        """
+        scheduler = ImageDownloadScheduler(
+            self.download,
+            workers=self.retry_config['workers'],
+            max_attempts=self.retry_config['max_retries'],
+            retry_delay=self.retry_config['initial_delay'],
+            progress_path=self.retry_config['progress_file']
+        )
+        jobs = [DownloadJob(img['pokemon_id'], img['image_type']) for img in failed_images]
+        await scheduler.run(jobs)
+
         results = []
-        
-        # Processa em batches menores para evitar rate limiting
-        for i in range(0, len(failed_images), self.retry_config['batch_size']):
-            batch = failed_images[i:i + self.retry_config['batch_size']]
-            
-            print(f"\n📦 Processando batch {i//self.retry_config['batch_size'] + 1}/{(len(failed_images) + self.retry_config['batch_size'] - 1)//self.retry_config['batch_size']}")
-            
-            # Processa o batch
-            tasks = [
-                self.download_with_retry(img['pokemon_id'], img['image_type'])
-                for img in batch
-            ]
-            
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Registra resultados
-            for img, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    results.append({
-                        'pokemon_id': img['pokemon_id'],
-                        'image_type': img['image_type'],
-                        'success': False,
-                        'error': str(result)
-                    })
-                else:
-                    results.append({
-                        'pokemon_id': img['pokemon_id'],
-                        'image_type': img['image_type'],
-                        'success': result
-                    })
-            
-            # Pausa entre batches
-            if i + self.retry_config['batch_size'] < len(failed_images):
-                await asyncio.sleep(self.retry_config['batch_delay'])
-        
+        for job in jobs:
+            # Jobs sem resultado foram concluídos em uma execução anterior
+            result = scheduler.results.get(job.key, {'status': 'success', 'attempts': 0})
+            entry = {
+                'pokemon_id': job.pokemon_id,
+                'image_type': job.image_type,
+                'success': result['status'] == 'success',
+                'attempts': result['attempts']
+            }
+            if 'error' in result:
+                entry['error'] = result['error']
+            results.append(entry)
+
         return results
-    
+
     async def run_retry_process(self):
         """Executa o processo completo de retry."""
         print("🔍 Buscando imagens que falharam no download...")
@@ -147,8 +118,10 @@ class RetryManager:
         print(f"📊 Encontradas {len(failed_images)} imagens falhadas")
         
         # Executa o retry
-        async with self:
+        try:
             results = await self.retry_batch(failed_images)
+        finally:
+            await image_http_client.close()
         
         # Gera relatório
         successful = [r for r in results if r['success']]
@@ -3,42 +3,51 @@
 Estratégia de Recuperação Inteligente do Cache de Imagens
 
 Este script implementa uma abordagem estratégica para recuperar imagens críticas
-que falharam no download, utilizando retry inteligente com backoff exponencial
-e respeitando os limites da PokeAPI.
+que falharam no download, utilizando a fila de downloads do ImageCacheService
+(ImageDownloadScheduler) com retry e backoff exponencial, concorrência
+adaptativa e limite de requisições por host, respeitando os limites da PokeAPI.
+As imagens que continuarem falhando ficam na fila persistente do
+CacheRecoveryEngine, que roda dentro do backend.
 """
 
 import asyncio
-import time
 import json
-import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
-import requests
-from sqlalchemy import create_engine, and_
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from typing import List, Dict
+from sqlalchemy import and_
 import sys
 import os
 
 # Adicionar o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from app.core.database import SessionLocal, engine
+from app.services.cache_recovery_service import CacheRecoveryEngine
 from app.services.image_cache_service import ImageCacheService
-from app.services.image_cache_service import PokemonImageCache
+from app.services.image_cache_service import PokemonImageCache, ensure_image_cache_schema
+from app.services.image_download_scheduler import AdaptiveDownloadGate, DownloadJob, ImageDownloadScheduler
+from app.services.image_http_client import image_http_client
 
 class StrategicCacheRecovery:
     def __init__(self):
-        self.db_path = "sqlite:///./pokemon_app.db"
-        self.engine = create_engine(self.db_path)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
-        
+        ensure_image_cache_schema(engine)
+        self.session = SessionLocal()
+        self.recovery_engine = CacheRecoveryEngine()
+
         # Configurações de retry inteligente
         self.max_retries = 5
-        self.initial_delay = 60  # 1 minuto
-        self.max_delay = 3600  # 1 hora
-        self.batch_size = 5  # Processar em lotes pequenos
-        self.daily_limit = 100  # Limite diário de requests
-        
+        self.initial_delay = 60  # 1 minuto, dobrando a cada tentativa
+        self.daily_limit = 100  # Limite diário de imagens por ciclo
+        self.max_concurrency = 2
+        self.progress_path = "strategic_recovery_progress.json"
+
+        # Fila de downloads com concorrência adaptativa, limitada a uma
+        # requisição a cada 10s para respeitar os limites do servidor
+        self.service = ImageCacheService()
+        self.service.download_gate = AdaptiveDownloadGate(
+            initial_limit=1, max_limit=self.max_concurrency, rate_per_host=0.1
+        )
+
         # Estatísticas
         self.stats = {
             'start_time': datetime.now(),
@@ -58,102 +67,54 @@ class StrategicCacheRecovery:
             )
         ).order_by(PokemonImageCache.pokemon_id).all()
 
-    def calculate_backoff_delay(self, attempt: int) -> int:
-        """Calcula delay exponencial com jitter."""
-        delay = min(
-            self.initial_delay * (2 ** attempt) + random.uniform(0, 30),
-            self.max_delay
+    async def fetch(self, job: DownloadJob) -> str:
+        """Baixa novamente uma imagem pendente pelo ImageCacheService."""
+        print(f"🔄 Tentativa {job.attempts}/{self.max_retries} para Pokémon #{job.pokemon_id} ({job.image_type})")
+
+        result = await self.service.retry_pokemon_image(self.session, job.pokemon_id, job.image_type)
+        if not result:
+            raise RuntimeError(f"download de #{job.pokemon_id} ({job.image_type}) falhou")
+
+        print(f"✅ Sucesso: Pokémon #{job.pokemon_id} (tentativa {job.attempts})")
+        return result
+
+    async def process_pending(self, pending: List[PokemonImageCache]) -> Dict:
+        """Processa as imagens pendentes pela fila de downloads."""
+        jobs = [DownloadJob(entry.pokemon_id, entry.image_type) for entry in pending[:self.daily_limit]]
+        if len(pending) > len(jobs):
+            print(f"⏸️ Limite diário: {len(jobs)} de {len(pending)} imagens neste ciclo")
+
+        scheduler = ImageDownloadScheduler(
+            self.fetch,
+            workers=self.max_concurrency,
+            max_attempts=self.max_retries,
+            retry_delay=self.initial_delay,
+            progress_path=self.progress_path
         )
-        return int(delay)
-
-    def should_continue_daily(self) -> bool:
-        """Verifica se ainda está dentro do limite diário."""
-        today_attempts = self.stats['total_attempted']
-        return today_attempts < self.daily_limit
-
-    async def retry_with_strategy(self, pokemon: PokemonImageCache) -> bool:
-        """Realiza retry inteligente com backoff exponencial usando requests direto."""
-        
-        for attempt in range(self.max_retries):
-            if not self.should_continue_daily():
-                print(f"⏸️ Limite diário atingido. Aguardando próximo ciclo.")
-                return False
-
-            delay = self.calculate_backoff_delay(attempt)
-            self.stats['total_wait_time'] += delay
-            
-            print(f"🔄 Tentativa {attempt + 1}/5 para Pokémon #{pokemon.pokemon_id} (delay: {delay}s)")
-            
-            await asyncio.sleep(delay)
-            
-            try:
-                # Baixar imagem diretamente da PokeAPI
-                image_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{pokemon.pokemon_id}.png"
-                response = requests.get(image_url, timeout=30)
-                
-                if response.status_code == 200:
-                    # Salvar imagem localmente
-                    image_dir = "pokemon_images"
-                    if not os.path.exists(image_dir):
-                        os.makedirs(image_dir)
-                    
-                    image_path = os.path.join(image_dir, f"{pokemon.pokemon_id}_official-artwork.png")
-                    with open(image_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    pokemon.is_downloaded = True
-                    pokemon.last_updated = datetime.now()
-                    self.session.commit()
-                    
-                    self.stats['successful_downloads'] += 1
-                    self.stats['retry_distribution'][attempt + 1] += 1
-                    
-                    print(f"✅ Sucesso: Pokémon #{pokemon.pokemon_id} (tentativa {attempt + 1})")
-                    return True
-                elif response.status_code == 429:
-                    print(f"⚠️ Rate limit atingido para Pokémon #{pokemon.pokemon_id}")
-                    return False
-                    
-            except Exception as e:
-                print(f"❌ Falha: Pokémon #{pokemon.pokemon_id} - {str(e)}")
-                
-                if attempt < self.max_retries - 1:
-                    print(f"⏳ Aguardando {delay}s antes de próxima tentativa...")
-                
-                continue
-
-        self.stats['failed_downloads'] += 1
-        return False
+        stats = await scheduler.run(jobs)
+
+        # Imagens que continuam falhando voltam para a fila persistente do
+        # CacheRecoveryEngine, que segue tentando com backoff
+        failed = [job for job in jobs if scheduler.results.get(job.key, {}).get('status') == 'failed']
+        if failed:
+            self.recovery_engine.reschedule_failed(self.session, failed, datetime.utcnow())
+
+        self.stats['total_attempted'] += len(jobs) - stats['resumed']
+        self.stats['successful_downloads'] += stats['success']
+        self.stats['failed_downloads'] += stats['failed']
+        for result in scheduler.results.values():
+            if result['status'] == 'success':
+                self.stats['retry_distribution'][result['attempts']] += 1
+            self.stats['total_wait_time'] += sum(
+                self.initial_delay * 2 ** attempt for attempt in range(result['attempts'] - 1)
+            )
 
-    async def process_batch(self, pokemon_list: List[PokemonImageCache]) -> Dict:
-        """Processa um lote de Pokémons com retry inteligente."""
-        batch_results = {
-            'processed': 0,
-            'successful': 0,
-            'failed': 0,
+        return {
+            'processed': len(jobs) - stats['resumed'],
+            'successful': stats['success'],
+            'failed': stats['failed'],
             'batch_id': f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         }
-        
-        print(f"🎯 Iniciando lote com {len(pokemon_list)} Pokémons")
-        
-        for i, pokemon in enumerate(pokemon_list):
-            if not self.should_continue_daily():
-                break
-                
-            self.stats['total_attempted'] += 1
-            batch_results['processed'] += 1
-            
-            success = await self.retry_with_strategy(pokemon)
-            if success:
-                batch_results['successful'] += 1
-            else:
-                batch_results['failed'] += 1
-            
-            # Pausa entre Pokémons
-            if i < len(pokemon_list) - 1:
-                await asyncio.sleep(random.uniform(5, 15))
-        
-        return batch_results
 
     def generate_recovery_report(self, batch_results: List[Dict]) -> Dict:
         """Gera relatório detalhado da recuperação."""
@@ -175,7 +136,7 @@ class StrategicCacheRecovery:
             'retry_analysis': {
                 'distribution': self.stats['retry_distribution'],
                 'average_wait_time': self.stats['total_wait_time'] / max(total_processed, 1),
-                'strategy_used': 'exponential_backoff_with_jitter'
+                'strategy_used': 'exponential_backoff_adaptive_queue'
             },
             'recommendations': self.generate_recommendations()
         }
@@ -208,7 +169,7 @@ class StrategicCacheRecovery:
         if current_coverage < 80:
             recommendations.append(f"🎯 Foco em alcançar 80% de cobertura (atual: {current_coverage}%)")
         
-        recommendations.append("🔄 Implementar retry automático diário para imagens pendentes")
+        recommendations.append("🩹 Imagens pendentes seguem na fila de recuperação do backend (/api/v1/images/recovery/status)")
         
         return recommendations
 
@@ -224,23 +185,9 @@ class StrategicCacheRecovery:
             return
         
         print(f"📊 Encontrados {len(failed_pokemon)} Pokémons para recuperar")
-        
-        # Processar em lotes
-        batches = [failed_pokemon[i:i+self.batch_size] 
-                  for i in range(0, len(failed_pokemon), self.batch_size)]
-        
-        batch_results = []
-        for batch in batches:
-            if not self.should_continue_daily():
-                print("🛑 Limite diário alcançado. Parando processamento.")
-                break
-                
-            result = await self.process_batch(batch)
-            batch_results.append(result)
-            
-            # Pausa entre lotes
-            await asyncio.sleep(random.uniform(30, 60))
-        
+
+        batch_results = [await self.process_pending(failed_pokemon)]
+
         # Gerar relatório final
         report = self.generate_recovery_report(batch_results)
         
@@ -287,6 +234,7 @@ async def main():
         print(f"❌ Erro durante recuperação: {str(e)}")
     finally:
         recovery.session.close()
+        await image_http_client.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
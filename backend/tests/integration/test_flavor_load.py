@@ -0,0 +1,100 @@
+"""
+Teste de carga da rota de flavor texts.
+
+Verifica que buscas lentas de espécie na PokeAPI não bloqueiam o event loop:
+outras rotas devem manter a latência enquanto várias requisições de flavor
+estão em andamento.
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.services.pokeapi_service import PokeAPIService
+from main import app
+
+UPSTREAM_DELAY = 0.5
+FLAVOR_REQUESTS = 10
+HEALTH_REQUESTS = 20
+
+
+def _species_data(pokemon_id: int) -> dict:
+    """Resposta mínima de /pokemon-species/{id}."""
+    return {
+        "id": pokemon_id,
+        "name": f"species-{pokemon_id}",
+        "flavor_text_entries": [
+            {"flavor_text": "It stores electricity.", "language": {"name": "en"}}
+        ]
+    }
+
+
+def _slow_pokeapi(upstream_calls: list) -> httpx.MockTransport:
+    """Transporte HTTP que simula uma PokeAPI lenta sem bloquear o event loop."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        upstream_calls.append(request.url.path)
+        await asyncio.sleep(UPSTREAM_DELAY)
+        pokemon_id = int(request.url.path.rstrip("/").split("/")[-1])
+        return httpx.Response(200, json=_species_data(pokemon_id))
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_other_routes_keep_latency_during_slow_flavor_calls():
+    """Testa que /health responde rápido enquanto chamadas de flavor aguardam a PokeAPI."""
+    transport = httpx.ASGITransport(app=app)
+    upstream_calls = []
+
+    # Serviço real (cache, single-flight e cliente HTTP), com a latência
+    # injetada no transporte do cliente e sem espelho persistente
+    service = PokeAPIService()
+    await service.client.aclose()
+    service.client = httpx.AsyncClient(transport=_slow_pokeapi(upstream_calls))
+
+    with patch('app.routes.pokemon.pokeapi_service', service):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+            async def flavor_call(pokemon_id):
+                response = await client.get(f"/api/v1/pokemon/{pokemon_id}/flavor?lang=en")
+                assert response.status_code == 200
+                return response
+
+            started = time.perf_counter()
+            flavor_tasks = [
+                asyncio.create_task(flavor_call(pokemon_id))
+                for pokemon_id in range(1, FLAVOR_REQUESTS + 1)
+            ]
+
+            # Aguarda as chamadas de flavor chegarem à PokeAPI simulada
+            await asyncio.sleep(0.05)
+
+            health_latencies = []
+            for _ in range(HEALTH_REQUESTS):
+                request_start = time.perf_counter()
+                response = await client.get("/health")
+                health_latencies.append(time.perf_counter() - request_start)
+                assert response.status_code == 200
+
+            health_done = time.perf_counter() - started
+            await asyncio.gather(*flavor_tasks)
+            flavor_done = time.perf_counter() - started
+
+            # Respostas já em cache não voltam à PokeAPI
+            await flavor_call(1)
+
+    await service.close()
+
+    # Cada espécie passou pelo caminho HTTP real uma única vez
+    assert len(upstream_calls) == FLAVOR_REQUESTS
+
+    # /health não deve esperar pelas chamadas lentas de flavor
+    assert max(health_latencies) < UPSTREAM_DELAY / 2
+    assert health_done < UPSTREAM_DELAY
+
+    # As chamadas de flavor correm em paralelo, não em série
+    assert flavor_done < UPSTREAM_DELAY * 3
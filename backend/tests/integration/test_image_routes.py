@@ -0,0 +1,142 @@
+"""
+Testes de integração para as rotas de imagens (ETag e requisições condicionais).
+"""
+import hashlib
+import os
+from email.utils import formatdate
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.image_cache_index import ImageIndexEntry
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 600
+PNG_HASH = hashlib.sha256(PNG).hexdigest()
+
+
+@pytest.fixture
+def image_entry(tmp_path):
+    """Fixture com uma imagem cacheada e seu hash de conteúdo."""
+    path = tmp_path / "25_official-artwork.png"
+    path.write_bytes(PNG)
+    return ImageIndexEntry(str(path), os.stat(path), PNG_HASH)
+
+
+class TestImageRoutes:
+    """Testes de integração para rotas de imagens."""
+
+    @patch('app.routes.images.image_cache_service.get_pokemon_image_entry')
+    def test_image_has_content_hash_etag(self, mock_get_entry, image_entry, client: TestClient):
+        """Testa que a imagem é servida com ETag do hash do conteúdo."""
+        mock_get_entry.return_value = image_entry
+
+        response = client.get("/api/v1/images/pokemon/25")
+
+        assert response.status_code == 200
+        assert response.content == PNG
+        assert response.headers["etag"] == f'"{PNG_HASH}"'
+
+    @patch('app.routes.images.image_cache_service.get_pokemon_image_entry')
+    def test_if_none_match_returns_304(self, mock_get_entry, image_entry, client: TestClient):
+        """Testa 304 quando o cliente já possui a versão atual."""
+        mock_get_entry.return_value = image_entry
+
+        response = client.get("/api/v1/images/pokemon/25", headers={"If-None-Match": f'"other", "{PNG_HASH}"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == f'"{PNG_HASH}"'
+
+        response = client.get("/api/v1/images/pokemon/25", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+
+    @patch('app.routes.images.image_cache_service.get_pokemon_image_entry')
+    def test_if_modified_since_returns_304(self, mock_get_entry, image_entry, client: TestClient):
+        """Testa 304 por data de modificação quando não há If-None-Match."""
+        mock_get_entry.return_value = image_entry
+
+        response = client.get(
+            "/api/v1/images/pokemon/25",
+            headers={"If-Modified-Since": formatdate(image_entry.mtime + 60, usegmt=True)}
+        )
+        assert response.status_code == 304
+
+        response = client.get(
+            "/api/v1/images/pokemon/25",
+            headers={"If-Modified-Since": formatdate(image_entry.mtime - 3600, usegmt=True)}
+        )
+        assert response.status_code == 200
+
+    def test_recovery_status(self, client: TestClient):
+        """Testa o status da recuperação de imagens pendentes."""
+        response = client.get("/api/v1/images/recovery/status")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["queue"]["pending"] == 0
+        assert "download_gate" in data
+
+    @patch('app.routes.images.image_cache_service.get_pokemon_image_entry')
+    def test_optimized_variant_negotiates_width_and_format(self, mock_get_entry, tmp_path, client: TestClient):
+        """Testa a variante responsiva com ?w= e formato negociado pelo Accept."""
+        from PIL import Image
+        from app.services.image_optimization_service import ImageOptimizationService
+
+        path = tmp_path / "25_official-artwork.png"
+        Image.new('RGBA', (475, 475), (255, 200, 0, 255)).save(path)
+        mock_get_entry.return_value = ImageIndexEntry(str(path), os.stat(path), PNG_HASH)
+        service = ImageOptimizationService(optimized_dir=str(tmp_path / "optimized"))
+
+        with patch('app.routes.images.image_optimization_service', service):
+            response = client.get(
+                "/api/v1/images/pokemon/25/optimized?w=90",
+                headers={"Accept": "image/webp,image/png;q=0.8"}
+            )
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "image/webp"
+            assert "Accept" in response.headers["vary"]
+            assert response.headers["etag"] == f'"{PNG_HASH}-96-medium.webp"'
+
+            cached = client.get(
+                "/api/v1/images/pokemon/25/optimized?w=90",
+                headers={"Accept": "image/webp", "If-None-Match": response.headers["etag"]}
+            )
+            assert cached.status_code == 304
+
+        with open(tmp_path / "variant.webp", "wb") as f:
+            f.write(response.content)
+        with Image.open(tmp_path / "variant.webp") as img:
+            assert img.size == (96, 96)
+
+    def test_sprite_atlas(self, tmp_path, client: TestClient):
+        """Testa o mapa do atlas e o download da imagem do atlas."""
+        from PIL import Image
+        from app.services.image_cache_service import ImageCacheService
+        from app.services.sprite_atlas_service import SpriteAtlasService
+
+        cache_service = ImageCacheService(cache_dir=str(tmp_path / "pokemon_images"))
+        for pokemon_id in (1, 2):
+            path = cache_service.cache_dir / f"{pokemon_id}_sprite.png"
+            Image.new('RGBA', (96, 96), (255, 0, 0, 255)).save(path)
+            cache_service.index.put(pokemon_id, 'sprite', str(path))
+        service = SpriteAtlasService(cache_service, atlas_dir=str(tmp_path / "atlases"))
+
+        with patch('app.routes.images.sprite_atlas_service', service), \
+                patch('app.routes.images._background_preload_images') as mock_preload:
+            response = client.get("/api/v1/images/atlas?start=1&end=3", headers={"Accept": "image/webp"})
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["missing"] == [3]
+            assert set(data["sprites"]) == {"1", "2"}
+            assert data["url"].endswith(f"/images/atlas/{data['file']}")
+            mock_preload.assert_called_once()
+
+            image = client.get(data["url"])
+            assert image.status_code == 200
+            assert image.headers["content-type"] == "image/webp"
+
+            assert client.get("/api/v1/images/atlas/../../etc.webp").status_code == 404
+            assert client.get("/api/v1/images/atlas?ids=1,x").status_code == 400
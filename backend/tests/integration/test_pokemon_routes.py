@@ -3,6 +3,8 @@ Testes de integração para rotas de Pokemon (proxy PokeAPI).
 """
 from unittest.mock import patch
 from fastapi.testclient import TestClient
+from app.services.pokeapi_service import POKEMON_SUMMARY_FIELDS
+from app.services.type_index_service import TypeIndex
 
 
 class TestPokemonRoutes:
@@ -85,6 +87,78 @@ class TestPokemonRoutes:
         assert response.status_code == 503
         assert "service unavailable" in response.json()["detail"]
 
+    @patch('app.routes.pokemon.type_index_service.get_index')
+    def test_type_effectiveness_and_members(self, mock_get_index, client: TestClient):
+        """Testa efetividade de tipos e Pokémons por tipo calculados localmente."""
+        index = TypeIndex()
+        index.build([
+            {"id": 10, "name": "fire",
+             "damage_relations": {"double_damage_to": [{"name": "grass"}], "half_damage_to": [{"name": "fire"}]},
+             "pokemon": [{"pokemon": {"name": "charmander", "url": "https://pokeapi.co/api/v2/pokemon/4/"}}]},
+            {"id": 12, "name": "grass",
+             "damage_relations": {"half_damage_to": [{"name": "fire"}, {"name": "grass"}]},
+             "pokemon": [{"pokemon": {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon/1/"}}]},
+        ])
+        mock_get_index.return_value = index
+
+        response = client.get("/api/v1/pokemon/types/effectiveness?defend=grass")
+        assert response.status_code == 200
+        assert response.json() == {"defend": ["grass"], "multipliers": {"fire": 2.0, "grass": 0.5}}
+
+        response = client.get("/api/v1/pokemon/types/effectiveness?defend=grass&attack=fire")
+        assert response.json()["multipliers"] == {"fire": 2.0}
+
+        response = client.get("/api/v1/pokemon/types/members?types=fire")
+        assert response.json() == {"types": ["fire"], "count": 1, "pokemon_ids": [4]}
+
+        assert client.get("/api/v1/pokemon/types/members?types=dragon").status_code == 404
+        assert client.get("/api/v1/pokemon/types/matrix").json()["matrix"] == [[0.5, 2.0], [0.5, 0.5]]
+
+    @patch('app.routes.pokemon.pokeapi_service.get_pokemon_projection')
+    def test_get_pokemon_summary_view(self, mock_get_projection, client: TestClient):
+        """Testa visão resumida e projeção de campos do Pokémon."""
+        mock_get_projection.return_value = {"id": 25, "name": "pikachu"}
+
+        response = client.get("/api/v1/pokemon/pikachu?view=summary")
+
+        assert response.status_code == 200
+        assert response.json() == {"id": 25, "name": "pikachu"}
+        mock_get_projection.assert_called_once_with("pikachu", POKEMON_SUMMARY_FIELDS)
+
+        mock_get_projection.reset_mock()
+        response = client.get("/api/v1/pokemon/25?fields=id, name")
+
+        assert response.status_code == 200
+        mock_get_projection.assert_called_once_with("25", ["id", "name"])
+
+    def test_get_pokemon_invalid_view(self, client: TestClient):
+        """Testa view inválida e fields vazio."""
+        assert client.get("/api/v1/pokemon/25?view=tiny").status_code == 400
+        assert client.get("/api/v1/pokemon/25?fields=,").status_code == 400
+
+    @patch('app.routes.pokemon.pokeapi_service.get_pokemon_batch')
+    def test_get_pokemon_batch(self, mock_get_batch, client: TestClient):
+        """Testa busca em lote com projeção de campos."""
+        mock_get_batch.return_value = [{"id": 1, "name": "bulbasaur"}, None]
+
+        response = client.post(
+            "/api/v1/pokemon/batch",
+            json={"ids": [1, "missingno"], "fields": ["id", "name"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [{"id": 1, "name": "bulbasaur"}],
+            "not_found": ["missingno"]
+        }
+        mock_get_batch.assert_called_once_with(["1", "missingno"], fields=["id", "name"])
+
+    def test_get_pokemon_batch_too_large(self, client: TestClient):
+        """Testa lote acima do tamanho máximo."""
+        response = client.post("/api/v1/pokemon/batch", json={"ids": list(range(1, 1000))})
+
+        assert response.status_code == 400
+
     @patch('app.routes.pokemon.pokeapi_service.get_pokemon_species')
     def test_get_pokemon_species_success(self, mock_get_species, client: TestClient):
         """Testa buscar espécie do Pokémon com sucesso."""
@@ -254,3 +328,35 @@ class TestPokemonRoutes:
         assert response.status_code == 200
         # Verifica se o limite foi respeitado (dependendo da implementação)
         mock_get_list.assert_called_once_with(limit=1000, offset=0)
+
+    @patch('app.routes.pokemon.pokeapi_service.get_pokemon_species')
+    def test_get_pokemon_flavor_uses_species_service(self, mock_get_species, client: TestClient):
+        """Testa que a rota de flavor usa o serviço de espécies compartilhado."""
+        mock_get_species.return_value = {
+            "id": 25,
+            "name": "pikachu",
+            "flavor_text_entries": [
+                {"flavor_text": "It stores\nelectricity.", "language": {"name": "en"}},
+                {"flavor_text": "It stores\felectricity.", "language": {"name": "en"}},
+                {"flavor_text": "Almacena electricidad.", "language": {"name": "es"}}
+            ]
+        }
+
+        response = client.get("/api/v1/pokemon/pikachu/flavor?lang=en")
+
+        assert response.status_code == 200
+        assert response.json() == {"flavors": ["It stores electricity."], "lang": "en"}
+        mock_get_species.assert_called_once_with("pikachu")
+
+        response = client.get("/api/v1/pokemon/pikachu/flavor?lang=es-ES")
+
+        assert response.json() == {"flavors": ["Almacena electricidad."], "lang": "es-ES"}
+
+    @patch('app.routes.pokemon.pokeapi_service.get_pokemon_species')
+    def test_get_pokemon_flavor_not_found(self, mock_get_species, client: TestClient):
+        """Testa flavor de Pokémon inexistente."""
+        mock_get_species.return_value = None
+
+        response = client.get("/api/v1/pokemon/nonexistent/flavor?lang=en")
+
+        assert response.status_code == 404
@@ -0,0 +1,101 @@
+"""
+Testes unitários para o motor de recuperação do cache de imagens.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.services.cache_recovery_service import CacheRecoveryEngine, backoff_delay
+from app.services.image_cache_service import ImageCacheService, PokemonImageCache
+
+
+@pytest.fixture
+def session_factory():
+    """Banco em memória com a tabela pokemon_image_cache."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    PokemonImageCache.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    with patch('app.core.database.SessionLocal', factory):
+        yield factory
+
+
+@pytest.fixture
+def recovery_engine(tmp_path):
+    """Motor de recuperação com diretório de cache temporário."""
+    return CacheRecoveryEngine(ImageCacheService(cache_dir=str(tmp_path / "pokemon_images")))
+
+
+def add_entry(db, pokemon_id, is_downloaded=False, next_attempt_at=None, attempts=1):
+    db.add(PokemonImageCache(
+        pokemon_id=pokemon_id,
+        image_type='official-artwork',
+        original_url=f"https://example.com/{pokemon_id}.png",
+        local_path=f"{pokemon_id}_official-artwork.png",
+        is_downloaded=is_downloaded,
+        download_attempts=attempts,
+        next_attempt_at=next_attempt_at
+    ))
+
+
+def test_backoff_delay_grows_with_jitter():
+    """Testa que a espera dobra a cada tentativa, com jitter e limite máximo."""
+    for attempts, expected in [(1, 60), (2, 120), (3, 240), (20, 3600)]:
+        delay = backoff_delay(attempts, base_delay=60, max_delay=3600)
+        assert expected / 2 <= delay <= expected
+
+
+class TestCacheRecoveryEngine:
+    """Testes para CacheRecoveryEngine."""
+
+    @pytest.mark.asyncio
+    async def test_run_cycle_recovers_and_reschedules(self, recovery_engine, session_factory):
+        """Testa que o ciclo baixa as imagens vencidas e reagenda as que falharam."""
+        db = session_factory()
+        add_entry(db, 300)
+        add_entry(db, 25)
+        add_entry(db, 1, is_downloaded=True)
+        add_entry(db, 7, next_attempt_at=datetime.utcnow() + timedelta(hours=1))
+        db.commit()
+
+        order = []
+
+        async def fake_retry(db, pokemon_id, image_type):
+            order.append(pokemon_id)
+            return f"{pokemon_id}.png" if pokemon_id == 25 else None
+
+        with patch.object(recovery_engine.service, 'retry_pokemon_image', side_effect=fake_retry):
+            result = await recovery_engine.run_cycle()
+
+        assert order[0] == 25
+        assert sorted(order) == [25, 300]
+        assert (result['processed'], result['recovered'], result['failed']) == (2, 1, 1)
+        assert result['failed_images'] == ['300:official-artwork']
+
+        db.expire_all()
+        entry = db.query(PokemonImageCache).filter(PokemonImageCache.pokemon_id == 300).one()
+        assert entry.next_attempt_at > datetime.utcnow()
+
+        queue = recovery_engine.get_queue_stats(db)
+        assert queue['pending'] == 3
+        assert queue['due'] == 1
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_run_cycle_is_exclusive(self, recovery_engine, session_factory):
+        """Testa que um ciclo não inicia enquanto outro está em andamento."""
+        recovery_engine.cycle_running = True
+
+        assert await recovery_engine.run_cycle() == {"status": "busy"}
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, recovery_engine):
+        """Testa início e parada da task em background."""
+        await recovery_engine.start()
+        assert recovery_engine.get_status()["running"] is True
+
+        await recovery_engine.stop()
+        assert recovery_engine.get_status()["running"] is False
@@ -0,0 +1,73 @@
+"""
+Testes unitários para ResponseCache.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.cache_utils import ResponseCache, CACHE_FRESH, CACHE_STALE, CACHE_MISS
+
+
+class TestResponseCache:
+    """Testes para ResponseCache."""
+
+    def test_get_miss(self):
+        """Testa leitura de chave inexistente."""
+        cache = ResponseCache()
+
+        assert cache.get("missing") == (None, CACHE_MISS)
+        assert cache.stats()["misses"] == 1
+
+    def test_set_and_get_fresh(self):
+        """Testa leitura de entrada dentro do TTL."""
+        cache = ResponseCache(default_ttl=60)
+        cache.set("pikachu", {"id": 25})
+
+        assert cache.get("pikachu") == ({"id": 25}, CACHE_FRESH)
+        assert cache.stats()["hits"] == 1
+
+    def test_stale_window(self):
+        """Testa que entradas expiradas são servidas como stale até o fim da janela."""
+        cache = ResponseCache(default_ttl=10, stale_ttl=100)
+        now = time.monotonic()
+
+        with patch("app.utils.cache_utils.time.monotonic", return_value=now):
+            cache.set("pikachu", "data")
+
+        with patch("app.utils.cache_utils.time.monotonic", return_value=now + 50):
+            assert cache.get("pikachu") == ("data", CACHE_STALE)
+
+        with patch("app.utils.cache_utils.time.monotonic", return_value=now + 111):
+            assert cache.get("pikachu") == (None, CACHE_MISS)
+
+        assert "pikachu" not in cache
+
+    def test_lru_eviction(self):
+        """Testa despejo da entrada menos usada recentemente."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_and_clear(self):
+        """Testa remoção de entradas."""
+        cache = ResponseCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.invalidate("a") is True
+        assert cache.invalidate("a") is False
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_max_entries(self):
+        """Testa validação do tamanho máximo."""
+        with pytest.raises(ValueError):
+            ResponseCache(max_entries=0)
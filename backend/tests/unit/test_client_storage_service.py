@@ -0,0 +1,81 @@
+"""
+Testes unitários para o ClientStorageService: aplicação incremental das
+capturas e persistência em log de eventos com snapshots.
+"""
+import json
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.client_storage_service import ClientStorageService
+
+
+def test_apply_client_changes_updates_counts_incrementally(tmp_path):
+    """Testa que apenas os pokémons alterados são atualizados nas contagens."""
+    storage = ClientStorageService(str(tmp_path / "client_storage.json"))
+
+    storage.apply_client_changes("ash", {25: True, 1: True}, cursor="2024-01-01T10:00:00")
+    storage.apply_client_changes("misty", {25: True, 7: True})
+    stats = storage.apply_client_changes("ash", {1: False, 4: True, 25: True}, cursor="2024-01-01T11:00:00")
+
+    assert stats["added_pokemons"] == [4]
+    assert stats["removed_pokemons"] == [1]
+    assert storage.get_pokemon_counts() == {25: 2, 7: 1, 4: 1}
+    assert storage.get_ranking_data(limit=1) == [(25, 2)]
+
+
+def test_cursors_are_persisted(tmp_path):
+    """Testa que cursores e contagens sobrevivem a uma nova instância."""
+    path = str(tmp_path / "client_storage.json")
+    ClientStorageService(path).apply_client_changes("ash", {25: True}, cursor="2024-01-01T10:00:00")
+
+    storage = ClientStorageService(path)
+
+    assert storage.get_sync_cursor("ash") == "2024-01-01T10:00:00"
+    assert storage.get_pokemon_counts() == {25: 1}
+
+    storage.clear_storage()
+    assert storage.get_sync_cursor("ash") is None
+
+
+def test_changes_are_appended_and_compacted(tmp_path):
+    """Testa que cada alteração vira uma linha no log até a compactação."""
+    path = tmp_path / "client_storage.json"
+    storage = ClientStorageService(str(path))
+
+    with patch.object(settings, 'client_storage_compact_events', 3):
+        storage.apply_client_changes("ash", {25: True})
+        storage.apply_client_changes("ash", {1: True})
+        assert len(storage.event_log.log_path.read_text().splitlines()) == 2
+        assert not path.exists()
+
+        storage.remove_client("ash")
+
+    assert storage.event_log.log_path.read_text() == ""
+    assert json.loads(path.read_text())["last_seq"] == 3
+    assert ClientStorageService(str(path)).get_storage_stats()["total_clients"] == 0
+
+
+def test_replay_ignores_events_already_in_snapshot(tmp_path):
+    """Testa a queda entre a gravação do snapshot e o esvaziamento do log."""
+    path = tmp_path / "client_storage.json"
+    storage = ClientStorageService(str(path))
+    storage.apply_client_changes("ash", {25: True})
+    log_content = storage.event_log.log_path.read_text()
+    storage._save_storage()
+    storage.event_log.log_path.write_text(log_content)  # Log não foi esvaziado
+
+    assert ClientStorageService(str(path)).get_pokemon_counts() == {25: 1}
+
+
+def test_incomplete_last_event_is_discarded(tmp_path):
+    """Testa que uma linha parcialmente gravada é descartada e removida do log."""
+    path = tmp_path / "client_storage.json"
+    ClientStorageService(str(path)).apply_client_changes("ash", {25: True})
+    log_path = tmp_path / "client_storage.log"
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write('{"op":"changes","user_id":"ash","added":[1')
+
+    storage = ClientStorageService(str(path))
+    storage.apply_client_changes("ash", {4: True})
+
+    assert ClientStorageService(str(path)).get_client_captures("ash") == [4, 25]
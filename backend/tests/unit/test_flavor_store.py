@@ -0,0 +1,75 @@
+"""
+Testes unitários para o armazenamento compacto de flavor texts.
+"""
+import json
+import os
+
+import pytest
+
+from app.services.flavor_store import FlavorStore, build_flavor_index, get_flavor_store
+
+
+@pytest.fixture
+def flavors_json(tmp_path):
+    """Fixture com um arquivo de flavors em JSON."""
+    path = tmp_path / "flavors_test.json"
+    path.write_text(json.dumps({
+        "25": ["Ele armazena eletricidade.", "Bochechas elétricas ⚡"],
+        "1": ["Uma semente estranha."],
+        "10001": [],
+        "150": ["Criado geneticamente."]
+    }, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+class TestFlavorStore:
+    """Testes para FlavorStore."""
+
+    def test_build_and_lookup(self, flavors_json, tmp_path):
+        """Testa geração do índice e consulta por ID."""
+        bin_path = str(tmp_path / "flavors_test.bin")
+        assert build_flavor_index(flavors_json, bin_path) == 4
+
+        store = FlavorStore("pt-BR", flavors_json, bin_path)
+
+        assert store.get(25) == ["Ele armazena eletricidade.", "Bochechas elétricas ⚡"]
+        assert store.get(1) == ["Uma semente estranha."]
+        assert store.get(150) == ["Criado geneticamente."]
+        assert store.get(10001) == []
+        assert store.get(999) == []
+        assert len(store) == 4
+        store.close()
+
+    def test_lazy_build_on_first_use(self, flavors_json):
+        """Testa que o índice só é gerado na primeira consulta."""
+        store = FlavorStore("pt-BR", flavors_json)
+
+        assert not os.path.exists(store.bin_path)
+        assert store.get(1) == ["Uma semente estranha."]
+        assert os.path.exists(store.bin_path)
+        store.close()
+
+    def test_rebuild_when_json_is_newer(self, flavors_json, tmp_path):
+        """Testa que um índice desatualizado é regenerado."""
+        store = FlavorStore("pt-BR", flavors_json)
+        store.get(1)
+        store.close()
+
+        with open(flavors_json, "w", encoding="utf-8") as f:
+            json.dump({"1": ["Texto novo."]}, f)
+        stat = os.stat(store.bin_path)
+        os.utime(flavors_json, (stat.st_atime + 10, stat.st_mtime + 10))
+
+        assert store.get(1) == ["Texto novo."]
+        store.close()
+
+    def test_missing_source(self, tmp_path):
+        """Testa idioma sem arquivo de origem."""
+        store = FlavorStore("xx", str(tmp_path / "missing.json"))
+
+        assert store.get(25) == []
+
+    def test_get_flavor_store_registry(self):
+        """Testa o registro de índices por idioma."""
+        assert get_flavor_store("pt-BR") is get_flavor_store("pt-BR")
+        assert get_flavor_store("klingon") is None
@@ -0,0 +1,86 @@
+"""
+Testes unitários para o armazenamento de imagens endereçado por conteúdo.
+"""
+import hashlib
+import os
+import time
+
+from app.services.image_blob_store import ImageBlobStore
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 600
+GIF = b'GIF89a' + b'\x00' * 600
+
+
+def stage(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path), hashlib.sha256(content).hexdigest()
+
+
+def test_store_deduplicates_identical_content(tmp_path):
+    """Testa que o mesmo conteúdo é armazenado uma única vez."""
+    store = ImageBlobStore(tmp_path / "blobs")
+
+    first, deduplicated = store.store(*stage(tmp_path, "25.png", PNG))
+    second, deduplicated_again = store.store(*stage(tmp_path, "10080.png", PNG))
+
+    assert first == second
+    assert (deduplicated, deduplicated_again) == (False, True)
+    assert first == str(store.blob_path(hashlib.sha256(PNG).hexdigest()))
+    assert not (tmp_path / "10080.png").exists()
+    assert store.get_stats()["blobs"] == 1
+
+
+def test_extension_follows_content(tmp_path):
+    """Testa que a extensão do blob segue o formato detectado."""
+    store = ImageBlobStore(tmp_path / "blobs")
+
+    path, _ = store.store(*stage(tmp_path, "1.png", GIF))
+
+    assert path.endswith(".gif")
+    assert store.contains(path)
+    assert not store.contains(str(tmp_path / "1.png"))
+
+
+def test_store_keep_source_links_file(tmp_path):
+    """Testa que keep_source mantém o arquivo original ao armazenar o blob."""
+    store = ImageBlobStore(tmp_path / "blobs")
+    source, content_hash = stage(tmp_path, "25.png", PNG)
+
+    path, deduplicated = store.store(source, content_hash, keep_source=True)
+    again, deduplicated_again = store.store(source, content_hash, keep_source=True)
+
+    assert not deduplicated and deduplicated_again
+    assert path == again
+    assert open(source, 'rb').read() == open(path, 'rb').read() == PNG
+
+
+def test_verify_compares_hash_with_name(tmp_path):
+    """Testa que a verificação detecta conteúdo alterado."""
+    store = ImageBlobStore(tmp_path / "blobs")
+    path, _ = store.store(*stage(tmp_path, "25.png", PNG))
+
+    assert store.verify(path)
+
+    with open(path, 'ab') as f:
+        f.write(b'\x00')
+    assert not store.verify(path)
+
+
+def test_collect_garbage_removes_unreferenced_old_blobs(tmp_path):
+    """Testa que apenas blobs sem referência e fora da carência são removidos."""
+    store = ImageBlobStore(tmp_path / "blobs")
+    referenced, _ = store.store(*stage(tmp_path, "1.png", PNG))
+    orphan, _ = store.store(*stage(tmp_path, "2.png", GIF))
+    recent, _ = store.store(*stage(tmp_path, "3.png", PNG + b'\x01'))
+
+    old = time.time() - 7200
+    for path in (referenced, orphan):
+        os.utime(path, (old, old))
+
+    stats = store.collect_garbage([referenced], grace_seconds=3600)
+
+    assert stats == {"blobs": 3, "removed": 1, "freed_bytes": len(GIF)}
+    assert os.path.exists(referenced)
+    assert os.path.exists(recent)
+    assert not os.path.exists(orphan)
@@ -0,0 +1,117 @@
+"""
+Testes unitários para o índice em memória de imagens cacheadas.
+"""
+import hashlib
+import os
+
+import pytest
+
+from app.services.image_cache_index import ImageCacheIndex, get_image_index
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 600
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    """Fixture com um arquivo PNG válido."""
+    path = tmp_path / "25_official-artwork.png"
+    path.write_bytes(PNG)
+    return path
+
+
+def test_put_and_get(image_file):
+    """Testa indexação de uma imagem existente."""
+    index = ImageCacheIndex()
+
+    entry = index.put(25, "official-artwork", str(image_file))
+
+    assert index.get(25, "official-artwork") is entry
+    assert entry.path == str(image_file)
+    assert entry.size == len(PNG)
+    assert entry.etag.startswith('W/"')
+    assert index.put(25, "official-artwork", str(image_file), "abc123").etag == '"abc123"'
+    assert (25, "official-artwork") in index
+    assert index.get(25, "sprite") is None
+
+
+def test_put_missing_file_invalidates(image_file, tmp_path):
+    """Testa que indexar um arquivo inexistente remove a entrada anterior."""
+    index = ImageCacheIndex()
+    index.put(25, "official-artwork", str(image_file))
+
+    assert index.put(25, "official-artwork", str(tmp_path / "missing.png")) is None
+    assert len(index) == 0
+
+
+def test_verify_removes_invalid_and_refreshes_changed(image_file, tmp_path):
+    """Testa verificação: arquivos removidos saem do índice e alterados são reindexados."""
+    other = tmp_path / "1_official-artwork.png"
+    other.write_bytes(PNG)
+    index = ImageCacheIndex()
+    index.put(25, "official-artwork", str(image_file))
+    index.put(1, "official-artwork", str(other))
+    mtime_ns = index.get(25, "official-artwork").stat.st_mtime_ns
+
+    os.remove(other)
+    os.utime(image_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    removed = index.verify(lambda path, size: True)
+
+    assert removed == 1
+    assert index.get(1, "official-artwork") is None
+    assert index.get(25, "official-artwork").stat.st_mtime_ns == mtime_ns + 10**9
+
+
+def test_verify_removes_file_with_different_size(image_file):
+    """Testa que um arquivo truncado ou sobrescrito com outro tamanho é removido."""
+    index = ImageCacheIndex()
+    index.put(25, "official-artwork", str(image_file))
+    expected_sizes = []
+
+    image_file.write_bytes(PNG[:10])
+
+    assert index.verify(lambda path, size: expected_sizes.append(size) or True) == 1
+    assert index.get(25, "official-artwork") is None
+    assert expected_sizes == []
+
+
+def test_verify_uses_validator(image_file):
+    """Testa que entradas alteradas e reprovadas pelo validador são removidas."""
+    index = ImageCacheIndex()
+    index.put(25, "official-artwork", str(image_file))
+    mtime_ns = index.get(25, "official-artwork").stat.st_mtime_ns
+    os.utime(image_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    assert index.verify(lambda path, size: False) == 1
+    assert len(index) == 0
+
+
+def test_verify_skips_unchanged_files(image_file):
+    """Testa que arquivos inalterados desde a indexação não são validados de novo."""
+    index = ImageCacheIndex()
+    index.put(25, "official-artwork", str(image_file), "abc123")
+    validated = []
+
+    assert index.verify(lambda path, size: validated.append(path) or False) == 0
+    assert validated == []
+    assert index.get(25, "official-artwork").content_hash == "abc123"
+
+
+def test_get_image_index_shared_per_directory(tmp_path):
+    """Testa que o mesmo diretório compartilha o mesmo índice."""
+    assert get_image_index(tmp_path / "a") is get_image_index(tmp_path / "a")
+    assert get_image_index(tmp_path / "a") is not get_image_index(tmp_path / "b")
+
+
+def test_verify_keeps_hash_of_blob_with_new_mtime(tmp_path):
+    """Testa que um blob reaproveitado (data renovada) mantém o hash e o ETag forte."""
+    content_hash = hashlib.sha256(PNG).hexdigest()
+    blob = tmp_path / f"{content_hash}.png"
+    blob.write_bytes(PNG)
+    index = ImageCacheIndex()
+    index.put(25, "sprite", str(blob), content_hash)
+    mtime_ns = index.get(25, "sprite").stat.st_mtime_ns
+    os.utime(blob, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    assert index.verify(lambda path, size: True) == 0
+    assert index.get(25, "sprite").etag == f'"{content_hash}"'
@@ -0,0 +1,342 @@
+"""
+Testes unitários para ImageCacheService.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.services.image_cache_service import ImageCacheService, PokemonImageCache, ensure_image_cache_schema
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 600
+
+
+class FakeStream:
+    """Corpo de resposta que entrega o conteúdo em blocos."""
+
+    def __init__(self, content):
+        self.content = content
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.content), size):
+            yield self.content[start:start + size]
+
+
+class FakeResponse:
+    """Resposta aiohttp mínima para os testes de download."""
+
+    def __init__(self, content, status=200):
+        self.status = status
+        self.content_length = len(content)
+        self.content = FakeStream(content)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+def fake_http_client(response):
+    """Cliente HTTP cuja sessão sempre devolve a resposta informada."""
+    session = MagicMock()
+    session.get.return_value = response
+    client = MagicMock()
+
+    async def get_session():
+        return session
+
+    client.get_session = get_session
+    return client
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Fixture para serviço com diretório de cache temporário."""
+    return ImageCacheService(cache_dir=str(tmp_path / "pokemon_images"))
+
+
+class TestImageCacheService:
+    """Testes para ImageCacheService."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_downloads_are_coalesced(self, service):
+        """Testa que downloads concorrentes da mesma imagem executam uma vez."""
+        calls = 0
+
+        async def fake_download(db, pokemon_id, image_type, ignore_retry_window=False):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"{pokemon_id}_{image_type}.png"
+
+        with patch.object(service, '_perform_pokemon_image_download', side_effect=fake_download):
+            results = await asyncio.gather(*[
+                service._download_pokemon_image(MagicMock(), 25, 'official-artwork')
+                for _ in range(5)
+            ])
+
+        assert calls == 1
+        assert results == ["25_official-artwork.png"] * 5
+
+    @pytest.mark.asyncio
+    async def test_indexed_image_skips_database(self, service):
+        """Testa que imagens indexadas são servidas sem consultar o banco."""
+        path = service.cache_dir / "25_official-artwork.png"
+        path.write_bytes(PNG)
+        service.index.put(25, 'official-artwork', str(path))
+        db = MagicMock()
+
+        result = await service.get_pokemon_image(db, 25, 'official-artwork')
+
+        assert result == str(path)
+        db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_database_hit_is_indexed(self, service):
+        """Testa que uma imagem encontrada no banco passa a ser indexada."""
+        path = service.cache_dir / "25_official-artwork.png"
+        path.write_bytes(PNG)
+        cache_entry = PokemonImageCache(
+            pokemon_id=25, image_type='official-artwork', original_url="url",
+            local_path=str(path), file_size=len(PNG), is_downloaded=True
+        )
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = cache_entry
+
+        entry = await service.get_pokemon_image_entry(db, 25, 'official-artwork')
+
+        assert entry.path == str(path)
+        assert entry.size == len(PNG)
+        assert service.index.get(25, 'official-artwork') is entry
+
+    def test_load_and_verify_index(self, service, tmp_path):
+        """Testa carga do índice a partir do banco e remoção de arquivos corrompidos."""
+        valid = service.cache_dir / "1_official-artwork.png"
+        valid.write_bytes(PNG)
+        corrupted = service.cache_dir / "4_official-artwork.png"
+        corrupted.write_bytes(PNG)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            (1, 'official-artwork', str(valid), "abc123"),
+            (4, 'official-artwork', str(corrupted), None),
+            (7, 'official-artwork', str(service.cache_dir / "missing.png"), None),
+            (9, 'official-artwork', str(tmp_path / "elsewhere.png"), None),
+        ]
+
+        assert service.load_index(db) == 2
+        assert service.index.get(1, 'official-artwork').etag == '"abc123"'
+
+        corrupted.write_bytes(b'not an image' * 100)
+        assert service.verify_index() == 1
+        assert service.index.get(1, 'official-artwork') is not None
+        assert service.index.get(4, 'official-artwork') is None
+
+    @pytest.mark.asyncio
+    async def test_download_stores_content_hash(self, service):
+        """Testa que o hash do download é salvo no banco e usado como ETag no índice."""
+        content_hash = hashlib.sha256(PNG).hexdigest()
+
+        async def fake_download(url, local_path):
+            local_path.write_bytes(PNG)
+            return content_hash
+
+        blob_path = str(service.blob_store.blob_path(content_hash))
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.side_effect = [
+            None,
+            MagicMock(local_path=blob_path)
+        ]
+
+        with patch.object(service, '_download_image', side_effect=fake_download):
+            result = await service._perform_pokemon_image_download(db, 25, 'official-artwork')
+
+        assert result == blob_path
+        assert db.add.call_args[0][0].content_hash == content_hash
+        assert db.add.call_args[0][0].local_path == blob_path
+        assert service.index.get(25, 'official-artwork').etag == f'"{content_hash}"'
+        assert not (service.cache_dir / "25_official-artwork.png").exists()
+
+    @pytest.mark.asyncio
+    async def test_identical_downloads_share_blob(self, service):
+        """Testa que imagens com o mesmo conteúdo apontam para o mesmo arquivo."""
+        content_hash = hashlib.sha256(PNG).hexdigest()
+
+        async def fake_download(url, local_path):
+            local_path.write_bytes(PNG)
+            return content_hash
+
+        stored = MagicMock(local_path=str(service.blob_store.blob_path(content_hash)))
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.side_effect = [None, stored, None, stored]
+        paths = []
+
+        with patch.object(service, '_download_image', side_effect=fake_download):
+            for pokemon_id in (25, 10080):
+                paths.append(await service._perform_pokemon_image_download(db, pokemon_id, 'sprite'))
+
+        assert paths[0] == paths[1]
+        assert [p.name for p in service.cache_dir.rglob("*") if p.is_file()] == [f"{content_hash}.png"]
+
+    def test_blob_integrity_uses_content_hash(self, service, tmp_path):
+        """Testa que a integridade de um blob é verificada pelo hash do conteúdo."""
+        staging = service.cache_dir / "25_sprite.png"
+        staging.write_bytes(PNG)
+        blob_path, _ = service.blob_store.store(str(staging), hashlib.sha256(PNG).hexdigest())
+
+        assert service._verify_image_integrity(blob_path, len(PNG)) is True
+
+        with open(blob_path, 'r+b') as f:
+            f.seek(100)
+            f.write(b'\x01')
+        assert service._verify_image_integrity(blob_path, len(PNG)) is False
+
+    def test_migrate_legacy_files(self, service):
+        """Testa que imagens com nome antigo são migradas para blobs e deduplicadas."""
+        for name in ("25_sprite.png", "10080_sprite.png"):
+            (service.cache_dir / name).write_bytes(PNG)
+        service.index.put(25, 'sprite', str(service.cache_dir / "25_sprite.png"))
+        service.index.put(10080, 'sprite', str(service.cache_dir / "10080_sprite.png"))
+
+        with patch('app.core.database.SessionLocal') as mock_session_local:
+            assert service.migrate_legacy_files() == 2
+            mock_session_local.return_value.commit.assert_called_once()
+
+        blob_path = str(service.blob_store.blob_path(hashlib.sha256(PNG).hexdigest()))
+        assert service.index.get(25, 'sprite').path == blob_path
+        assert service.index.get(10080, 'sprite').path == blob_path
+        assert (service.cache_dir / "25_sprite.png").read_bytes() == PNG
+        assert service.migrate_legacy_files() == 0
+
+        with patch('app.core.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value.query.return_value.all.return_value = [(blob_path,)]
+            assert service.collect_garbage(grace_seconds=3600)["legacy_removed"] == 0
+            assert service.collect_garbage(grace_seconds=0)["legacy_removed"] == 2
+
+        assert not (service.cache_dir / "25_sprite.png").exists()
+        assert os.path.exists(blob_path)
+
+    def test_migration_keeps_strong_etag(self, service):
+        """Testa que a migração e a verificação seguinte mantêm o ETag forte."""
+        (service.cache_dir / "25_sprite.png").write_bytes(PNG)
+        service.index.put(25, 'sprite', str(service.cache_dir / "25_sprite.png"))
+
+        with patch('app.core.database.SessionLocal'):
+            service.migrate_legacy_files()
+        service.verify_index()
+
+        assert service.index.get(25, 'sprite').etag == f'"{hashlib.sha256(PNG).hexdigest()}"'
+
+    def test_garbage_collection_keeps_unmigrated_legacy_files(self, service):
+        """Testa que imagens antigas sem registro no banco e não migradas nunca são removidas."""
+        legacy = service.cache_dir / "25_sprite.png"
+        legacy.write_bytes(PNG)
+        old = time.time() - 7200
+        os.utime(legacy, (old, old))
+
+        with patch('app.core.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value.query.return_value.all.return_value = []
+            assert service.collect_garbage(grace_seconds=3600)["legacy_removed"] == 0
+
+        assert legacy.read_bytes() == PNG
+
+    def test_migrate_keeps_index_when_commit_fails(self, service):
+        """Testa que o índice só aponta para o blob depois do commit no banco."""
+        legacy = service.cache_dir / "25_sprite.png"
+        legacy.write_bytes(PNG)
+        service.index.put(25, 'sprite', str(legacy))
+
+        with patch('app.core.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value.commit.side_effect = RuntimeError("db fora do ar")
+            assert service.migrate_legacy_files() == 0
+
+        assert service.index.get(25, 'sprite').path == str(legacy)
+        assert legacy.exists()
+
+    def test_backfill_content_hashes(self, service):
+        """Testa cálculo do hash de imagens indexadas sem hash."""
+        path = service.cache_dir / "25_official-artwork.png"
+        path.write_bytes(PNG)
+        service.index.put(25, 'official-artwork', str(path))
+        assert service.index.get(25, 'official-artwork').etag.startswith('W/')
+
+        with patch('app.core.database.SessionLocal') as mock_session_local:
+            assert service.backfill_content_hashes() == 1
+            mock_session_local.return_value.commit.assert_called_once()
+
+        assert service.index.get(25, 'official-artwork').etag == f'"{hashlib.sha256(PNG).hexdigest()}"'
+        assert service.backfill_content_hashes() == 0
+
+    @pytest.mark.asyncio
+    async def test_download_image_streams_to_disk(self, service):
+        """Testa que o download é gravado em blocos e renomeado para o destino."""
+        service.http_client = fake_http_client(FakeResponse(PNG))
+        service.download_chunk_size = 100
+        local_path = service.cache_dir / "25_official-artwork.png"
+
+        result = await service._download_image("https://example.com/25.png", local_path)
+
+        assert result == hashlib.sha256(PNG).hexdigest()
+        assert local_path.read_bytes() == PNG
+        assert [path.name for path in service.cache_dir.iterdir()] == [local_path.name]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response", [
+        FakeResponse(b'<html>' + b'\x00' * 600),
+        FakeResponse(PNG[:100]),
+        FakeResponse(PNG, status=404),
+    ])
+    async def test_download_image_rejects_invalid_content(self, service, response):
+        """Testa que downloads inválidos não deixam arquivos no diretório."""
+        service.http_client = fake_http_client(response)
+        service.download_chunk_size = 8
+        local_path = service.cache_dir / "25_official-artwork.png"
+
+        assert await service._download_image("https://example.com/25.png", local_path) is None
+        assert list(service.cache_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_download_image_enforces_max_size(self, service):
+        """Testa que imagens acima do limite são descartadas durante o download."""
+        response = FakeResponse(PNG)
+        response.content_length = None
+        service.http_client = fake_http_client(response)
+        service.download_chunk_size = 64
+        service.max_image_bytes = 256
+
+        assert await service._download_image("https://example.com/25.png", service.cache_dir / "25.png") is None
+        assert list(service.cache_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_retry_pokemon_image_ignores_retry_window(self, service):
+        """Testa que retry_pokemon_image baixa mesmo após tentativas recentes."""
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = MagicMock(
+            download_attempts=3, last_attempt=datetime.utcnow()
+        )
+
+        with patch.object(service, '_download_image', return_value=None) as mock_download:
+            assert await service._perform_pokemon_image_download(db, 25, 'official-artwork') is None
+            mock_download.assert_not_called()
+
+            await service.retry_pokemon_image(db, 25, 'official-artwork')
+            mock_download.assert_called_once()
+
+
+def test_ensure_image_cache_schema_adds_content_hash():
+    """Testa a adição idempotente da coluna content_hash em tabelas antigas."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE pokemon_image_cache (id INTEGER PRIMARY KEY, pokemon_id INTEGER)"))
+
+    ensure_image_cache_schema(engine)
+    ensure_image_cache_schema(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("pokemon_image_cache")}
+    assert {"content_hash", "next_attempt_at"} <= columns
@@ -0,0 +1,180 @@
+"""
+Testes unitários para o agendador de downloads de imagens.
+"""
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.image_cache_service import ImageCacheService
+from app.services.image_download_scheduler import (
+    AdaptiveDownloadGate,
+    DownloadJob,
+    ImageDownloadScheduler,
+    build_jobs,
+)
+
+URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/25.png"
+
+
+class TestAdaptiveDownloadGate:
+    """Testes para o controle de concorrência AIMD."""
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_on_fast_success(self):
+        """Testa que downloads rápidos aumentam o limite aos poucos."""
+        gate = AdaptiveDownloadGate(initial_limit=2, max_limit=4, rate_per_host=0)
+
+        for _ in range(4):
+            await gate.acquire(URL)
+            gate.release(URL, 200, 0.1)
+
+        assert 3 <= gate.limit <= 4
+        assert gate.in_flight == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status, elapsed", [(429, 0.1), (503, 0.1), (None, 0.1), (200, 60.0)])
+    async def test_multiplicative_decrease_on_congestion(self, status, elapsed):
+        """Testa que 429, 5xx, erros de rede e lentidão reduzem o limite pela metade."""
+        gate = AdaptiveDownloadGate(initial_limit=8, max_limit=8, rate_per_host=0, target_latency=5)
+
+        await gate.acquire(URL)
+        gate.release(URL, status, elapsed)
+
+        assert gate.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_burst_of_failures_counts_once(self):
+        """Testa que falhas simultâneas geram uma única redução."""
+        gate = AdaptiveDownloadGate(initial_limit=8, max_limit=8, rate_per_host=0, decrease_interval=60)
+
+        for _ in range(3):
+            await gate.acquire(URL)
+        for _ in range(3):
+            gate.release(URL, 503, 0.1)
+
+        assert gate.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_downloads(self):
+        """Testa que o número de downloads simultâneos respeita o limite."""
+        gate = AdaptiveDownloadGate(initial_limit=2, max_limit=2, rate_per_host=0)
+        peak = 0
+
+        async def download():
+            nonlocal peak
+            await gate.acquire(URL)
+            peak = max(peak, gate.in_flight)
+            await asyncio.sleep(0.01)
+            gate.release(URL, 200, 0.01)
+
+        await asyncio.gather(*[download() for _ in range(6)])
+
+        assert peak == 2
+        assert gate.in_flight == 0
+
+    def test_rate_per_host_spaces_requests(self):
+        """Testa que requisições ao mesmo host são espaçadas e hosts diferentes não."""
+        gate = AdaptiveDownloadGate(rate_per_host=10)
+
+        assert gate._reserve_slot("a.example") == 0
+        assert gate._reserve_slot("a.example") == pytest.approx(0.1, abs=0.01)
+        assert gate._reserve_slot("b.example") == 0
+
+
+class TestImageDownloadScheduler:
+    """Testes para a fila de downloads."""
+
+    @pytest.mark.asyncio
+    async def test_runs_gen1_first(self):
+        """Testa que a Geração 1 é processada antes dos demais."""
+        order = []
+
+        async def fetch(job):
+            order.append(job.pokemon_id)
+            return f"{job.pokemon_id}.png"
+
+        scheduler = ImageDownloadScheduler(fetch, workers=1)
+        stats = await scheduler.run(build_jobs([300, 25, 152, 1], ['official-artwork']))
+
+        assert order == [25, 1, 300, 152]
+        assert stats['success'] == 4
+
+    @pytest.mark.asyncio
+    async def test_retries_failures_with_backoff(self):
+        """Testa que falhas são repetidas até max_attempts."""
+        calls = {}
+
+        async def fetch(job):
+            calls[job.pokemon_id] = calls.get(job.pokemon_id, 0) + 1
+            if job.pokemon_id == 1 and calls[1] < 2:
+                raise RuntimeError("503")
+            if job.pokemon_id == 2:
+                raise RuntimeError("404")
+            return None if job.pokemon_id == 3 else "ok.png"
+
+        scheduler = ImageDownloadScheduler(fetch, workers=2, max_attempts=3, retry_delay=0)
+        stats = await scheduler.run([DownloadJob(1), DownloadJob(2), DownloadJob(3)])
+
+        assert calls == {1: 2, 2: 3, 3: 1}
+        assert (stats['success'], stats['failed'], stats['skipped']) == (1, 1, 1)
+        assert scheduler.results['1:official-artwork'] == {'status': 'success', 'attempts': 2, 'path': 'ok.png'}
+        assert scheduler.results['2:official-artwork']['status'] == 'failed'
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_progress_file(self, tmp_path):
+        """Testa que jobs concluídos em uma execução anterior não são repetidos."""
+        progress_path = tmp_path / "progress.json"
+        fetched = []
+
+        async def fetch(job):
+            fetched.append(job.pokemon_id)
+            if job.pokemon_id == 2:
+                raise RuntimeError("falhou")
+            return "ok.png"
+
+        jobs = lambda: build_jobs([1, 2, 3], ['official-artwork'])  # noqa: E731
+        scheduler = ImageDownloadScheduler(fetch, workers=1, max_attempts=1, progress_path=str(progress_path))
+        await scheduler.run(jobs())
+
+        saved = json.loads(progress_path.read_text())
+        assert saved['completed'] == ['1:official-artwork', '3:official-artwork']
+        assert saved['failed'] == ['2:official-artwork']
+
+        fetched.clear()
+        stats = await scheduler.run(jobs())
+
+        assert fetched == [2]
+        assert stats['resumed'] == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves_pending_jobs(self):
+        """Testa que parar o agendador encerra a execução sem processar o restante."""
+        scheduler = None
+        fetched = []
+
+        async def fetch(job):
+            fetched.append(job.pokemon_id)
+            scheduler.stop()
+            return "ok.png"
+
+        scheduler = ImageDownloadScheduler(fetch, workers=1)
+        stats = await scheduler.run(build_jobs([1, 2, 3], ['official-artwork']))
+
+        assert fetched == [1]
+        assert stats['success'] == 1
+
+
+@pytest.mark.asyncio
+async def test_preload_pokemon_images_uses_scheduler(tmp_path):
+    """Testa que o preload do ImageCacheService processa todas as imagens pela fila."""
+    service = ImageCacheService(cache_dir=str(tmp_path / "pokemon_images"))
+
+    async def fake_get(db, pokemon_id, image_type):
+        return None if pokemon_id == 2 else f"{pokemon_id}_{image_type}.png"
+
+    with patch.object(service, 'get_pokemon_image', side_effect=fake_get):
+        stats = await service.preload_pokemon_images(MagicMock(), [1, 2, 3], ['official-artwork', 'sprite'])
+
+    assert stats == {'total': 6, 'success': 4, 'failed': 0, 'skipped': 2}
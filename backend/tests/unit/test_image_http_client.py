@@ -0,0 +1,52 @@
+"""
+Testes unitários para o cliente HTTP compartilhado de imagens.
+"""
+import asyncio
+
+import pytest
+
+from app.services.image_http_client import ImageHTTPClient
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_and_pooled():
+    """Testa que a mesma sessão é reaproveitada com os limites configurados."""
+    client = ImageHTTPClient()
+    try:
+        first = await client.get_session()
+        second = await client.get_session()
+
+        assert first is second
+        assert first.connector.limit_per_host > 0
+        assert not first.closed
+    finally:
+        await client.close()
+
+    assert first.closed
+
+
+@pytest.mark.asyncio
+async def test_closed_session_is_recreated():
+    """Testa que uma nova sessão é criada após o fechamento."""
+    client = ImageHTTPClient()
+    first = await client.get_session()
+    await client.close()
+
+    second = await client.get_session()
+    try:
+        assert second is not first
+        assert not second.closed
+    finally:
+        await client.close()
+
+
+def test_new_event_loop_gets_new_session():
+    """Testa que cada event loop recebe sua própria sessão."""
+    client = ImageHTTPClient()
+
+    async def open_session():
+        session = await client.get_session()
+        await session.close()
+        return session
+
+    assert asyncio.run(open_session()) is not asyncio.run(open_session())
@@ -0,0 +1,138 @@
+"""
+Testes unitários para a otimização de imagens em pool de processos.
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from app.services.image_optimization_service import ImageOptimizationService, encode_optimized_image
+from app.services.image_process_pool import ImageProcessPool
+
+
+@pytest.fixture
+def original_image(tmp_path):
+    """Imagem PNG com transparência."""
+    path = tmp_path / "25_official-artwork.png"
+    Image.new('RGBA', (64, 48), (255, 200, 0, 128)).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def process_pool():
+    """Pool com um único processo."""
+    pool = ImageProcessPool(workers=1, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_encode_optimized_image(original_image, tmp_path):
+    """Testa a codificação em WebP e o resultado retornado."""
+    optimized_path = tmp_path / "25.webp"
+
+    result = encode_optimized_image(original_image, str(optimized_path), 'webp', 85)
+
+    assert result['dimensions'] == "64x48"
+    assert result['quality'] == 85
+    assert result['optimized_size'] == optimized_path.stat().st_size
+    assert list(tmp_path.glob("*.part")) == []
+    with Image.open(optimized_path) as img:
+        assert img.format == 'WEBP'
+
+
+class TestImageProcessPool:
+    """Testes para ImageProcessPool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self, process_pool, original_image, tmp_path):
+        """Testa que a função é executada em outro processo."""
+        result = await process_pool.run(encode_optimized_image, original_image, str(tmp_path / "25.jpeg"), 'jpeg', 75)
+
+        assert result['dimensions'] == "64x48"
+        assert process_pool.get_status()['completed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure_limits_pending(self):
+        """Testa que o número de tarefas enviadas ao pool respeita max_pending."""
+        pool = ImageProcessPool(workers=2, max_pending=2)
+        peak = 0
+
+        async def submit():
+            nonlocal peak
+            task = asyncio.ensure_future(pool.run(time.sleep, 0.05))
+            await asyncio.sleep(0)
+            peak = max(peak, pool.pending)
+            await task
+
+        try:
+            await asyncio.gather(*[submit() for _ in range(5)])
+        finally:
+            pool.shutdown()
+
+        assert peak == 2
+        assert pool.pending == 0
+        assert pool.completed == 5
+
+    def test_does_not_fork_threaded_server(self, process_pool):
+        """Testa que os processos não são criados com fork direto."""
+        assert process_pool._get_executor()._mp_context.get_start_method() != 'fork'
+
+    @pytest.mark.asyncio
+    async def test_propagates_worker_errors(self, process_pool, tmp_path):
+        """Testa que exceções do processo são propagadas e contabilizadas."""
+        with pytest.raises(FileNotFoundError):
+            await process_pool.run(encode_optimized_image, str(tmp_path / "missing.png"), str(tmp_path / "x.webp"), 'webp', 85)
+
+        assert process_pool.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_optimize_images_runs_concurrently(tmp_path):
+    """Testa que o lote otimiza várias imagens ao mesmo tempo."""
+    service = ImageOptimizationService(optimized_dir=str(tmp_path / "optimized"))
+    running = 0
+    peak = 0
+
+    async def fake_optimize(db, pokemon_id, image_type, optimization_type):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return None if pokemon_id == 3 else f"{pokemon_id}.webp"
+
+    with patch.object(service, 'optimize_pokemon_image', side_effect=fake_optimize), \
+            patch('app.services.image_optimization_service.image_process_pool', ImageProcessPool(workers=2, max_pending=4)):
+        stats = await service.batch_optimize_images(MagicMock(), [1, 2, 3], ['official-artwork', 'sprite'])
+
+    assert stats == {'total': 6, 'optimized': 4, 'failed': 2, 'skipped': 0}
+    assert peak > 1
+
+
+@pytest.mark.asyncio
+async def test_get_image_variant_resizes_and_caches(original_image, tmp_path):
+    """Testa que a variante é gerada na largura pedida e depois servida do cache."""
+    service = ImageOptimizationService(optimized_dir=str(tmp_path / "optimized"))
+    db = MagicMock()
+    db.query.return_value.filter.return_value.filter.return_value.first.return_value = None
+
+    with patch('app.services.image_optimization_service.image_process_pool', ImageProcessPool(workers=1)) as pool:
+        try:
+            path = await service.get_image_variant(db, original_image, '"v1"', 25, 'official-artwork', 32, 'webp')
+            cached = await service.get_image_variant(db, original_image, '"v1"', 25, 'official-artwork', 32, 'webp')
+            Image.new('RGBA', (64, 48), (0, 0, 255, 255)).save(original_image)
+            replaced = await service.get_image_variant(db, original_image, '"v2"', 25, 'official-artwork', 32, 'webp')
+        finally:
+            pool.shutdown()
+
+    assert path == cached
+    assert "25_official-artwork_medium_w32_" in path
+    assert replaced != path
+    with Image.open(path) as img:
+        assert img.size == (32, 24)
+        assert img.mode == 'RGBA'
+    assert pool.completed == 2
+    record = db.add.call_args_list[0][0][0]
+    assert (record.width, record.image_format, record.dimensions) == (32, 'webp', "32x24")
@@ -0,0 +1,62 @@
+"""
+Testes unitários para o cache de variantes responsivas das imagens.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.services.image_variant_cache import ImageVariantCache, negotiate_image_format, snap_width
+
+
+@pytest.mark.parametrize("width, expected", [(None, None), (50, 96), (96, 96), (97, 192), (300, 300), (2000, 475)])
+def test_snap_width(width, expected):
+    """Testa o arredondamento para as larguras padrão."""
+    assert snap_width(width, [96, 192, 300, 475]) == expected
+
+
+@pytest.mark.parametrize("accept, avif_supported, expected", [
+    ("image/avif,image/webp,*/*", True, 'avif'),
+    ("image/avif,image/webp,*/*", False, 'webp'),
+    ("image/avif;q=0, image/webp;q=0.8", True, 'webp'),
+    ("image/png,*/*;q=0.8", True, 'png'),
+    (None, True, 'png'),
+])
+def test_negotiate_image_format(accept, avif_supported, expected):
+    """Testa a negociação do formato pelo cabeçalho Accept."""
+    with patch('app.services.image_variant_cache.features.check', return_value=avif_supported):
+        assert negotiate_image_format(accept) == expected
+
+
+class TestImageVariantCache:
+    """Testes para ImageVariantCache."""
+
+    def write(self, cache, name, size):
+        with open(cache.path_for(name), 'wb') as f:
+            f.write(b'\x00' * size)
+        return cache.put(name, size)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Testa que as variantes usadas há mais tempo são removidas ao passar do limite."""
+        cache = ImageVariantCache(str(tmp_path), max_bytes=250)
+        self.write(cache, "a.webp", 100)
+        self.write(cache, "b.webp", 100)
+        assert cache.get("a.webp") is not None
+
+        evicted = self.write(cache, "c.webp", 100)
+
+        assert evicted == [cache.path_for("b.webp")]
+        assert not (tmp_path / "b.webp").exists()
+        assert cache.get("b.webp") is None
+        assert cache.total_bytes == 200
+        assert cache.get_status()["evictions"] == 1
+
+    def test_loads_existing_directory(self, tmp_path):
+        """Testa que as variantes já gravadas são carregadas na primeira consulta."""
+        (tmp_path / "a.webp").write_bytes(b'\x00' * 10)
+        (tmp_path / "b.webp.123.part").write_bytes(b'\x00' * 10)
+
+        cache = ImageVariantCache(str(tmp_path), max_bytes=100)
+
+        assert cache.get("a.webp") == cache.path_for("a.webp")
+        assert cache.get_status()["variants"] == 1
+        assert cache.total_bytes == 10
@@ -0,0 +1,116 @@
+"""
+Testes unitários para o espelho persistente da PokeAPI.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.services.pokeapi_mirror_service import PokeAPIMirror, PokeAPIMirrorEntry
+from app.services.pokeapi_service import PokeAPIService
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """Fixture para espelho em um banco SQLite temporário."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'mirror.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine, tables=[PokeAPIMirrorEntry.__table__])
+    return PokeAPIMirror(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+
+class TestPokeAPIMirror:
+    """Testes para PokeAPIMirror."""
+
+    def test_get_missing(self, mirror):
+        """Testa busca de recurso não espelhado."""
+        assert mirror.get("pokemon", "pikachu") is None
+
+    def test_put_and_get_aliases(self, mirror):
+        """Testa gravação sob vários identificadores."""
+        data = {"id": 25, "name": "pikachu"}
+
+        assert mirror.put("pokemon", ["pikachu", "25", "pikachu"], data) is True
+
+        for identifier in ("pikachu", "25"):
+            payload, age = mirror.get("pokemon", identifier)
+            assert payload == data
+            assert age < 60
+        assert mirror.get_stats()["total_entries"] == 2
+
+    def test_put_updates_existing(self, mirror):
+        """Testa que uma nova gravação substitui o payload anterior."""
+        mirror.put("type", ["fire"], {"id": 10, "v": 1})
+        mirror.put("type", ["fire"], {"id": 10, "v": 2})
+
+        payload, _ = mirror.get("type", "fire")
+        assert payload["v"] == 2
+        assert mirror.get_stats()["entries"] == {"type": 1}
+
+
+class TestPokeAPIServiceWithMirror:
+    """Testes da integração entre PokeAPIService e o espelho."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_writes_mirror(self, mirror):
+        """Testa que respostas da PokeAPI são gravadas no espelho."""
+        service = PokeAPIService(mirror=mirror)
+        data = {"id": 25, "name": "pikachu"}
+
+        with patch.object(service.client, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = data
+            mock_response.raise_for_status.return_value = None
+            mock_get.return_value = mock_response
+
+            await service.get_pokemon("pikachu")
+            for task in list(service._background_tasks):
+                await task
+
+        assert mirror.get("pokemon", "25")[0] == data
+
+    @pytest.mark.asyncio
+    async def test_warm_restart_served_from_mirror(self, mirror):
+        """Testa que uma nova instância responde pelo espelho sem acessar a PokeAPI."""
+        data = {"id": 25, "name": "pikachu"}
+        mirror.put("pokemon", ["pikachu", "25"], data)
+        service = PokeAPIService(mirror=mirror)
+
+        with patch.object(service.client, 'get') as mock_get:
+            assert await service.get_pokemon("25") == data
+            assert await service.get_pokemon("25") == data
+            mock_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_old_mirror_entry_served_and_refreshed(self, mirror):
+        """Testa que payloads espelhados antigos são servidos e revalidados."""
+        old_data = {"id": 25, "name": "pikachu", "weight": 60}
+        new_data = {"id": 25, "name": "pikachu", "weight": 61}
+        mirror.put("pokemon", ["pikachu"], old_data)
+
+        db = mirror.session_factory()
+        db.query(PokeAPIMirrorEntry).update(
+            {PokeAPIMirrorEntry.fetched_at: datetime.utcnow() - timedelta(days=30)}
+        )
+        db.commit()
+        db.close()
+
+        service = PokeAPIService(mirror=mirror)
+
+        with patch.object(service.client, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = new_data
+            mock_response.raise_for_status.return_value = None
+            mock_get.return_value = mock_response
+
+            assert await service.get_pokemon("pikachu") == old_data
+            while service._background_tasks:
+                await list(service._background_tasks)[0]
+
+            assert await service.get_pokemon("pikachu") == new_data
+            assert mirror.get("pokemon", "pikachu")[0] == new_data
+            mock_get.assert_called_once()
@@ -1,6 +1,7 @@
 """
 Testes unitários para PokeAPIService.
 """
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
 import httpx
@@ -231,7 +232,9 @@ class TestPokeAPIService:
             "types": [{"type": {"name": "electric"}}]
         }
 
-        with patch.object(service, 'get_pokemon') as mock_get_pokemon:
+        # Sem índice de nomes disponível, a busca consulta o Pokémon diretamente
+        with patch.object(service, 'get_pokemon_species_list', return_value=None), \
+                patch.object(service, 'get_pokemon') as mock_get_pokemon:
             mock_get_pokemon.return_value = mock_pokemon_data
 
             result = await service.search_pokemon("Pikachu")
@@ -243,7 +246,9 @@ class TestPokeAPIService:
     @pytest.mark.asyncio
     async def test_search_pokemon_not_found(self, service):
         """Testa buscar Pokémon que não existe."""
-        with patch.object(service, 'get_pokemon') as mock_get_pokemon:
+        # Sem índice de nomes disponível, a busca consulta o Pokémon diretamente
+        with patch.object(service, 'get_pokemon_species_list', return_value=None), \
+                patch.object(service, 'get_pokemon') as mock_get_pokemon:
             mock_get_pokemon.return_value = None
 
             result = await service.search_pokemon("nonexistent")
@@ -254,13 +259,101 @@ class TestPokeAPIService:
     @pytest.mark.asyncio
     async def test_search_pokemon_exception(self, service):
         """Testa buscar Pokémon com exceção."""
-        with patch.object(service, 'get_pokemon') as mock_get_pokemon:
+        # Sem índice de nomes disponível, a busca consulta o Pokémon diretamente
+        with patch.object(service, 'get_pokemon_species_list', return_value=None), \
+                patch.object(service, 'get_pokemon') as mock_get_pokemon:
             mock_get_pokemon.side_effect = Exception("Unexpected error")
 
             result = await service.search_pokemon("pikachu")
 
             assert len(result) == 0
 
+    @pytest.mark.asyncio
+    async def test_search_pokemon_uses_local_index(self, service):
+        """Testa busca por prefixo e aproximada pelo índice local, sem acessar a PokeAPI."""
+        species_list = {
+            "count": 3,
+            "results": [
+                {"name": "pikachu", "url": f"{service.base_url}/pokemon-species/25/"},
+                {"name": "raichu", "url": f"{service.base_url}/pokemon-species/26/"},
+                {"name": "pichu", "url": f"{service.base_url}/pokemon-species/172/"}
+            ]
+        }
+
+        with patch.object(service, 'get_pokemon_species_list', return_value=species_list) as mock_list, \
+                patch.object(service, 'get_pokemon') as mock_get_pokemon:
+            prefix = await service.search_pokemon("Pi")
+            typo = await service.search_pokemon("pikachuu")
+            exact = await service.search_pokemon("raichu")
+
+            assert [result["name"] for result in prefix] == ["pikachu", "pichu"]
+            assert typo[0]["name"] == "pikachu"
+            assert typo[0]["match"] == "fuzzy"
+            assert exact[0] == {
+                "id": 26,
+                "name": "raichu",
+                "match": "exact",
+                "url": f"{service.base_url}/pokemon/26/"
+            }
+            mock_list.assert_called_once()
+            mock_get_pokemon.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_pokemon_by_id_uses_direct_lookup(self, service):
+        """Testa que buscas por ID consultam o Pokémon diretamente."""
+        with patch.object(service, 'get_pokemon_species_list') as mock_list, \
+                patch.object(service, 'get_pokemon', return_value={"id": 25, "name": "pikachu"}) as mock_get_pokemon:
+            result = await service.search_pokemon("25")
+
+            assert result == [{"id": 25, "name": "pikachu"}]
+            mock_get_pokemon.assert_called_once_with("25")
+            mock_list.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_pokemon_projection(self, service):
+        """Testa que a projeção reflete a resposta atual sem alterar a completa."""
+        pokemon = {"id": 25, "name": "pikachu", "moves": [{"move": {"name": "thunder"}}]}
+
+        with patch.object(service, 'get_pokemon', return_value=pokemon):
+            first = await service.get_pokemon_projection("pikachu", ["name", "id"])
+
+        assert first == {"id": 25, "name": "pikachu"}
+        assert "moves" in pokemon
+
+        refreshed = {"id": 25, "name": "pikachu-refreshed"}
+        with patch.object(service, 'get_pokemon', return_value=refreshed):
+            second = await service.get_pokemon_projection("25", ["id", "name"])
+
+        assert second == {"id": 25, "name": "pikachu-refreshed"}
+        assert "projections" not in service.get_cache_stats()
+
+    @pytest.mark.asyncio
+    async def test_get_pokemon_batch_bounded_concurrency(self, service):
+        """Testa lote com buscas paralelas limitadas, deduplicação e projeção."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_get_pokemon(key):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if key == "missingno":
+                return None
+            return {"id": int(key), "name": f"pokemon-{key}", "moves": [1, 2, 3]}
+
+        ids = [str(i) for i in range(1, 9)] + ["1", "missingno"]
+        with patch('app.services.pokeapi_service.settings.pokeapi_batch_concurrency', 3), \
+                patch.object(service, 'get_pokemon', side_effect=fake_get_pokemon) as mock_get_pokemon:
+            results = await service.get_pokemon_batch(ids, fields=["id", "name"])
+
+        assert results[0] == {"id": 1, "name": "pokemon-1"}
+        assert results[8] == results[0]
+        assert results[9] is None
+        assert mock_get_pokemon.call_count == 9
+        assert max_in_flight == 3
+
     @pytest.mark.asyncio
     async def test_close(self, service):
         """Testa fechar cliente HTTP."""
@@ -269,6 +362,73 @@ class TestPokeAPIService:
 
             mock_aclose.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_pokemon_uses_cache(self, service):
+        """Testa que a segunda busca do mesmo Pokémon não acessa a PokeAPI."""
+        mock_response_data = {"id": 25, "name": "pikachu"}
+
+        with patch.object(service.client, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = mock_response_data
+            mock_response.raise_for_status.return_value = None
+            mock_get.return_value = mock_response
+
+            first = await service.get_pokemon("pikachu")
+            second = await service.get_pokemon("pikachu")
+            by_id = await service.get_pokemon("25")
+
+            assert first == second == by_id == mock_response_data
+            mock_get.assert_called_once_with(f"{service.base_url}/pokemon/pikachu")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_pokemon_single_request(self, service):
+        """Testa que buscas concorrentes do mesmo Pokémon fazem uma única requisição."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"id": 25, "name": "pikachu"}
+        mock_response.raise_for_status.return_value = None
+
+        async def slow_get(url):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        with patch.object(service.client, 'get', side_effect=slow_get) as mock_get:
+            results = await asyncio.gather(*[service.get_pokemon("pikachu") for _ in range(20)])
+
+            assert all(result["id"] == 25 for result in results)
+            mock_get.assert_called_once_with(f"{service.base_url}/pokemon/pikachu")
+
+    @pytest.mark.asyncio
+    async def test_get_pokemon_errors_not_cached(self, service):
+        """Testa que falhas da PokeAPI não são armazenadas em cache."""
+        with patch.object(service.client, 'get') as mock_get:
+            mock_get.side_effect = httpx.NetworkError("Connection failed")
+
+            assert await service.get_pokemon("pikachu") is None
+            assert await service.get_pokemon("pikachu") is None
+
+            assert mock_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_pokemon_stale_served_and_refreshed(self, service):
+        """Testa que uma entrada expirada é servida e revalidada em background."""
+        old_data = {"id": 25, "name": "pikachu", "weight": 60}
+        new_data = {"id": 25, "name": "pikachu", "weight": 61}
+        service.cache.set(("pokemon", "pikachu"), old_data, ttl=-1)
+
+        with patch.object(service.client, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = new_data
+            mock_response.raise_for_status.return_value = None
+            mock_get.return_value = mock_response
+
+            result = await service.get_pokemon("pikachu")
+            assert result == old_data
+
+            await asyncio.gather(*service._background_tasks)
+
+            assert await service.get_pokemon("pikachu") == new_data
+            mock_get.assert_called_once_with(f"{service.base_url}/pokemon/pikachu")
+
     def test_timeout_configuration(self):
         """Testa configuração de timeout do cliente."""
         service = PokeAPIService()
@@ -0,0 +1,97 @@
+"""
+Testes unitários para o registro de nomes dos Pokémons.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.pokemon_name_registry import PokemonNameRegistry
+
+SPECIES = [
+    {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-species/1/"},
+    {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon-species/25/"},
+    {"name": "deoxys", "url": "https://pokeapi.co/api/v2/pokemon-species/386/"},
+    {"name": "pecharunt", "url": "https://pokeapi.co/api/v2/pokemon-species/1025/"},
+]
+
+POKEMON = [
+    {"name": "pikachu", "url": "https://pokeapi.co/api/v2/pokemon/25/"},
+    {"name": "deoxys-normal", "url": "https://pokeapi.co/api/v2/pokemon/386/"},
+    {"name": "venusaur-mega", "url": "https://pokeapi.co/api/v2/pokemon/10033/"},
+]
+
+
+def test_lookup_by_id_and_name():
+    """Testa as consultas por ID, em lote e por nome."""
+    registry = PokemonNameRegistry()
+    registry.build(SPECIES)
+
+    assert registry.get(25) == "pikachu"
+    assert registry.get(1025) == "pecharunt"
+    assert registry.get(200) == "pokemon_200"
+    assert registry.get(99999) == "pokemon_99999"
+    assert registry.get_many([1, 25, 0]) == {1: "bulbasaur", 25: "pikachu", 0: "pokemon_0"}
+    assert registry.id_for(" Pikachu ") == 25
+    assert len(registry.names) == 1026
+
+
+def test_forms_and_static_fallback():
+    """Testa os nomes das formas alternativas e do mapeamento estático."""
+    registry = PokemonNameRegistry()
+    assert registry.resolve(25) == "pikachu"
+    assert registry.resolve(200) is None
+
+    registry.build(SPECIES, POKEMON)
+
+    assert registry.resolve(10033) == "venusaur-mega"
+    assert registry.resolve(386) == "deoxys"
+    assert registry.resolve(2) == "ivysaur"
+    assert registry.resolve_many([1, 200, 10033]) == {1: "bulbasaur", 10033: "venusaur-mega"}
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_fetches_species_once():
+    """Testa que a lista de espécies é carregada uma única vez."""
+    registry = PokemonNameRegistry()
+    species_list = AsyncMock(return_value={"results": SPECIES})
+    pokemon_list = AsyncMock(return_value={"results": POKEMON})
+
+    with patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_species_list', species_list), \
+            patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_list', pokemon_list):
+        assert await registry.ensure_loaded()
+        assert await registry.ensure_loaded()
+
+    species_list.assert_awaited_once()
+    pokemon_list.assert_awaited_once()
+    assert registry.get(1) == "bulbasaur"
+    assert registry.get(10033) == "venusaur-mega"
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_retried_immediately():
+    """Testa que uma carga que falhou aguarda o intervalo antes de ser repetida."""
+    registry = PokemonNameRegistry()
+    species_list = AsyncMock(return_value=None)
+
+    with patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_species_list', species_list), \
+            patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_list', AsyncMock(return_value=None)):
+        assert not await registry.ensure_loaded()
+        assert not await registry.ensure_loaded()
+
+    species_list.assert_awaited_once()
+    assert registry.get(200) == "pokemon_200"
+    assert registry.get(25) == "pikachu"
+
+
+@pytest.mark.asyncio
+async def test_first_load_on_recently_booted_host():
+    """Testa que a primeira carga acontece mesmo com o relógio monotônico abaixo do intervalo."""
+    registry = PokemonNameRegistry()
+    species_list = AsyncMock(return_value={"results": SPECIES})
+
+    with patch('app.services.pokemon_name_registry.time.monotonic', return_value=120.0), \
+            patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_species_list', species_list), \
+            patch('app.services.pokeapi_service.pokeapi_service.get_pokemon_list', AsyncMock(return_value=None)):
+        assert await registry.ensure_loaded()
+
+    species_list.assert_awaited_once()
@@ -0,0 +1,66 @@
+"""
+Testes unitários para o índice local de nomes de Pokémons.
+"""
+import pytest
+from app.services.pokemon_search_index import PokemonNameIndex, normalize_query
+
+BASE = "https://pokeapi.co/api/v2/pokemon-species"
+
+
+@pytest.fixture
+def index():
+    """Fixture com um índice pequeno de espécies."""
+    index = PokemonNameIndex()
+    index.build([
+        {"name": "bulbasaur", "url": f"{BASE}/1/"},
+        {"name": "charmander", "url": f"{BASE}/4/"},
+        {"name": "charmeleon", "url": f"{BASE}/5/"},
+        {"name": "charizard", "url": f"{BASE}/6/"},
+        {"name": "pikachu", "url": f"{BASE}/25/"},
+        {"name": "mr-mime", "url": f"{BASE}/122/"},
+        {"name": "pichu", "url": f"{BASE}/172/"},
+    ])
+    return index
+
+
+def test_build(index):
+    """Testa construção do índice a partir da lista de espécies."""
+    assert index.is_built
+    assert len(index) == 7
+    assert "pikachu" in index
+    assert index.ids["charizard"] == 6
+    assert not PokemonNameIndex().is_built
+
+
+def test_prefix_search_orders_by_id(index):
+    """Testa busca por prefixo ordenada pelo ID."""
+    assert index.prefix_search("char") == ["charmander", "charmeleon", "charizard"]
+    assert index.prefix_search("char", limit=2) == ["charmander", "charmeleon"]
+    assert index.prefix_search("zzz") == []
+
+
+def test_fuzzy_search(index):
+    """Testa busca aproximada por distância de edição."""
+    assert index.fuzzy_search("charzard")[0] == ("charizard", 1)
+    assert index.fuzzy_search("bulbasuar")[0][0] == "bulbasaur"
+    assert index.fuzzy_search("xyz") == []
+
+
+def test_search_ranks_exact_prefix_and_fuzzy(index):
+    """Testa ordem dos resultados: exato, prefixo e aproximado."""
+    results = index.search("pichu")
+    assert results[0] == {"id": 172, "name": "pichu", "match": "exact"}
+
+    results = index.search("pik")
+    assert results[0] == {"id": 25, "name": "pikachu", "match": "prefix"}
+
+    results = index.search("Pikachuu")
+    assert results == [{"id": 25, "name": "pikachu", "match": "fuzzy"}]
+
+
+def test_search_normalizes_query(index):
+    """Testa normalização de maiúsculas e espaços."""
+    assert normalize_query("  Mr Mime ") == "mr-mime"
+    assert index.search("Mr Mime")[0]["name"] == "mr-mime"
+    assert index.search("   ") == []
+    assert index.search("pikachu", limit=0) == []
@@ -0,0 +1,36 @@
+"""
+Testes unitários para a projeção de campos.
+"""
+from app.utils.projection import parse_fields, project_fields
+
+
+def test_parse_fields():
+    """Testa conversão de texto separado por vírgulas."""
+    assert parse_fields(" id, name,,sprites.front_default,id ") == ["id", "name", "sprites.front_default"]
+    assert parse_fields("") == []
+
+
+def test_project_fields_nested_paths():
+    """Testa projeção de campos de primeiro nível e aninhados."""
+    data = {
+        "id": 25,
+        "name": "pikachu",
+        "moves": [{"move": {"name": "thunder-shock"}}],
+        "sprites": {"front_default": "front.png", "back_default": "back.png"}
+    }
+
+    result = project_fields(data, ["id", "sprites.front_default", "missing", "name.length"])
+
+    assert result == {"id": 25, "sprites": {"front_default": "front.png"}}
+
+
+def test_project_fields_does_not_mutate_source():
+    """Testa que o dicionário original não é alterado."""
+    data = {"sprites": {"front_default": "front.png", "back_default": "back.png"}}
+
+    result = project_fields(data, ["sprites.front_default", "sprites"])
+    result["sprites"]["extra"] = True
+    project_fields(data, ["sprites", "sprites.front_default"])
+
+    assert result["sprites"] is data["sprites"]
+    assert project_fields({"sprites": {"a": 1}}, ["sprites.a"])["sprites"] == {"a": 1}
@@ -0,0 +1,207 @@
+"""
+Testes unitários para a consulta paralela dos clientes no PullSyncService.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.schemas import ClientRegistration
+from app.services.client_storage_service import ClientStorageService
+from app.services.pull_sync_service import PullSyncService
+
+
+class FakeResponse:
+    """Resposta HTTP mínima."""
+
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data or {}
+
+    def json(self):
+        return self._data
+
+
+class FakeHTTPClient:
+    """Cliente HTTP com atraso configurável por cliente."""
+
+    def __init__(self, delays=None, default_delay=0.01, captures=None):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.captures = captures or {}
+        self.params = {}
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def get(self, url, params=None, **kwargs):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            client_url = url.split("/api/")[0]
+            self.params[client_url] = params
+            await asyncio.sleep(self.delays.get(client_url, self.default_delay))
+            return FakeResponse(200, {"captures": self.captures.get(client_url, [])})
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def offline_name_registry():
+    """Impede que o registro de nomes consulte a PokeAPI."""
+    with patch('app.services.pull_sync_service.pokemon_names.ensure_loaded', AsyncMock(return_value=False)):
+        yield
+
+
+@pytest.fixture
+def service():
+    """Serviço com dez clientes registrados e storage em memória."""
+    with patch('app.services.pull_sync_service.ClientStorageService') as storage:
+        storage.return_value = MagicMock()
+        service = PullSyncService()
+    service.registered_clients = {
+        f"user_{i}": ClientRegistration(client_url=f"http://client{i}", user_id=f"user_{i}")
+        for i in range(10)
+    }
+    return service
+
+
+@pytest.mark.asyncio
+async def test_pull_from_clients_bounds_parallelism(service):
+    """Testa que as consultas são paralelas e limitadas por pull_sync_max_concurrency."""
+    service.http_client = FakeHTTPClient()
+
+    with patch.object(settings, 'pull_sync_max_concurrency', 3):
+        results = [
+            result async for result in service._pull_from_clients(service._get_all_captures)
+        ]
+
+    assert len(results) == 10
+    assert all(error is None for _, _, _, error in results)
+    assert service.http_client.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_results_arrive_in_completion_order(service):
+    """Testa que as respostas são entregues conforme chegam."""
+    service.http_client = FakeHTTPClient(delays={"http://client0": 0.2})
+
+    user_ids = [user_id async for user_id, _, _, _ in service._pull_from_clients(service._get_all_captures)]
+
+    assert user_ids[-1] == "user_0"
+
+
+@pytest.mark.asyncio
+async def test_hanging_client_does_not_delay_cycle(service):
+    """Testa que um cliente sem resposta falha no prazo sem atrasar os demais."""
+    service.http_client = FakeHTTPClient(delays={"http://client3": 60})
+
+    start = time.monotonic()
+    with patch.object(settings, 'pull_sync_client_timeout', 0.2):
+        results = {
+            user_id: error
+            async for user_id, _, _, error in service._pull_from_clients(service._get_all_captures)
+        }
+
+    assert time.monotonic() - start < 1
+    assert isinstance(results.pop("user_3"), TimeoutError)
+    assert all(error is None for error in results.values())
+
+
+@pytest.mark.asyncio
+async def test_cycle_deadline_fails_waiting_clients(service):
+    """Testa que clientes ainda na fila quando o ciclo expira falham sem consulta."""
+    service.http_client = FakeHTTPClient(default_delay=60)
+
+    start = time.monotonic()
+    with patch.object(settings, 'pull_sync_max_concurrency', 2), \
+            patch.object(settings, 'pull_sync_cycle_timeout', 0.2):
+        removed = await service.cleanup_inactive_clients()
+
+    assert time.monotonic() - start < 1
+    assert removed == 10
+    assert service.registered_clients == {}
+    assert service.storage_service.remove_client.call_count == 10
+
+
+@pytest.mark.asyncio
+async def test_unregister_client_removes_its_captures(service, tmp_path):
+    """Testa que o cliente removido deixa de contar no storage."""
+    service.storage_service = ClientStorageService(str(tmp_path / "client_storage.json"))
+    service.storage_service.apply_client_changes("user_1", {25: True, 1: True})
+    service.storage_service.apply_client_changes("user_2", {25: True})
+
+    assert await service.unregister_client("user_1")
+
+    assert service.storage_service.get_all_clients() == ["user_2"]
+    assert service.storage_service.get_pokemon_counts() == {25: 1}
+
+
+@pytest.mark.asyncio
+async def test_sync_with_storage_pulls_only_new_captures(service, tmp_path):
+    """Testa que cada ciclo envia o cursor do cliente e aplica apenas as alterações."""
+    service.registered_clients = {"ash": ClientRegistration(client_url="http://ash", user_id="ash")}
+    service.storage_service = ClientStorageService(str(tmp_path / "client_storage.json"))
+    service.ranking_service = MagicMock()
+    service.ranking_service.update_ranking_from_storage.return_value = {"inserted_count": 2}
+    service.http_client = FakeHTTPClient(captures={"http://ash": [
+        {"pokemon_id": 25, "action": "capture", "timestamp": "2024-01-01T10:00:00"},
+        {"pokemon_id": 1, "action": "capture", "timestamp": "2024-01-01T10:05:00"},
+    ]})
+    db = MagicMock()
+
+    with patch.object(service, '_sync_favorites_with_storage', return_value={}):
+        first = await service.sync_with_storage_system(db)
+
+        service.http_client.captures = {"http://ash": []}
+        second = await service.sync_with_storage_system(db)
+
+        service.http_client.captures = {"http://ash": [
+            {"pokemon_id": 1, "action": "capture", "timestamp": "2024-01-01T11:00:00", "metadata": {"removed": True}},
+        ]}
+        third = await service.sync_with_storage_system(db)
+
+    assert first["storage_changed"] and third["storage_changed"]
+    assert not second["storage_changed"]
+    assert service.ranking_service.update_ranking_from_storage.call_count == 2
+    assert service.http_client.params["http://ash"] == {"since": "2024-01-01T10:05:00"}
+    assert service.storage_service.get_client_captures("ash") == [25]
+    assert service.storage_service.get_sync_cursor("ash") == "2024-01-01T11:00:00"
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_fetches_each_client_once(service):
+    """Testa que os nomes dos Pokémons ausentes vêm das capturas já consultadas."""
+    service.http_client = FakeHTTPClient(captures={
+        f"http://client{i}": [
+            {"pokemon_id": i * 10 + j, "pokemon_name": f"mon-{i * 10 + j}", "action": "capture", "timestamp": "2024-01-01"}
+            for j in range(5)
+        ]
+        for i in range(10)
+    })
+
+    with patch('app.services.pull_sync_service.FavoriteService') as favorites:
+        favorites.get_user_favorites.return_value = []
+        result = await service.full_sync_with_consistency_check(MagicMock())
+
+    assert result["added_count"] == 50
+    assert service.http_client.calls == 10
+    names = {call.args[1].pokemon_name for call in favorites.add_favorite.call_args_list}
+    assert "mon-42" in names
+
+
+@pytest.mark.asyncio
+async def test_unnamed_pokemons_are_not_persisted(service):
+    """Testa que pokémons sem nome são adiados em vez de gravados como pokemon_{id}."""
+    service.storage_service.get_pokemon_counts.return_value = {25: 2, 10033: 1}
+
+    with patch('app.services.pull_sync_service.FavoriteService') as favorites:
+        favorites.get_user_favorites.return_value = []
+        stats = await service._sync_favorites_with_storage(MagicMock())
+
+    names = [call.args[1].pokemon_name for call in favorites.add_favorite.call_args_list]
+    assert names == ["pikachu"]
+    assert stats["unresolved_count"] == 1
@@ -0,0 +1,95 @@
+"""
+Testes unitários para SingleFlight.
+"""
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Testes para SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_execution(self):
+        """Testa que chamadas concorrentes com a mesma chave executam uma vez."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 25}
+
+        results = await asyncio.gather(*[flights.do("pikachu", fetch) for _ in range(10)])
+
+        assert calls == 1
+        assert all(result == {"id": 25} for result in results)
+        assert flights.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Testa que chaves diferentes não são coalescidas."""
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        results = await asyncio.gather(
+            flights.do("a", lambda: fetch("a")),
+            flights.do("b", lambda: fetch("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_all_callers(self):
+        """Testa que exceções são propagadas para todos os chamadores."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream error")
+
+        results = await asyncio.gather(
+            flights.do("k", fail), flights.do("k", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert "k" not in flights
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_does_not_cancel_shared_call(self):
+        """Testa que cancelar um chamador não afeta os demais."""
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        first = asyncio.ensure_future(flights.do("k", fetch))
+        second = asyncio.ensure_future(flights.do("k", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "ok"
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """Testa que uma nova chamada após o término executa novamente."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("k", fetch) == 1
+        assert await flights.do("k", fetch) == 2
@@ -0,0 +1,85 @@
+"""
+Testes unitários para a geração de atlas de imagens.
+"""
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from app.services.image_cache_service import ImageCacheService
+from app.services.sprite_atlas_service import SpriteAtlasService, compose_atlas
+
+
+@pytest.fixture
+def cache_service(tmp_path):
+    """ImageCacheService com três sprites indexados (1, 4 e 7)."""
+    service = ImageCacheService(cache_dir=str(tmp_path / "pokemon_images"))
+    for pokemon_id, size in [(1, (96, 96)), (4, (48, 96)), (7, (192, 192))]:
+        path = service.cache_dir / f"{pokemon_id}_sprite.png"
+        Image.new('RGBA', size, (pokemon_id * 30, 0, 0, 255)).save(path)
+        service.index.put(pokemon_id, 'sprite', str(path))
+    return service
+
+
+def test_compose_atlas_places_sprites_in_grid(cache_service, tmp_path):
+    """Testa a posição e o tamanho de cada imagem no atlas."""
+    sprites = [(pokemon_id, cache_service.index.get(pokemon_id, 'sprite').path) for pokemon_id in (1, 4, 7)]
+    atlas_path = tmp_path / "atlas.png"
+
+    coordinates = compose_atlas(sprites, 64, 2, str(atlas_path), 'png')
+
+    assert coordinates == {
+        "1": {"x": 0, "y": 0, "w": 64, "h": 64},
+        "4": {"x": 64 + 16, "y": 0, "w": 32, "h": 64},
+        "7": {"x": 0, "y": 64, "w": 64, "h": 64},
+    }
+    with Image.open(atlas_path) as atlas:
+        assert atlas.size == (128, 128)
+        assert atlas.getpixel((10, 10))[0] == 30
+        assert atlas.getpixel((70, 10))[3] == 0  # margem transparente
+
+
+class TestSpriteAtlasService:
+    """Testes para SpriteAtlasService."""
+
+    @pytest.mark.asyncio
+    async def test_get_atlas_builds_once_and_reports_missing(self, cache_service, tmp_path):
+        """Testa que o atlas é gerado uma vez e que imagens fora do cache são listadas."""
+        service = SpriteAtlasService(cache_service, atlas_dir=str(tmp_path / "atlases"))
+
+        atlas = await service.get_atlas([1, 4, 7, 25], cell_size=32, image_format='png')
+        mtime = os.path.getmtime(service.get_atlas_path(atlas["file"]))
+        again = await service.get_atlas([1, 4, 7, 25], cell_size=32, image_format='png')
+
+        assert atlas == again
+        assert atlas["missing"] == [25]
+        assert set(atlas["sprites"]) == {"1", "4", "7"}
+        assert (atlas["width"], atlas["height"]) == (96, 32)
+        assert os.path.getmtime(service.get_atlas_path(atlas["file"])) == mtime
+        with open(service.cache.path_for(f"{atlas['file']}.json")) as f:
+            assert "missing" not in json.load(f)
+
+    @pytest.mark.asyncio
+    async def test_new_image_changes_atlas(self, cache_service, tmp_path):
+        """Testa que uma imagem baixada depois gera um novo atlas."""
+        service = SpriteAtlasService(cache_service, atlas_dir=str(tmp_path / "atlases"))
+        before = await service.get_atlas([1, 25], image_format='png')
+
+        path = cache_service.cache_dir / "25_sprite.png"
+        Image.new('RGBA', (96, 96)).save(path)
+        cache_service.index.put(25, 'sprite', str(path))
+        after = await service.get_atlas([1, 25], image_format='png')
+
+        assert before["file"] != after["file"]
+        assert after["missing"] == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_too_many_sprites(self, cache_service, tmp_path):
+        """Testa o limite de imagens por atlas."""
+        service = SpriteAtlasService(cache_service, atlas_dir=str(tmp_path / "atlases"))
+
+        with pytest.raises(ValueError):
+            await service.get_atlas(range(1, service.max_sprites + 2))
+
+        assert await service.get_atlas([25, 26]) is None
@@ -0,0 +1,59 @@
+"""
+Testes unitários para o serviço de tradução de flavor texts.
+"""
+from unittest.mock import patch
+
+from app.models.models import PokemonFlavorTranslation
+from app.services import translation_service
+from app.services.translation_service import (
+    _build_translation_index,
+    get_or_translate_flavor,
+    get_or_translate_flavors
+)
+
+MANUAL_INDEX = {
+    "It stores electricity.": "Ele armazena eletricidade.",
+    "It is fast.": "Ele é rápido."
+}
+
+
+class TestTranslationService:
+    """Testes para as funções de tradução de flavor texts."""
+
+    def test_build_translation_index(self):
+        """Testa a construção do índice a partir das listas paralelas."""
+        index = _build_translation_index(["a", "b", "a", "c"], ["A", "B", "A2"])
+
+        assert index == {"a": "A", "b": "B"}
+
+    def test_batch_uses_single_query(self, db_session):
+        """Testa que a tradução em lote faz uma única consulta."""
+        db_session.add(PokemonFlavorTranslation(
+            pokemon_id=25, flavor_en="It is fast.", flavor_translated="Do cache.", lang="pt-BR"
+        ))
+        db_session.commit()
+
+        flavors = ["It stores electricity.", "It is fast.", "Unknown text."]
+
+        with patch.object(translation_service, "_manual_translations", return_value=MANUAL_INDEX), \
+                patch.object(db_session, "query", wraps=db_session.query) as mock_query:
+            result = get_or_translate_flavors(db_session, 25, flavors, "pt-BR")
+
+        assert result == ["Ele armazena eletricidade.", "Do cache.", "Unknown text."]
+        assert mock_query.call_count == 1
+
+    def test_batch_other_language_ignores_manual_index(self, db_session):
+        """Testa que o índice manual PT-BR não é usado para outros idiomas."""
+        with patch.object(translation_service, "_manual_translations", return_value=MANUAL_INDEX):
+            result = get_or_translate_flavors(db_session, 25, ["It is fast."], "es-ES")
+
+        assert result == ["It is fast."]
+
+    def test_batch_empty(self, db_session):
+        """Testa lote vazio."""
+        assert get_or_translate_flavors(db_session, 25, [], "pt-BR") == []
+
+    def test_single_flavor(self, db_session):
+        """Testa a função de tradução individual."""
+        with patch.object(translation_service, "_manual_translations", return_value=MANUAL_INDEX):
+            assert get_or_translate_flavor(db_session, 25, "It is fast.", "pt-BR") == "Ele é rápido."
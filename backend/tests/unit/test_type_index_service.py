@@ -0,0 +1,123 @@
+"""
+Testes unitários para o índice de tipos (efetividade e Pokémons por tipo).
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.type_index_service import TypeIndex, TypeIndexService
+
+BASE = "https://pokeapi.co/api/v2"
+
+
+def _type(type_id, name, double=(), half=(), none=(), pokemon=()):
+    """Monta um payload mínimo de /type/{name}."""
+    return {
+        "id": type_id,
+        "name": name,
+        "damage_relations": {
+            "double_damage_to": [{"name": n} for n in double],
+            "half_damage_to": [{"name": n} for n in half],
+            "no_damage_to": [{"name": n} for n in none],
+        },
+        "pokemon": [{"pokemon": {"name": f"p{i}", "url": f"{BASE}/pokemon/{i}/"}} for i in pokemon],
+    }
+
+
+TYPES = [
+    _type(1, "normal", none=["ghost"], pokemon=[16, 17]),
+    _type(10, "fire", double=["grass"], half=["fire", "water"], pokemon=[4, 6, 146]),
+    _type(11, "water", double=["fire"], half=["water", "grass"], pokemon=[7]),
+    _type(12, "grass", double=["water"], half=["fire", "grass", "flying"], pokemon=[1]),
+    _type(3, "flying", double=["grass"], pokemon=[6, 16, 17, 146]),
+    _type(8, "ghost", double=["ghost"], none=["normal"], pokemon=[92]),
+    _type(10001, "unknown"),
+]
+
+
+@pytest.fixture
+def index():
+    """Fixture com índice construído a partir de tipos simplificados."""
+    index = TypeIndex()
+    index.build(TYPES)
+    return index
+
+
+def test_build_ignores_types_without_relations(index):
+    """Testa que tipos sem relações de dano são ignorados e a ordem segue o ID."""
+    assert index.types == ["normal", "flying", "ghost", "fire", "water", "grass"]
+    assert index.is_built
+    assert not TypeIndex().is_built
+
+
+def test_multiplier(index):
+    """Testa multiplicadores simples e combinados."""
+    assert index.multiplier("fire", ["grass"]) == 2.0
+    assert index.multiplier("Fire", ["water"]) == 0.5
+    assert index.multiplier("normal", ["ghost"]) == 0.0
+    assert index.multiplier("water", ["fire", "flying"]) == 2.0
+    assert index.multiplier("fire", ["fire", "water"]) == 0.25
+    assert index.multiplier("flying", ["grass", "fire"]) == 2.0
+
+
+def test_defensive_profile_matches_multiplier(index):
+    """Testa que o perfil defensivo equivale ao multiplicador de cada atacante."""
+    profile = index.defensive_profile(["grass", "flying"])
+
+    assert profile == {name: index.multiplier(name, ["grass", "flying"]) for name in index.types}
+    assert profile["fire"] == 2.0
+
+
+def test_matrix(index):
+    """Testa a matriz completa de efetividade."""
+    matrix = index.matrix()
+    fire = index.types.index("fire")
+    grass = index.types.index("grass")
+
+    assert len(matrix) == len(index.types)
+    assert matrix[fire][grass] == 2.0
+    assert matrix[grass][fire] == 0.5
+
+
+def test_pokemon_with_types(index):
+    """Testa consulta de Pokémons por um ou mais tipos."""
+    assert index.pokemon_with_types(["fire"]) == [4, 6, 146]
+    assert index.pokemon_with_types(["fire", "flying"]) == [6, 146]
+    assert index.pokemon_with_types(["fire", "water"]) == []
+    assert index.pokemon_with_types([]) == []
+
+
+def test_unknown_type_raises(index):
+    """Testa erro para tipos inexistentes."""
+    with pytest.raises(ValueError):
+        index.multiplier("dragon", ["fire"])
+    with pytest.raises(ValueError):
+        index.pokemon_with_types(["fire", "dragon"])
+
+
+@pytest.mark.asyncio
+async def test_service_builds_index_once():
+    """Testa que o serviço constrói o índice uma vez a partir da PokeAPI."""
+    pokeapi = MagicMock()
+    pokeapi.get_pokemon_types = AsyncMock(return_value=[{"name": t["name"]} for t in TYPES])
+    payloads = {t["name"]: t for t in TYPES}
+    pokeapi.get_type = AsyncMock(side_effect=lambda name: payloads[name])
+    service = TypeIndexService(pokeapi)
+
+    first = await service.get_index()
+    second = await service.get_index()
+
+    assert first is second
+    assert first.multiplier("fire", ["grass"]) == 2.0
+    pokeapi.get_pokemon_types.assert_called_once()
+    assert pokeapi.get_type.call_count == len(TYPES)
+
+
+@pytest.mark.asyncio
+async def test_service_does_not_build_partial_index():
+    """Testa que falhas ao buscar algum tipo não geram índice incompleto."""
+    pokeapi = MagicMock()
+    pokeapi.get_pokemon_types = AsyncMock(return_value=[{"name": "fire"}, {"name": "water"}])
+    pokeapi.get_type = AsyncMock(side_effect=[TYPES[1], None])
+    service = TypeIndexService(pokeapi)
+
+    assert await service.get_index() is None
+    assert not service.index.is_built